@@ -0,0 +1,140 @@
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+STATUS_READY = "ready"
+STATUS_PENDING = "pending"
+STATUS_FAILED = "failed"
+
+
+def make_insight_key(*parts):
+    raw = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class InsightEngine:
+    """
+    Generator insight AI di background thread.
+    - Hasil di-cache per key (hash input prompt), jadi rerun Streamlit tidak memanggil API lagi.
+    - Setiap model diberi batas waktu; model yang gagal "diistirahatkan" (circuit breaker).
+    - Selama insight baru diproses, UI bisa menampilkan insight terakhir yang sukses.
+    """
+
+    def __init__(self, generate_fn, models, model_timeout=25, breaker_cooldown=300,
+                 failed_retry_after=120, max_entries=64):
+        self.generate_fn = generate_fn
+        self.models = list(models)
+        self.model_timeout = model_timeout
+        self.breaker_cooldown = breaker_cooldown
+        self.failed_retry_after = failed_retry_after
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._results = {}       # key -> {"status", "text", "model", "ts", "error"}
+        self._inflight = set()
+        self._breaker = {}       # model -> {"fails": int, "open_until": float}
+        self._last_good = None
+
+        # Pool job (1 job = coba semua model berurutan) & pool panggilan model (agar bisa di-timeout)
+        self._jobs = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ai-insight")
+        self._calls = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ai-call")
+
+    # --------------------------------------------------
+    # Circuit breaker
+    # --------------------------------------------------
+    def _model_available(self, model):
+        with self._lock:
+            state = self._breaker.get(model)
+            return not state or time.time() >= state["open_until"]
+
+    def _record_failure(self, model):
+        with self._lock:
+            state = self._breaker.setdefault(model, {"fails": 0, "open_until": 0.0})
+            state["fails"] += 1
+            # Makin sering gagal, makin lama diistirahatkan (maks 4x cooldown)
+            factor = min(state["fails"], 4)
+            state["open_until"] = time.time() + self.breaker_cooldown * factor
+
+    def _record_success(self, model):
+        with self._lock:
+            self._breaker.pop(model, None)
+
+    def breaker_state(self):
+        now = time.time()
+        with self._lock:
+            return {
+                m: {"fails": s["fails"], "sisa_detik": max(0, int(s["open_until"] - now))}
+                for m, s in self._breaker.items()
+            }
+
+    # --------------------------------------------------
+    # Job
+    # --------------------------------------------------
+    def _run(self, key, prompt):
+        text, used_model, last_error = "", None, ""
+        for model in self.models:
+            if not self._model_available(model):
+                continue
+            fut = self._calls.submit(self.generate_fn, model, prompt)
+            try:
+                text = fut.result(timeout=self.model_timeout) or ""
+            except FutureTimeout:
+                last_error = f"{model}: timeout {self.model_timeout}s"
+                text = ""
+            except Exception as e:
+                last_error = f"{model}: {e}"
+                text = ""
+
+            if text:
+                used_model = model
+                self._record_success(model)
+                break
+            self._record_failure(model)
+
+        entry = {
+            "status": STATUS_READY if text else STATUS_FAILED,
+            "text": text,
+            "model": used_model,
+            "ts": time.time(),
+            "error": last_error,
+        }
+        with self._lock:
+            self._results[key] = entry
+            self._inflight.discard(key)
+            if text:
+                self._last_good = entry
+            if len(self._results) > self.max_entries:
+                oldest = sorted(self._results, key=lambda k: self._results[k]["ts"])
+                for k in oldest[: len(self._results) - self.max_entries]:
+                    self._results.pop(k, None)
+
+    def request(self, key, prompt):
+        """
+        Return (status, entry).
+        - READY  : entry = hasil untuk key ini.
+        - PENDING: entry = insight sukses terakhir (boleh None), job sudah berjalan.
+        - FAILED : semua model gagal; akan dicoba ulang setelah `failed_retry_after`.
+        """
+        with self._lock:
+            entry = self._results.get(key)
+            if entry and entry["status"] == STATUS_READY:
+                return STATUS_READY, entry
+            if entry and entry["status"] == STATUS_FAILED and \
+                    time.time() - entry["ts"] < self.failed_retry_after:
+                return STATUS_FAILED, entry
+
+            if key not in self._inflight:
+                # Hasil gagal yang kedaluwarsa dibuang agar peek() melaporkan PENDING
+                self._results.pop(key, None)
+                self._inflight.add(key)
+                self._jobs.submit(self._run, key, prompt)
+            return STATUS_PENDING, self._last_good
+
+    def peek(self, key):
+        with self._lock:
+            entry = self._results.get(key)
+            if entry:
+                return entry["status"], entry
+            return STATUS_PENDING, self._last_good
@@ -0,0 +1,5947 @@
+import os
+import json
+import streamlit as st
+import pandas as pd
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+from pathlib import Path
+import time
+import random
+import string
+import re
+import io
+import hashlib
+import inspect
+import hmac
+import textwrap
+import threading
+import functools
+import bisect
+import itertools
+from collections import deque, OrderedDict
+
+from audit_service import log_admin_action, compare_and_get_changes
+import snapshot_service as sn
+import schema_registry as sr
+from mail_dispatcher import EmailDispatcher, STATUS_SENT as MAIL_SENT, STATUS_FAILED as MAIL_FAILED
+import asset_pipeline as ap
+from lazy_loader import LazyModule, LazyAttr, is_available, import_report
+
+# [BARU] Library berat di-import saat pertama kali dipakai (bukan saat halaman login dibuka)
+gspread = LazyModule("gspread")
+Credentials = LazyAttr("google.oauth2.service_account", "Credentials")
+dropbox = LazyModule("dropbox")
+dropbox_files = LazyModule("dropbox.files")
+dropbox_sharing = LazyModule("dropbox.sharing")
+dropbox_exceptions = LazyModule("dropbox.exceptions")
+from ai_insight_service import (
+    InsightEngine,
+    STATUS_READY as INSIGHT_READY, STATUS_FAILED as INSIGHT_FAILED
+)
+
+
+# =========================================================
+# [BARU] SYSTEM: RAM STATE MANAGER
+# =========================================================
+# Nomor versi data RAM (naik setiap frame diganti). Monoton per proses, jadi tidak
+# berulang walau RAM_DB dikosongkan (hard refresh) lalu dibuat ulang.
+_RAM_VERSION_SEQ = itertools.count(1)
+
+
+def init_ram_storage():
+    """Menyiapkan struktur memori di RAM Session State."""
+    if "RAM_DB" not in st.session_state:
+        st.session_state["RAM_DB"] = {
+            "loaded": False,
+            "data_version": next(_RAM_VERSION_SEQ),  # [BARU] lihat ram_data_version()
+            "payment": None,
+            "closing": None,
+            "staff": [],          # Cache daftar nama
+            "staff_ids": {},      # [BARU] { "Nama Staf": ID baris di Config_Staf }
+            "payment_schedule": None,  # [BARU] { Payment ID: [(cicilan ke, jatuh tempo, nominal), ...] }
+            "payment_ledger": {},      # [BARU] { Payment ID: ringkasan saldo (lihat payment_ledger) }
+            "payment_alert_index": None,  # [BARU] jatuh tempo tagihan aktif, terurut (sidebar)
+            "kpi_team": None,
+            "kpi_indiv": None,
+            "reports": {},        # [BARU] Dictionary { "Nama Staf": DataFrame }
+            "rollup": {},         # [BARU] { "Nama Staf": rollup harian (lihat build_report_rollup) }
+            "ts_index": {},       # [BARU] { "Nama Staf": posisi DF -> baris sheet (lihat INDEX BARIS LAPORAN) }
+            "report_meta": OrderedDict(),  # [BARU] { "Nama Staf": byte frame } urut LRU (terlama di depan)
+            "report_pins": set()  # [BARU] staf yang frame-nya dipakai halaman di run ini (tidak dibuang LRU)
+        }
+
+def get_ram_data(key):
+    init_ram_storage()
+    return st.session_state["RAM_DB"].get(key, None)
+
+
+# [BARU] pandas >= 3 selalu Copy-on-Write: salinan dangkal aman dibagikan, perubahan oleh
+# pemanggil tidak akan menembus ke frame di RAM. Versi lama tetap pakai copy penuh.
+PANDAS_COW = int(pd.__version__.split(".")[0]) >= 3
+
+
+def ram_view(df):
+    """Frame dari RAM untuk dipakai UI / perhitungan, tanpa menyalin data di setiap baca."""
+    if df is None:
+        return None
+    return df.copy(deep=False) if PANDAS_COW else df.copy()
+
+
+def _read_ram_budget_mb(default=64):
+    try:
+        return float(st.secrets.get("report_ram_budget_mb", default))
+    except Exception:
+        return float(default)
+
+
+# Batas memori frame laporan per sesi (bisa diatur lewat secrets: report_ram_budget_mb)
+REPORT_RAM_BUDGET_MB = _read_ram_budget_mb()
+
+
+def frame_nbytes(df):
+    try:
+        return int(df.memory_usage(deep=True).sum())
+    except Exception:
+        return 0
+
+
+def put_report_frame(nama_staf, df):
+    """Simpan frame laporan staf ke RAM, catat ukurannya, lalu tegakkan budget (LRU)."""
+    init_ram_storage()
+    db = st.session_state["RAM_DB"]
+    meta = db.setdefault("report_meta", OrderedDict())
+    db["reports"][nama_staf] = df
+    db["data_version"] = next(_RAM_VERSION_SEQ)
+    meta[nama_staf] = frame_nbytes(df)
+    meta.move_to_end(nama_staf)
+    enforce_report_budget(keep=nama_staf)
+
+
+def touch_report_frame(nama_staf):
+    meta = st.session_state["RAM_DB"].setdefault("report_meta", OrderedDict())
+    if nama_staf in meta:
+        meta.move_to_end(nama_staf)
+
+
+def pin_report_frames(names):
+    """
+    Tandai frame staf yang dibutuhkan halaman di run ini sekaligus (misal dashboard semua staf).
+    Frame yang di-pin tidak dibuang LRU sampai run berikutnya, jadi halaman yang memuat lebih
+    dari budget tidak membuang lalu men-download ulang frame yang sama di setiap rerun.
+    """
+    init_ram_storage()
+    st.session_state["RAM_DB"].setdefault("report_pins", set()).update(names)
+
+
+def reset_report_pins():
+    """Dipanggil router di awal setiap run penuh: pin hanya berlaku untuk halaman yang sedang dibuka."""
+    init_ram_storage()
+    st.session_state["RAM_DB"]["report_pins"] = set()
+
+
+def enforce_report_budget(keep=None):
+    """
+    Buang frame yang paling lama tidak dipakai sampai total <= budget.
+    Frame yang di-pin halaman aktif (pin_report_frames) dan `keep` tidak ikut dibuang,
+    walau total jadi melebihi budget selama halaman itu dibuka.
+    Rollup harian sengaja TIDAK ikut dibuang (kecil & dipakai dashboard); frame akan
+    di-download ulang saat dibutuhkan lagi.
+    """
+    db = st.session_state["RAM_DB"]
+    meta = db.setdefault("report_meta", OrderedDict())
+    budget = REPORT_RAM_BUDGET_MB * 1024 * 1024
+    protected = db.get("report_pins", set()) | {keep}
+    while sum(meta.values()) > budget:
+        victim = next((k for k in meta if k not in protected), None)
+        if victim is None:
+            break
+        meta.pop(victim, None)
+        db["reports"].pop(victim, None)
+        db.get("ts_index", {}).pop(victim, None)
+
+
+def report_cache_stats():
+    """Ringkasan pemakaian RAM frame laporan sesi ini (untuk panel Diagnostik)."""
+    init_ram_storage()
+    meta = st.session_state["RAM_DB"].get("report_meta", {})
+    return {
+        "frames": len(meta),
+        "pinned": len(st.session_state["RAM_DB"].get("report_pins", ())),
+        "bytes": int(sum(meta.values())),
+        "budget_bytes": int(REPORT_RAM_BUDGET_MB * 1024 * 1024),
+        "lru": list(meta.keys()),
+    }
+
+def update_ram_data(key, val):
+    init_ram_storage()
+    st.session_state["RAM_DB"][key] = val
+    st.session_state["RAM_DB"]["data_version"] = next(_RAM_VERSION_SEQ)
+
+
+def ram_data_version():
+    """Token murah 'data RAM berubah' (dipakai sebagai sidik jari, tanpa hash isi frame)."""
+    init_ram_storage()
+    return st.session_state["RAM_DB"]["data_version"]
+
+
+def mark_data_changed():
+    """Naikkan versi data RAM tanpa mengganti frame (misal setelah cache data dikosongkan)."""
+    init_ram_storage()
+    st.session_state["RAM_DB"]["data_version"] = next(_RAM_VERSION_SEQ)
+
+
+def append_ram_data(key, row, prepare=None):
+    """
+    [BARU] Tambah satu baris (dict) ke frame RAM tanpa download ulang.
+    Frame belum dimuat (None) dibiarkan: load berikutnya download penuh (baris baru ikut).
+    prepare = normalisasi/kompaksi untuk frame hasil gabungan (opsional).
+    """
+    df = get_ram_data(key)
+    if df is None:
+        return
+    base = sn.decompact_frame(df).reset_index(drop=True)
+    out = pd.concat([base, pd.DataFrame([row]).reindex(columns=base.columns)], ignore_index=True)
+    update_ram_data(key, prepare(out) if prepare else out)
+
+
+def patch_ram_row(key, match_col, match_val, values):
+    """
+    [BARU] Timpa beberapa kolom pada baris frame RAM yang match_col == match_val.
+    Return True kalau barisnya ada di RAM.
+    """
+    df = get_ram_data(key)
+    if df is None or match_col not in df.columns:
+        return False
+    mask = df[match_col].astype(str) == str(match_val)
+    if not mask.any():
+        return False
+
+    out = df.copy(deep=False)
+    for col, val in values.items():
+        if col not in out.columns:
+            continue
+        s = out[col]
+        if isinstance(s.dtype, pd.CategoricalDtype) and val not in s.cat.categories:
+            s = s.cat.add_categories([val])
+        out[col] = s.mask(mask, val)
+    update_ram_data(key, out)
+    return True
+
+
+def manual_hard_refresh():
+    """Kosongkan RAM sesi & cache data, lalu muat ulang semuanya dari Cloud."""
+    st.session_state.pop("RAM_DB", None)
+    st.cache_data.clear()
+    st.rerun()
+    
+def load_daily_report_ram(nama_staf):
+    """
+    Smart Loader: 
+    1. Cek RAM. Jika ada, return instan.
+    2. Jika tidak, download GSheet, simpan RAM, return.
+    """
+    if not nama_staf or nama_staf in ["-- Pilih Nama --", ""]:
+        return pd.DataFrame(columns=NAMA_KOLOM_STANDAR)
+
+    init_ram_storage()
+    
+    # 1. CEK RAM (Hit Cache) - Kecepatan 0.00s, tanpa copy data (lihat ram_view)
+    if nama_staf in st.session_state["RAM_DB"]["reports"]:
+        touch_report_frame(nama_staf)
+        return ram_view(st.session_state["RAM_DB"]["reports"][nama_staf])
+
+    # 2. DOWNLOAD CLOUD (Miss Cache) - Hanya terjadi 1x per sesi
+    if not KONEKSI_GSHEET_BERHASIL:
+        return pd.DataFrame(columns=NAMA_KOLOM_STANDAR)
+
+    try:
+        # Kita pakai _get_or_create_ws_cached yang sudah ada di code Anda
+        ws = get_or_create_worksheet(nama_staf)
+        if not ws:
+            return pd.DataFrame(columns=NAMA_KOLOM_STANDAR)
+            
+        # Ambil semua value (lebih cepat dibanding get_all_records untuk data besar)
+        rows = ws.get_all_values()
+        if len(rows) > 1:
+            headers = rows[0]
+            data = rows[1:]
+            df = pd.DataFrame(data, columns=headers)
+        else:
+            df = pd.DataFrame(columns=NAMA_KOLOM_STANDAR)
+
+        # Normalisasi sekali (kolom standar, tanggal, nama, kategori aktivitas, bucket interest)
+        df = normalize_report_frame(df, nama_staf)
+
+        # 3. SIMPAN KE RAM (Cache Data), dtype dipadatkan dulu
+        df = compact_ram_frame("laporan_harian", df, label=f"laporan_harian/{nama_staf}")
+        put_report_frame(nama_staf, df)
+        set_report_rollup(nama_staf, build_report_rollup(df, nama_staf))
+        # Baris data ke-i di DataFrame = baris sheet ke-(i + 2) (baris 1 = header)
+        set_report_ts_index(nama_staf, df, first_sheet_row=2)
+        
+        return ram_view(df)
+    except Exception:
+        return pd.DataFrame(columns=NAMA_KOLOM_STANDAR)
+
+# =========================================================
+# [BARU] SISTEM LOGGING LANGSUNG (ANTI-GAGAL)
+# =========================================================
+# Ganti fungsi force_audit_log dengan ini
+
+
+def force_audit_log(actor, action, target_sheet, chat_msg, details_input):
+    try:
+        SHEET_NAME = "Global_Audit_Log"
+        try:
+            ws = spreadsheet.worksheet(SHEET_NAME)
+        except gspread.WorksheetNotFound:
+            # Buat baru jika tidak ada dengan header standar
+            ws = spreadsheet.add_worksheet(title=SHEET_NAME, rows=1000, cols=6)
+            ws.append_row(["Waktu", "User", "Status", "Target Data", "Chat & Catatan",
+                          "Detail Perubahan"], value_input_option="USER_ENTERED")
+
+        # Ambil header untuk tahu urutan kolom
+        headers = ws.row_values(1)
+
+        ts = datetime.now(ZoneInfo("Asia/Jakarta")
+                          ).strftime("%d-%m-%Y %H:%M:%S")
+        final_details = "\n".join([f"• {k}: {v}" for k, v in details_input.items()]) if isinstance(
+            details_input, dict) else (str(details_input) if details_input else "-")
+
+        # Data yang akan dimasukkan (Mapping Keyword ke Value)
+        payload = {
+            "waktu": f"'{ts}",
+            "user": str(actor),
+            "pelaku": str(actor),
+            "status": str(action),
+            "aksi": str(action),  # Menangkap "Aksi Dilakukan"
+            "target": str(target_sheet),
+            "nama data": str(target_sheet),
+            "chat": str(chat_msg),
+            "catatan": str(chat_msg),
+            "alasan": str(chat_msg),
+            "detail": str(final_details),
+            "rincian": str(final_details)
+        }
+
+        # Susun baris baru mengikuti urutan header di GSheet secara dinamis
+        row_to_append = [""] * len(headers)
+        for i, h in enumerate(headers):
+            h_lower = h.lower()
+            for key, val in payload.items():
+                if key in h_lower:
+                    row_to_append[i] = val
+                    break
+
+        # Jika baris masih kosong (header tidak cocok), gunakan format default di akhir
+        if all(x == "" for x in row_to_append):
+            row_to_append = [f"'{ts}", str(actor), str(action), str(
+                target_sheet), str(chat_msg), str(final_details)]
+
+        ws.append_row(row_to_append, value_input_option="USER_ENTERED")
+        return True
+    except Exception as e:
+        print(f"⚠️ FORCE LOG ERROR: {e}")
+        return False
+
+
+# =========================================================
+# ANCHOR: HELPER APPROVAL (AMBIL DARI CODE KEDUA)
+# =========================================================
+SHEET_PENDING = "System_Pending_Approval"
+# "New/Old Data JSON" hanya terisi di request lama (full row). Request baru menyimpan
+# sel yang berubah saja di "Changes JSON" + ringkasan diff yang sudah jadi.
+# "Row Version" = versi baris target saat diajukan (compare-and-set saat APPROVE).
+# "Row ID" = ID baris target; kalau ada, baris dicari lewat ID (posisi hanya cadangan).
+PENDING_COLUMNS = ["Timestamp", "Requestor", "Target Sheet", "Row Index (0-based)",
+                   "New Data JSON", "Reason", "Old Data JSON", "Change Set ID",
+                   "Changes JSON", "Diff Summary", "Row Version", "Row ID"]
+
+
+# =========================================================
+# [BARU] PAGED DATA EDITOR (HANYA HALAMAN AKTIF YANG DIKIRIM)
+# =========================================================
+PAGED_EDITOR_SIZES = [25, 50, 100, 200]
+PAGED_EDITOR_SORT_NONE = "(urutan asli)"
+
+
+def _paged_cell_str(v):
+    try:
+        if v is None or pd.isna(v):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    return str(v)
+
+
+def _paged_frame_sig(df):
+    # Sidik jari data sumber (murah, tanpa hash isi frame): kalau berubah, edit lama dibuang.
+    # Frame ber-versi baris: hash token versi (+ ID) per baris; setiap baris yang disimpan dapat
+    # token baru, jadi simpan di tabel lain tidak ikut membuang editan di sini.
+    # Tanpa kolom versi: versi data RAM.
+    base = (len(df), tuple(df.columns))
+    if COL_ROW_VERSION in df.columns:
+        try:
+            ids = df[COL_ROW_ID].astype(str) if COL_ROW_ID in df.columns else ()
+            return base + ("rv", hash((tuple(df[COL_ROW_VERSION].astype(str)), tuple(ids))))
+        except Exception:
+            pass
+    return base + ("ram", ram_data_version())
+
+
+def _paged_editor_state(key, df):
+    state = st.session_state.setdefault(f"_paged_editor_{key}", {"sig": None, "edits": {}})
+    sig = _paged_frame_sig(df)
+    if state["sig"] != sig:
+        state["sig"] = sig
+        state["edits"] = {}
+    return state
+
+
+def paged_editor_changes(key):
+    """Edit yang tertunda per baris: {label index: {kolom: nilai baru}}."""
+    state = st.session_state.get(f"_paged_editor_{key}")
+    return dict(state["edits"]) if state else {}
+
+
+def reset_paged_editor(key):
+    st.session_state.pop(f"_paged_editor_{key}", None)
+
+
+def _paged_order(df, key):
+    """Filter teks + sort di server; return index label baris yang lolos (urutan tampil)."""
+    c_q, c_sort, c_dir = st.columns([2, 2, 1])
+    with c_q:
+        q = st.text_input("🔎 Cari:", key=f"{key}_pg_q", placeholder="Filter semua kolom...").strip()
+    with c_sort:
+        sort_col = st.selectbox("Urutkan:", [PAGED_EDITOR_SORT_NONE] + [str(c) for c in df.columns], key=f"{key}_pg_sort")
+    with c_dir:
+        desc = st.checkbox("Z→A", key=f"{key}_pg_desc")
+
+    view = df
+    if q:
+        mask = pd.Series(False, index=df.index)
+        for col in df.columns:
+            mask |= df[col].map(_paged_cell_str).str.contains(q, case=False, regex=False)
+        view = df[mask]
+    if sort_col != PAGED_EDITOR_SORT_NONE and sort_col in view.columns:
+        try:
+            view = view.sort_values(sort_col, ascending=not desc, kind="stable", na_position="last")
+        except TypeError:
+            # Kolom campur tipe (angka + teks): urutkan sebagai teks
+            view = view.sort_values(sort_col, ascending=not desc, kind="stable",
+                                    key=lambda s: s.map(_paged_cell_str))
+    return view.index, (q, sort_col, desc)
+
+
+def paged_data_editor(df, key, page_size=50, render_page=None, **editor_kwargs):
+    """
+    Pengganti st.data_editor untuk tabel besar.
+    - Hanya halaman aktif yang dikirim ke browser; filter & sort dihitung di server.
+    - Edit disimpan per baris (label index = baris absolut) di session_state, jadi
+      pindah halaman/sort/filter tidak menghilangkan editan halaman lain.
+    - Return frame PENUH (urutan & index asli) dengan semua editan diterapkan,
+      sehingga pemanggil lama tetap bisa membandingkan dengan data awal.
+    render_page(page_df, widget_key) opsional untuk renderer lain (misal AgGrid).
+    """
+    state = _paged_editor_state(key, df)
+    edits = state["edits"]
+
+    if len(df) <= PAGED_EDITOR_SIZES[0]:
+        # Tabel kecil: tampil utuh tanpa kontrol halaman
+        labels, view_sig, page = df.index, None, 1
+    else:
+        labels, view_sig = _paged_order(df, key)
+        c_info, c_size, c_page = st.columns([3, 1, 1])
+        with c_size:
+            default_size = page_size if page_size in PAGED_EDITOR_SIZES else PAGED_EDITOR_SIZES[1]
+            size = st.selectbox("Per Halaman:", PAGED_EDITOR_SIZES,
+                                index=PAGED_EDITOR_SIZES.index(default_size), key=f"{key}_pg_size")
+        n_view = len(labels)
+        total_pages = max(1, -(-n_view // size))
+        # Hasil filter bisa menyusut; jaga nomor halaman tetap valid
+        if st.session_state.get(f"{key}_pg_page", 1) > total_pages:
+            st.session_state[f"{key}_pg_page"] = total_pages
+        with c_page:
+            page = int(st.number_input("Halaman:", min_value=1, max_value=total_pages, value=1, step=1,
+                                       key=f"{key}_pg_page"))
+        start = (page - 1) * size
+        labels = labels[start:start + size]
+        with c_info:
+            sumber = f"{n_view} hasil filter" if view_sig[0] else f"{len(df)} baris"
+            st.caption(f"Menampilkan {start + 1 if len(labels) else 0}–{start + len(labels)} dari {sumber} • "
+                       f"halaman {page}/{total_pages} • {len(edits)} baris diedit")
+
+    page_orig = df.loc[labels]
+    page_df = page_orig.copy()
+    for label in labels:
+        for col, val in edits.get(label, {}).items():
+            try:
+                page_df.at[label, col] = val
+            except (TypeError, ValueError):
+                page_df[col] = page_df[col].astype(object)
+                page_df.at[label, col] = val
+
+    # Widget berbeda per halaman/urutan: state editor bawaan Streamlit posisional per tampilan
+    widget_key = f"{key}_pg_{page}_{abs(hash(view_sig)) % 10**8}" if view_sig else key
+    if render_page is not None:
+        edited = render_page(page_df, widget_key)
+    else:
+        editor_kwargs.setdefault("num_rows", "fixed")
+        edited = st.data_editor(page_df, key=widget_key, **editor_kwargs)
+    edited.index = page_df.index
+
+    # Catat selisih terhadap data ASLI (edit yang dikembalikan ke nilai awal ikut terhapus)
+    for label in labels:
+        row_new = edited.loc[label]
+        row_old = page_orig.loc[label]
+        changed = {col: row_new[col] for col in edited.columns
+                   if col in row_old.index and _paged_cell_str(row_new[col]) != _paged_cell_str(row_old[col])}
+        if changed:
+            edits[label] = changed
+        else:
+            edits.pop(label, None)
+
+    if not edits:
+        return df
+    merged = df.copy()
+    for label, changed in edits.items():
+        for col, val in changed.items():
+            try:
+                merged.at[label, col] = val
+            except (TypeError, ValueError):
+                merged[col] = merged[col].astype(object)
+                merged.at[label, col] = val
+    return merged
+
+
+# =========================================================
+# [BARU] HELPER: ADMIN SMART EDITOR (AUTO-APPROVAL)
+# =========================================================
+# =========================================================
+# [REVISI V2] HELPER: ADMIN SMART EDITOR (FIX TITIK RUPIAH)
+# =========================================================
+def admin_smart_editor_ui(df_data, unique_key, sheet_target_name):
+    """
+    Komponen UI standar untuk Admin mengedit data tabel.
+    [UPDATE]: Menampilkan format 'Rp 2.000.000' (ada titik) sebagai teks agar rapi,
+    tapi otomatis dikonversi balik ke Angka saat disimpan.
+    """
+    if df_data.empty:
+        st.info("Data tidak tersedia untuk ditampilkan.")
+        return
+
+    # --- 1. PRE-PROCESS: Format Tampilan (Uang jadi String dengan Titik) ---
+    # Kolom category (hasil kompaksi RAM) dikembalikan ke teks agar bebas diedit.
+    # Tipe tiap kolom (uang/tanggal/status) diambil dari schema registry.
+    df_display = sr.to_display(sn.decompact_frame(df_data))
+    column_configs = sr.editor_column_config(df_display.columns)
+    money_cols = sr.columns_of_kind(df_display.columns, sr.KIND_MONEY)
+
+    # --- 2. Tampilkan Editor Data (per halaman; editan antar halaman tetap tersimpan) ---
+    editor_key = f"editor_{unique_key}"
+    paged_data_editor(
+        df_display,
+        editor_key,
+        use_container_width=True,
+        column_config=column_configs
+    )
+
+    # --- 3. Form Alasan & Tombol Submit ---
+    col_reason, col_btn = st.columns([3, 1])
+    with col_reason:
+        reason = st.text_input("📝 Alasan Perubahan (Wajib diisi):", key=f"reason_{unique_key}", placeholder="Contoh: Koreksi typo, update nilai kontrak...")
+    
+    with col_btn:
+        st.markdown("<br>", unsafe_allow_html=True) 
+        is_submit = st.button("📤 Ajukan Perubahan", key=f"btn_{unique_key}", type="primary", use_container_width=True)
+
+    if is_submit:
+        if not reason.strip():
+            st.error("⚠️ Harap isi alasan perubahan terlebih dahulu!")
+        else:
+            # --- 4. Logic Deteksi Perubahan & Pembersihan Data ---
+            changes_found = []
+            
+            # Hanya baris yang benar-benar diedit (dicatat paged editor), bukan diff seluruh frame
+            for label, changed in paged_editor_changes(editor_key).items():
+                dirty_row = df_display.loc[label].copy()
+                for col, val in changed.items():
+                    dirty_row[col] = val
+
+                # [PENTING] BERSIHKAN KEMBALI FORMAT RUPIAH KE INTEGER
+                # Agar database menerima angka murni (2000000), bukan string "Rp 2.000.000"
+                for m_col in money_cols:
+                    dirty_row[m_col] = sr.parse_money(dirty_row[m_col])
+
+                changes_found.append({
+                    "row_idx": df_display.index.get_loc(label),  # posisi baris data di sheet
+                    "new_data": dirty_row, # Data yang sudah dibersihkan jadi angka
+                    "old_data": df_data.loc[label] # Data asli (angka) dari database
+                })
+            changes_found.sort(key=lambda c: c["row_idx"])
+
+            if not changes_found:
+                st.warning("Tidak ada perubahan data yang terdeteksi.")
+            else:
+                # Satu change set: satu append_rows + satu entri audit log
+                current_user = st.session_state.get("user_name", "Admin")
+                with st.spinner("Mengirim permintaan ke Manager..."):
+                    ok, msg, _ = submit_change_set(sheet_target_name, changes_found, reason, current_user)
+
+                if ok:
+                    reset_paged_editor(editor_key)
+                    st.success(f"✅ {msg}")
+                    time.sleep(2)
+                    st.rerun()
+                else:
+                    st.error(f"Gagal mengirim permintaan. {msg}")
+
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def _get_pending_ws_cached():
+    """Objek worksheet pending approval (dibuat kalau belum ada), di-cache seperti sheet lain."""
+    try:
+        return spreadsheet.worksheet(SHEET_PENDING)
+    except gspread.WorksheetNotFound:
+        ws = spreadsheet.add_worksheet(
+            title=SHEET_PENDING, rows=1000, cols=len(PENDING_COLUMNS))
+        ws.append_row(PENDING_COLUMNS, value_input_option="USER_ENTERED")
+        maybe_auto_format_sheet(ws, force=True)
+        return ws
+
+
+def init_pending_db():
+    """
+    Memastikan sheet pending approval ada dengan kolom untuk DATA LAMA & Change Set ID.
+    [BARU] Worksheet & cek header di-cache (ensure_headers), jadi tidak ada row_values(1)
+    di setiap pengajuan. Kolom baru selalu ditambahkan di belakang, data lama tetap sejajar.
+    """
+    try:
+        ws = _get_pending_ws_cached()
+        ensure_headers(ws, PENDING_COLUMNS)
+        return ws
+    except Exception as e:
+        # Tampilkan error di terminal untuk debugging jika terjadi lagi
+        print(f"Error init_pending_db: {e}")
+        return None
+
+
+def new_change_set_id():
+    acak = "".join(random.choices(string.ascii_uppercase + string.digits, k=4))
+    return f"CS-{datetime.now(tz=TZ_JKT).strftime('%Y%m%d%H%M%S')}-{acak}"
+
+
+def build_cell_changes(row_dict_new, row_dict_old):
+    """Sel yang berubah saja: list {"col", "old", "new"} (dibandingkan sebagai teks)."""
+    changes = []
+    for k, v_new in row_dict_new.items():
+        v_old = row_dict_old.get(k, "")
+        # Normalisasi string agar tidak false alarm (spasi, dll)
+        if str(v_new).strip() != str(v_old).strip():
+            changes.append({"col": k, "old": str(v_old), "new": str(v_new)})
+    return changes
+
+
+def format_cell_changes(changes):
+    return "\n".join(f"• {c['col']}: '{c['old']}' ➡ '{c['new']}'" for c in changes)
+
+
+def pending_cell_changes(req):
+    """Sel yang diajukan pada satu request pending (fallback: request lama berisi full row JSON)."""
+    raw = req.get("Changes JSON", "")
+    if raw:
+        return json.loads(raw)
+    raw_old = req.get("Old Data JSON", "")
+    raw_new = req.get("New Data JSON", "")
+    old_d = json.loads(raw_old) if raw_old else {}
+    new_d = json.loads(raw_new) if raw_new else {}
+    return build_cell_changes(new_d, old_d)
+
+
+def pending_diff_summary(req):
+    summary = req.get("Diff Summary", "")
+    if summary:
+        return summary
+    try:
+        return format_cell_changes(pending_cell_changes(req)) or "Re-save (Tanpa Perubahan Nilai)."
+    except Exception:
+        return "Detail perubahan tidak terbaca."
+
+
+def submit_change_set(target_sheet, changes, reason, requestor):
+    """
+    [BARU] Ajukan banyak baris sekaligus sebagai satu change set.
+    changes: list dict {"row_idx", "new_data", "old_data"} (Series baris baru/lama).
+    Semua baris masuk System_Pending_Approval lewat SATU append_rows dengan Change Set ID
+    yang sama, lalu dicatat di audit log sebagai SATU entri.
+    Return (ok, pesan, change_set_id).
+    """
+    if not changes:
+        return False, "Tidak ada perubahan.", None
+
+    # --- 1. Inisialisasi Database Pending ---
+    ws = init_pending_db()
+    if not ws:
+        return False, "DB Error", None
+
+    cs_id = new_change_set_id()
+    ts = now_ts_str()
+    rows = []
+    detail_lines = []
+
+    # --- 2. Diff per sel (dihitung SEKALI di sini, bukan di setiap render tab Manager) ---
+    for change in changes:
+        row_dict_new = change["new_data"].astype(str).to_dict()
+        old_row = change.get("old_data")
+        row_dict_old = old_row.astype(str).to_dict() if old_row is not None else {}
+        cell_changes = build_cell_changes(row_dict_new, row_dict_old)
+        if not cell_changes:
+            continue
+
+        summary = format_cell_changes(cell_changes)
+        rows.append([ts, requestor, target_sheet, change["row_idx"], "", reason, "", cs_id,
+                     json.dumps(cell_changes), summary, row_dict_old.get(COL_ROW_VERSION, ""),
+                     row_dict_old.get(COL_ROW_ID, "")])
+        detail_lines.append(f"Baris {int(change['row_idx']) + 2}: " +
+                            "; ".join(f"{c['col']}: {c['old']} ➡ {c['new']}" for c in cell_changes))
+
+    if not rows:
+        return False, "Tidak ada perubahan data yang terdeteksi.", None
+
+    # --- 3. Simpan ke System_Pending_Approval (satu request API) ---
+    try:
+        ws.append_rows(rows, value_input_option="USER_ENTERED")
+    except Exception as e:
+        print(f"Error submit_change_set: {e}")
+        return False, f"Gagal menyimpan pengajuan: {e}", None
+
+    # --- 4. Satu entri audit log untuk seluruh change set ---
+    final_chat = f"🙋‍♂️ [ADMIN]: {reason}" if reason else "🙋‍♂️ [ADMIN]: Request Update Data."
+    force_audit_log(
+        actor=requestor,
+        action="⏳ PENDING",
+        target_sheet=target_sheet,
+        chat_msg=final_chat,
+        details_input=f"Change Set {cs_id} ({len(rows)} baris)\n" + "\n".join(detail_lines)
+    )
+
+    return True, f"{len(rows)} perubahan terkirim sebagai {cs_id}.", cs_id
+
+
+def submit_change_request(target_sheet, row_idx_0based, new_df_row, old_df_row, reason, requestor):
+    """Ajukan satu baris (change set berisi satu perubahan)."""
+    ok, msg, _ = submit_change_set(
+        target_sheet,
+        [{"row_idx": row_idx_0based, "new_data": new_df_row, "old_data": old_df_row}],
+        reason, requestor)
+    return ok, msg
+
+
+def get_pending_approvals():
+    """Fungsi untuk Manager mengambil semua daftar request yang pending."""
+    ws = init_pending_db()
+    if not ws:
+        return []
+    return ws.get_all_records()
+
+
+def execute_approval(request_index_0based, action, admin_name="Manager", rejection_note="-"):
+    """
+    Eksekusi Approval dengan perbaikan Logging agar kolom Detail & Chat terisi lengkap.
+    """
+    try:
+        ws_pending = init_pending_db()
+        if not ws_pending:
+            return False, "DB Error: Sheet Pending tidak ditemukan."
+
+        all_requests = ws_pending.get_all_records()
+        if request_index_0based >= len(all_requests):
+            return False, "Data tidak ditemukan (mungkin sudah diproses)."
+
+        req = all_requests[request_index_0based]
+        target_sheet_name = req["Target Sheet"]
+        row_target_idx = int(req["Row Index (0-based)"])
+        requestor_name = req.get("Requestor", "Unknown")
+
+        # Ringkasan diff sudah disimpan saat pengajuan (request lama: dihitung dari JSON)
+        diff_str_log = pending_diff_summary(req)
+
+        # --- ACTION: REJECT (DITOLAK) ---
+        if action == "REJECT":
+            final_reason = str(rejection_note).strip()
+            # Jika admin tidak menulis alasan, beri default
+            if not final_reason or final_reason in ["-", ""]:
+                final_reason = "Data perlu direvisi."
+
+            # LOG BARU: Menggunakan parameter 'chat_msg' dan 'details_input'
+            force_audit_log(
+                actor=admin_name,
+                action="❌ DITOLAK",
+                target_sheet=target_sheet_name,
+                chat_msg=f"⛔ [MANAGER]: {final_reason}",
+                details_input=f"Pengaju: {requestor_name}\n(Data dikembalikan ke Admin)"
+            )
+
+            # Hapus dari daftar pending karena sudah diproses
+            ws_pending.delete_rows(request_index_0based + 2)
+            return True, f"DITOLAK. Alasan: {final_reason}"
+
+        # --- ACTION: APPROVE (DI ACC) ---
+        elif action == "APPROVE":
+            # 1. TULIS HANYA SEL YANG DIAJUKAN (sel lain di baris itu tidak ikut tertimpa)
+            cell_changes = pending_cell_changes(req)
+            ws_target = spreadsheet.worksheet(target_sheet_name)
+            headers = ws_target.row_values(1)
+            gsheet_row = row_target_idx + 2
+            conflict_msg = ("KONFLIK: baris target sudah berubah sejak pengajuan ini dibuat. "
+                            "Tolak request ini lalu minta Admin mengajukan ulang dari data terbaru.")
+
+            # Baris target dicari lewat ID (kalau ada) & harus masih versi yang sama dengan saat diajukan
+            record = {}
+            if req.get("Row ID") and COL_ROW_ID in headers:
+                gsheet_row, record = locate_row(ws_target, target_sheet_name, headers, req["Row ID"])
+                if gsheet_row is None:
+                    return False, "KONFLIK: baris target sudah dihapus. Tolak request ini."
+                ok = version_matches(req.get("Row Version", ""), record.get(COL_ROW_VERSION))
+            else:
+                ok, _ = check_row_version(ws_target, headers, row_target_idx, req.get("Row Version", ""))
+            if not ok:
+                refresh_rows_after_write(target_sheet_name, ws_target, headers, [gsheet_row - 2])
+                return False, conflict_msg
+
+            updates = []
+            for c in cell_changes:
+                if c["col"] in headers and c["col"] not in (COL_ROW_VERSION, COL_ROW_ID):
+                    col_idx = headers.index(c["col"]) + 1
+                    updates.append({"range": gspread.utils.rowcol_to_a1(gsheet_row, col_idx),
+                                    "values": [[c["new"]]]})
+            payment_events = []
+            if updates and target_sheet_name == SHEET_PEMBAYARAN:
+                # Pembayaran: ringkasan perubahan terakhir di baris + event per kolom
+                ts_acc = now_ts_str()
+                changes = [(c["col"], c["old"], c["new"]) for c in cell_changes
+                           if c["col"] in headers
+                           and c["col"] not in (COL_ROW_VERSION, COL_ROW_ID, COL_TS_UPDATE, COL_UPDATED_BY)]
+                system_cells = [(COL_TS_UPDATE, payment_change_summary(ts_acc, admin_name, changes)),
+                                (COL_UPDATED_BY, admin_name)]
+                changed_cols = {c[0] for c in changes}
+                if record and changed_cols & {COL_NILAI_KESEPAKATAN, COL_NOMINAL_BAYAR} \
+                        and COL_SISA_BAYAR not in changed_cols:
+                    # Sisa ikut dihitung ulang kalau nilai kesepakatan / nominal disetujui berubah
+                    vals = {**record, **{c[0]: c[2] for c in changes}}
+                    sisa = (parse_rupiah_to_int(vals.get(COL_NILAI_KESEPAKATAN)) or 0) - \
+                        (parse_rupiah_to_int(vals.get(COL_NOMINAL_BAYAR)) or 0)
+                    system_cells.append((COL_SISA_BAYAR, max(sisa, 0)))
+                for col, val in system_cells:
+                    if col in headers:
+                        updates.append({"range": gspread.utils.rowcol_to_a1(gsheet_row, headers.index(col) + 1),
+                                        "values": [[val]]})
+                payment_events = payment_event_rows(req.get("Row ID", ""), ts_acc, admin_name, changes,
+                                                    old_log=record.get(COL_TS_UPDATE, ""))
+            if updates:
+                version = new_row_version()
+                updates += row_version_update(headers, gsheet_row - 2, version)
+                ws_target.batch_update(updates, value_input_option="USER_ENTERED")
+                refresh_rows_after_write(target_sheet_name, ws_target, headers, [gsheet_row - 2])
+                append_payment_events(payment_events)
+                if target_sheet_name == SHEET_PEMBAYARAN and record:
+                    # Total / tenor / Batas Waktu Bayar disetujui berubah -> jadwal cicilan dibangun ulang
+                    vals = {**record, **{c["col"]: c["new"] for c in cell_changes}, COL_ROW_VERSION: version}
+                    if plan_inputs_changed(record, vals):
+                        regenerate_payment_plans([vals])
+
+            # 2. LOG BARU: Mencatat Sukses dengan detail perubahan
+            force_audit_log(
+                actor=admin_name,
+                action="✅ SUKSES/ACC",
+                target_sheet=target_sheet_name,
+                chat_msg="✅ [MANAGER]: Disetujui & Data Terupdate.",
+                details_input=f"Pengaju: {requestor_name}\n---\n{diff_str_log}"
+            )
+
+            # Hapus dari daftar pending karena sudah diproses
+            ws_pending.delete_rows(request_index_0based + 2)
+            return True, "DISETUJUI & Database Terupdate."
+
+    except Exception as e:
+        return False, f"System Error: {e}"
+
+
+# --- BAGIAN IMPORT OPTIONAL LIBS JANGAN DIHAPUS (Excel/AgGrid/Plotly) ---
+# [BARU] Cek ketersediaan via find_spec (tanpa import). Modul asli baru di-load
+# saat halaman yang membutuhkan (grafik / tabel / export) pertama kali dirender.
+HAS_OPENPYXL = is_available("openpyxl")
+HAS_AGGRID = is_available("st_aggrid")
+HAS_PLOTLY = is_available("plotly")
+
+openpyxl_styles = LazyModule("openpyxl.styles")
+openpyxl_utils = LazyModule("openpyxl.utils")
+openpyxl_df_utils = LazyModule("openpyxl.utils.dataframe")
+Workbook = LazyAttr("openpyxl", "Workbook")
+
+st_aggrid = LazyModule("st_aggrid")
+px = LazyModule("plotly.express")
+
+
+# =========================================================
+# PAGE CONFIG
+# =========================================================
+APP_TITLE = "Sales & Marketing Action Center"
+
+# =========================================================
+# [BARU] FRAGMENT & LATENCY HELPERS
+# =========================================================
+@st.cache_resource(show_spinner=False)
+def _get_perf_stats():
+    # Dipakai bersama semua sesi dalam satu proses
+    return {"lock": threading.Lock(), "runs": {}}
+
+
+def record_run_latency(label, seconds):
+    stats = _get_perf_stats()
+    with stats["lock"]:
+        stats["runs"].setdefault(label, deque(maxlen=100)).append(seconds)
+
+
+def perf_report():
+    stats = _get_perf_stats()
+    with stats["lock"]:
+        items = {k: list(v) for k, v in stats["runs"].items()}
+    rows = []
+    for label, vals in items.items():
+        if not vals:
+            continue
+        ordered = sorted(vals)
+        rows.append({
+            "Bagian": label,
+            "Run": len(vals),
+            "Terakhir (ms)": round(vals[-1] * 1000, 1),
+            "Median (ms)": round(ordered[len(ordered) // 2] * 1000, 1),
+            "P90 (ms)": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))] * 1000, 1),
+        })
+    return pd.DataFrame(rows)
+
+
+def ui_fragment(func=None, *, run_every=None):
+    """
+    st.fragment (rerun parsial) bila tersedia; versi lama dijalankan sebagai fungsi biasa.
+    Setiap eksekusi fragment dicatat durasinya untuk panel Diagnostik.
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record_run_latency(f"Fragment {fn.__name__}", time.perf_counter() - t0)
+
+        if hasattr(st, "fragment"):
+            return st.fragment(timed, run_every=run_every)
+        return timed
+    return deco(func) if func is not None else deco
+
+
+def ui_rerun_fragment():
+    """Rerun fragment yang sedang berjalan saja (fallback: rerun penuh)."""
+    if hasattr(st, "fragment"):
+        try:
+            st.rerun(scope="fragment")
+        except Exception:
+            # Dipanggil saat full run (bukan rerun fragment): scope fragment ditolak
+            pass
+    st.rerun()
+
+
+# =========================================================
+# SYSTEM LOGIN OTP VIA EMAIL
+# =========================================================
+
+
+@st.cache_resource(show_spinner=False)
+def get_mail_dispatcher():
+    """[BARU] Satu dispatcher (koneksi SMTP warm + worker thread) per proses."""
+    smtp_config = st.secrets["smtp"]
+    return EmailDispatcher(
+        smtp_config["smtp_server"],
+        smtp_config["smtp_port"],
+        smtp_config["sender_email"],
+        smtp_config["sender_password"],
+    )
+
+
+def send_email_otp(target_email, otp_code):
+    """
+    Antrekan email kode OTP ke dispatcher (SMTP Gmail).
+    Return job id (int) begitu email masuk antrean, atau None kalau config SMTP bermasalah.
+    Status kirim final dicek lewat get_mail_dispatcher().status(job_id).
+    """
+    subject = "Kode Login - Sales Action Center"
+    body = f"""
+    <html>
+      <body style="font-family: Arial, sans-serif;">
+        <h2 style="color: #2e7d32;">Sales & Marketing Action Center</h2>
+        <p>Halo,</p>
+        <p>Gunakan kode berikut untuk masuk ke aplikasi:</p>
+        <div style="background-color: #f1f8e9; padding: 15px; border-radius: 8px; display: inline-block;">
+            <h1 style="color: #1b5e20; letter-spacing: 5px; margin: 0;">{otp_code}</h1>
+        </div>
+        <p>Kode ini berlaku untuk satu kali login. Jangan berikan kepada siapapun.</p>
+        <hr>
+        <small>Pesan otomatis dari Sistem Laporan Harian.</small>
+      </body>
+    </html>
+    """
+
+    try:
+        return get_mail_dispatcher().submit(target_email, subject, body)
+    except Exception as e:
+        st.error(f"Gagal kirim email: {e}")
+        return None
+
+
+def queue_otp_email(email_clean):
+    """Buat OTP baru & antrekan email-nya; simpan state login OTP di sesi. Return True jika masuk antrean."""
+    otp = generate_otp()
+    job_id = send_email_otp(email_clean, otp)
+    if job_id is None:
+        return False
+    st.session_state["generated_otp"] = otp
+    st.session_state["temp_email"] = email_clean
+    st.session_state["otp_mail_job"] = job_id
+    return True
+
+
+def _otp_delivery_state():
+    job_id = st.session_state.get("otp_mail_job")
+    if job_id is None:
+        return None, ""
+    try:
+        return get_mail_dispatcher().status(job_id)
+    except Exception as e:
+        return MAIL_FAILED, str(e)
+
+
+def _show_otp_delivery(status, error):
+    email = st.session_state.get("temp_email", "")
+    if status == MAIL_SENT:
+        st.success(f"OTP Terkirim ke email: **{email}**")
+    elif status == MAIL_FAILED:
+        st.error(f"Gagal kirim OTP ke **{email}**: {error or 'cek Config SMTP'}.")
+    else:
+        st.info(f"⏳ Mengirim OTP ke email: **{email}**... (cek inbox dalam beberapa detik)")
+
+
+@ui_fragment(run_every=2)
+def _otp_delivery_poll():
+    status, error = _otp_delivery_state()
+    if status in (MAIL_SENT, MAIL_FAILED):
+        # Hasil final sudah ada: rerun penuh agar polling fragment ini berhenti
+        st.rerun()
+    _show_otp_delivery(status, error)
+
+
+def render_otp_delivery_status():
+    """Status pengiriman OTP (step 2 login admin): 'mengirim' sampai dispatcher melapor hasil."""
+    status, error = _otp_delivery_state()
+    if status is None:
+        return
+    if status not in (MAIL_SENT, MAIL_FAILED):
+        _otp_delivery_poll()
+        return
+    _show_otp_delivery(status, error)
+    if status == MAIL_FAILED and st.button("🔁 Kirim Ulang OTP", use_container_width=True):
+        if queue_otp_email(st.session_state.get("temp_email", "")):
+            st.rerun()
+        st.error("Gagal kirim email (Cek Config SMTP).")
+
+
+def generate_otp():
+    return ''.join(random.choices(string.digits, k=6))
+
+# =========================================================
+# SYSTEM LOGIN (MODIFIED: Direct Staff Access)
+# =========================================================
+
+# =========================================================
+# SYSTEM LOGIN (MODIFIED: Direct Staff Access & Role Check)
+# =========================================================
+
+
+def login_page():
+    st.markdown("<br><br>", unsafe_allow_html=True)
+    st.markdown("<h1 style='text-align: center;'>🔐 Access Portal</h1>",
+                unsafe_allow_html=True)
+    st.markdown(
+        f"<p style='text-align: center;'>{APP_TITLE}</p>", unsafe_allow_html=True)
+    st.divider()
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        # MEMBUAT TABS: Staff (Langsung) vs Admin (OTP)
+        tab_staff, tab_admin = st.tabs(["🚀 Akses Staff", "🛡️ Login Admin"])
+
+        # --- TAB 1: AKSES STAFF (LANGSUNG) ---
+        with tab_staff:
+            st.markdown("### 👋 Halo, Team!")
+            st.info("Klik tombol di bawah untuk masuk dan mulai membuat laporan.")
+
+            if st.button("Masuk Aplikasi (Staff)", type="primary", use_container_width=True):
+                # SET SESSION STAFF (GENERIC)
+                st.session_state["logged_in"] = True
+                st.session_state["user_email"] = "staff_entry"
+                # Nama spesifik nanti dipilih di dalam form
+                st.session_state["user_name"] = "Staff Member"
+                st.session_state["user_role"] = "staff"
+                # KUNCI: Staff tidak bisa akses dashboard admin
+                st.session_state["is_admin"] = False
+
+                st.success("Berhasil masuk! Mengalihkan...")
+                time.sleep(0.5)
+                st.rerun()
+
+        # --- TAB 2: LOGIN ADMIN (EMAIL & OTP) ---
+        with tab_admin:
+            # Step 1: Input Email
+            if st.session_state.get("otp_step", 1) == 1:
+                # Buka koneksi SMTP lebih awal selagi admin mengetik email
+                try:
+                    get_mail_dispatcher().warm_up()
+                except Exception:
+                    pass
+
+                with st.form("email_form"):
+                    st.caption("Khusus Admin & Manager (via Email Terdaftar)")
+                    email_input = st.text_input("Email Address")
+
+                    if st.form_submit_button("Kirim Kode OTP", use_container_width=True):
+                        # Cek whitelist di secrets.toml
+                        users_db = st.secrets.get("users", {})
+                        # Normalisasi email (hilangkan spasi & lowercase)
+                        email_clean = email_input.strip().lower()
+
+                        if email_clean in users_db:
+                            # Kirim Email OTP (masuk antrean, dikirim di background)
+                            if queue_otp_email(email_clean):
+                                st.session_state["otp_step"] = 2
+                                st.rerun()
+                            else:
+                                st.error(
+                                    "Gagal kirim email (Cek Config SMTP).")
+                        else:
+                            st.error(
+                                "⛔ Akses Ditolak: Email tidak terdaftar sebagai Admin/Manager.")
+
+            # Step 2: Input OTP
+            elif st.session_state.get("otp_step") == 2:
+                # "Terkirim" baru ditampilkan setelah dispatcher melapor sukses
+                render_otp_delivery_status()
+
+                with st.form("otp_form"):
+                    otp_input = st.text_input(
+                        "Kode OTP (6 Digit)", max_chars=6)
+                    c_back, c_ok = st.columns(2)
+
+                    # Tombol Kembali
+                    if c_back.form_submit_button("⬅️ Ganti Email"):
+                        st.session_state["otp_step"] = 1
+                        st.rerun()
+
+                    # Tombol Verifikasi
+                    if c_ok.form_submit_button("Verifikasi ✅", type="primary"):
+                        if otp_input == st.session_state["generated_otp"]:
+                            # LOGIN ADMIN/MANAGER SUKSES
+                            email_fix = st.session_state["temp_email"]
+                            user_info = st.secrets["users"][email_fix]
+
+                            st.session_state["logged_in"] = True
+                            st.session_state["user_email"] = email_fix
+                            st.session_state["user_name"] = user_info["name"]
+
+                            # --- DETEKSI ROLE ---
+                            # Ambil role dari secrets.toml, default ke 'staff' jika tidak ada
+                            role_str = str(user_info.get("role", "staff")).lower()
+                            st.session_state["user_role"] = role_str
+
+                            # [FIX] Manager DAN Atasan dimasukkan ke dalam list admin
+                            if role_str in ["admin", "manager", "atasan"]:
+                                st.session_state["is_admin"] = True
+                            else:
+                                st.session_state["is_admin"] = False
+
+                            st.success(f"Login Berhasil! Selamat datang {role_str.upper()}.")
+                            time.sleep(0.5)
+                            st.rerun()
+                        else:
+                            st.error("Kode OTP Salah.")
+
+
+# =========================================================
+# HELPER: DATABASE STAFF (GOOGLE SHEET)
+# =========================================================
+SHEET_USERS = "Config_Users"
+
+
+USER_INDEX_TTL = 300  # detik; perubahan manual di sheet tetap terbaca paling lambat 5 menit
+USER_WRITE_MAX_AGE = 60  # detik; update/hapus akun memakai nomor baris dari index yang lebih muda dari ini
+USER_COL_PASSWORD = 2
+USER_COL_NAMA = 3
+
+
+def init_user_db():
+    """Memastikan sheet user ada."""
+    try:
+        try:
+            ws = spreadsheet.worksheet(SHEET_USERS)
+        except gspread.WorksheetNotFound:
+            ws = spreadsheet.add_worksheet(title=SHEET_USERS, rows=100, cols=4)
+            ws.append_row(["Username", "Password", "Nama", "Role"],
+                          value_input_option="USER_ENTERED")
+            maybe_auto_format_sheet(ws, force=True)
+        return ws
+    except Exception:
+        return None
+
+
+@st.cache_resource(show_spinner=False)
+def _get_user_index_store():
+    """
+    [BARU] Index akun Config_Users per proses:
+    username -> {"row": nomor baris sheet, "pw_hash": HMAC password, "record": data tanpa password,
+                 "fp": fingerprint akun (record + pw_hash)}.
+    "cols" = posisi kolom dari header sheet. Password asli tidak pernah disimpan di memori;
+    yang disimpan hanya HMAC dengan kunci acak per proses.
+    """
+    return {"lock": threading.Lock(), "index": None, "built_at": 0.0,
+            "ws": None, "cols": {}, "key": os.urandom(32)}
+
+
+def _hash_user_password(store, password):
+    return hmac.new(store["key"], str(password).strip().encode("utf-8"), hashlib.sha256).digest()
+
+
+def _user_account_fp(entry):
+    """Fingerprint isi akun, termasuk password (lewat HMAC-nya), untuk deteksi edit dari luar app."""
+    payload = json.dumps(entry["record"], sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(entry["pw_hash"] + payload).digest()
+
+
+def invalidate_user_index():
+    store = _get_user_index_store()
+    with store["lock"]:
+        store["index"] = None
+
+
+def _build_user_index(store):
+    ws = init_user_db()
+    if not ws:
+        return None, None, {}
+
+    values = ws.get_all_values()
+    header = [str(h).strip() for h in values[0]] if values else []
+    index = {}
+    for row_no, row in enumerate(values[1:], start=2):
+        rec = {h: (row[i] if i < len(row) else "") for i, h in enumerate(header) if h}
+        username = str(rec.get("Username", "")).strip()
+        # Sama seperti scan linear lama: baris pertama yang cocok yang dipakai
+        if not username or username in index:
+            continue
+        pw = rec.pop("Password", "")
+        entry = {"row": row_no, "pw_hash": _hash_user_password(store, pw), "record": rec}
+        entry["fp"] = _user_account_fp(entry)
+        index[username] = entry
+    cols = {h: i for i, h in enumerate(header, start=1) if h}
+    return ws, index, cols
+
+
+def get_user_index(force=False):
+    """Return (worksheet, index). Dibangun ulang kalau kosong / kadaluarsa / force."""
+    store = _get_user_index_store()
+    with store["lock"]:
+        expired = time.time() - store["built_at"] > USER_INDEX_TTL
+        if force or store["index"] is None or expired:
+            ws, index, cols = _build_user_index(store)
+            if index is None:
+                return None, {}
+            store["ws"], store["index"], store["cols"], store["built_at"] = ws, index, cols, time.time()
+        return store["ws"], store["index"]
+
+
+def _locate_user_row(username):
+    """
+    Nomor baris user langsung dari index (tanpa membaca sheet) selama index masih muda
+    (USER_WRITE_MAX_AGE). Index yang lebih tua dibangun ulang sekali (1x get_all_values) dan
+    fingerprint akun (termasuk password) dibandingkan: kalau akun diubah dari luar app sejak
+    index lama dibaca, aksi dibatalkan dengan ROW_CONFLICT_MSG.
+    Return (ws, row) atau (ws, None) kalau user tidak ada.
+    """
+    store = _get_user_index_store()
+    ws, index = get_user_index()
+    entry = index.get(username)
+    if not ws or time.time() - store["built_at"] <= USER_WRITE_MAX_AGE:
+        return ws, entry["row"] if entry else None
+
+    ws, fresh = get_user_index(force=True)
+    current = fresh.get(username)
+    if not ws or not current:
+        return ws, None
+    if entry and not hmac.compare_digest(entry["fp"], current["fp"]):
+        raise ValueError(ROW_CONFLICT_MSG)
+    return ws, current["row"]
+
+
+def check_staff_login(username, password):
+    """Cek login untuk staff biasa via GSheet (1x lookup dict + compare constant-time)."""
+    ws, index = get_user_index()
+    if not ws:
+        return None
+
+    store = _get_user_index_store()
+    entry = index.get(username)
+    # Tetap hitung hash walau user tidak ada, supaya waktu respon tidak membocorkan username
+    pw_hash = _hash_user_password(store, password)
+    if entry and hmac.compare_digest(entry["pw_hash"], pw_hash):
+        return dict(entry["record"])
+    return None
+
+
+def add_staff_account(username, password, nama):
+    """Admin menambah akun staff."""
+    ws, index = get_user_index()
+    if not ws:
+        return False, "DB Error"
+
+    if username in index:
+        return False, "Username sudah dipakai!"
+
+    ws.append_row([username, password, nama, "staff"],
+                  value_input_option="USER_ENTERED")
+    invalidate_user_index()
+    return True, "Akun berhasil dibuat."
+
+
+def update_staff_account(username_lama, new_password=None, new_name=None):
+    """Fitur Edit Akun Staff (Ganti Password / Nama)."""
+    try:
+        ws, row = _locate_user_row(username_lama)
+        if not ws:
+            return False, "DB Error"
+        if row is None:
+            return False, "Username tidak ditemukan."
+
+        cols = _get_user_index_store()["cols"]
+        updates = []
+        if new_password and new_password.strip():
+            updates.append({"range": gspread.utils.rowcol_to_a1(row, cols.get("Password", USER_COL_PASSWORD)),
+                            "values": [[new_password]]})
+        if new_name and new_name.strip():
+            updates.append({"range": gspread.utils.rowcol_to_a1(row, cols.get("Nama", USER_COL_NAMA)),
+                            "values": [[new_name]]})
+        if updates:
+            # Hanya sel yang berubah, satu request
+            ws.batch_update(updates, value_input_option="USER_ENTERED")
+
+            store = _get_user_index_store()
+            with store["lock"]:
+                entry = (store["index"] or {}).get(username_lama)
+                if entry:
+                    if new_password and new_password.strip():
+                        entry["pw_hash"] = _hash_user_password(store, new_password)
+                    if new_name and new_name.strip():
+                        entry["record"]["Nama"] = new_name
+                    entry["fp"] = _user_account_fp(entry)
+        return True, f"Data user {username_lama} berhasil diperbarui."
+    except Exception as e:
+        return False, str(e)
+
+
+def delete_staff_account(username):
+    """Admin menghapus akun staff."""
+    try:
+        ws, row = _locate_user_row(username)
+        if not ws:
+            return False, "DB Error"
+        if row is None:
+            return False, "Username tidak ditemukan."
+        ws.delete_rows(row)
+        # Baris di bawahnya ikut bergeser, index harus dibangun ulang
+        invalidate_user_index()
+        return True, f"User {username} dihapus."
+    except Exception as e:
+        return False, str(e)
+
+
+# =========================================================
+# GLOBAL STYLE (SpaceX x Muhammadiyah — Elegant, International)
+# =========================================================
+
+
+# [BARU] Stylesheet global disimpan sebagai konstanta; dirakit (minify + hash) sekali per proses
+GLOBAL_CSS = """
+        @import url('https://fonts.googleapis.com/css2?family=Space+Grotesk:wght@400;500;600;700;800&display=swap');
+
+        :root{
+            --bg0:#020805;
+            --bg1:#04110b;
+            --bg2:#062015;
+
+            --cardA: rgba(255,255,255,0.06);
+            --cardB: rgba(255,255,255,0.045);
+            --border: rgba(255,255,255,0.10);
+
+            --text: rgba(255,255,255,0.92);
+            --muted: rgba(255,255,255,0.70);
+
+            --green:#16a34a;
+            --green2:#22c55e;
+            --teal:#14b8a6;
+            --gold:#facc15;
+            --amber:#f59e0b;
+            --danger:#ef4444;
+
+            /* Beri tahu browser bahwa UI ini dark theme */
+            color-scheme: dark;
+        }
+
+        /* ---------- App background ---------- */
+        .stApp {
+            background:
+                radial-gradient(circle at 14% 12%, rgba(22, 163, 74, 0.20) 0%, rgba(22, 163, 74, 0.0) 46%),
+                radial-gradient(circle at 84% 14%, rgba(250, 204, 21, 0.16) 0%, rgba(250, 204, 21, 0.0) 42%),
+                radial-gradient(circle at 18% 92%, rgba(20, 184, 166, 0.12) 0%, rgba(20, 184, 166, 0.0) 40%),
+                linear-gradient(180deg, var(--bg0) 0%, var(--bg1) 55%, var(--bg2) 100%);
+            color: var(--text);
+        }
+
+        /* Subtle starfield overlay (Space vibe) */
+        .stApp::before {
+            content: "";
+            position: fixed;
+            inset: 0;
+            pointer-events: none;
+            background:
+                radial-gradient(rgba(255,255,255,0.18) 0.8px, transparent 0.8px);
+            background-size: 68px 68px;
+            opacity: 0.10;
+            -webkit-mask-image: radial-gradient(circle at 50% 15%, rgba(0,0,0,1) 0%, rgba(0,0,0,0.0) 70%);
+            mask-image: radial-gradient(circle at 50% 15%, rgba(0,0,0,1) 0%, rgba(0,0,0,0.0) 70%);
+        }
+
+        /* Hide Streamlit default UI chrome (we use custom header) */
+        #MainMenu {visibility: hidden;}
+        footer {visibility: hidden;}
+        header {visibility: hidden;}
+
+        /* Typography */
+        h1, h2, h3, h4, h5, h6, p, label, span, div {
+            font-family: "Space Grotesk", ui-sans-serif, system-ui, -apple-system, Segoe UI, Roboto, Arial, "Helvetica Neue", "Noto Sans", "Liberation Sans", sans-serif;
+        }
+
+        /* =========================
+        Text selection (blok teks)
+        ========================= */
+        .stApp ::selection{
+            color: #ffffff !important;
+            background: rgba(22,163,74,0.35) !important;
+        }
+        .stApp ::-moz-selection{
+            color: #ffffff !important;
+            background: rgba(22,163,74,0.35) !important;
+        }
+
+        /* Sidebar polish (SpaceX-like) */
+        section[data-testid="stSidebar"] > div {
+            background: linear-gradient(180deg, rgba(0,0,0,0.92) 0%, rgba(3,10,6,0.92) 60%, rgba(4,16,11,0.92) 100%);
+            border-right: 1px solid rgba(255,255,255,0.10);
+        }
+        section[data-testid="stSidebar"] * {
+            color: var(--text) !important;
+        }
+        section[data-testid="stSidebar"] hr {
+            border-color: rgba(255,255,255,0.10);
+        }
+
+        /* Card styling for containers with border=True */
+        div[data-testid="stVerticalBlockBorderWrapper"] > div {
+            background: linear-gradient(180deg, var(--cardA) 0%, var(--cardB) 100%);
+            border: 1px solid var(--border);
+            border-radius: 18px;
+            padding: 1.05rem 1.05rem 0.75rem 1.05rem;
+            box-shadow: 0 16px 46px rgba(0,0,0,0.42);
+            backdrop-filter: blur(10px);
+        }
+
+        /* Buttons */
+        .stButton>button, .stDownloadButton>button {
+            border-radius: 12px !important;
+            border: 1px solid rgba(255,255,255,0.14) !important;
+            background: rgba(255,255,255,0.05) !important;
+            color: var(--text) !important;
+            transition: all 0.15s ease-in-out;
+        }
+        .stButton>button:hover, .stDownloadButton>button:hover {
+            transform: translateY(-1px);
+            border-color: rgba(250,204,21,0.35) !important;
+            background: rgba(255,255,255,0.08) !important;
+        }
+
+        /* Primary button (type=primary) */
+        button[kind="primary"] {
+            background: linear-gradient(135deg, rgba(22,163,74,0.95), rgba(245,158,11,0.92)) !important;
+            color: rgba(6, 26, 17, 0.95) !important;
+            border: none !important;
+        }
+        button[kind="primary"]:hover {
+            filter: brightness(1.05);
+        }
+
+        /* Inputs */
+        .stTextInput input, .stTextArea textarea, .stNumberInput input {
+            border-radius: 12px !important;
+        }
+        .stDateInput input {
+            border-radius: 12px !important;
+        }
+        .stSelectbox div[data-baseweb="select"] > div {
+            border-radius: 12px !important;
+        }
+
+        /* Dataframes / tables */
+        div[data-testid="stDataFrame"] {
+            border-radius: 14px;
+            overflow: hidden;
+            border: 1px solid rgba(255,255,255,0.10);
+        }
+
+        /* =========================
+           HERO HEADER (Custom)
+           ========================= */
+        .sx-hero{
+            position: relative;
+            border-radius: 20px;
+            border: 1px solid rgba(255,255,255,0.12);
+            overflow: hidden;
+            padding: 18px 18px;
+            background:
+                radial-gradient(circle at 50% 0%, rgba(255,255,255,0.08) 0%, rgba(255,255,255,0.0) 52%),
+                linear-gradient(90deg, rgba(0,0,0,0.55) 0%, rgba(0,0,0,0.25) 50%, rgba(0,0,0,0.55) 100%);
+            box-shadow: 0 18px 60px rgba(0,0,0,0.45);
+        }
+        .sx-hero::before{
+            content:"";
+            position:absolute;
+            inset:0;
+            background-image: var(--hero-bg);
+            background-repeat:no-repeat;
+            background-position: var(--hero-bg-pos, 50% 72%);
+            background-size: var(--hero-bg-size, 140%);
+            opacity: 0.28;
+            filter: saturate(1.05) contrast(1.08);
+            pointer-events:none;
+        }
+        .sx-holding-logo{
+            display:block;
+            margin: 0 auto 10px auto;
+            width: clamp(90px, 10vw, 140px);
+            height: auto;
+            opacity: 0.95;
+            filter: drop-shadow(0 10px 22px rgba(0,0,0,0.45));
+        }
+        .sx-hero::after{
+            content:"";
+            position:absolute;
+            inset:0;
+            background:
+                linear-gradient(180deg, rgba(2,8,5,0.15) 0%, rgba(2,8,5,0.52) 100%);
+            pointer-events:none;
+        }
+
+        .sx-hero-grid{
+            position: relative;
+            display: grid;
+            grid-template-columns: 240px 1fr 240px;
+            align-items: center;
+            gap: 14px;
+        }
+
+        .sx-hero-grid > * { min-width: 0; }
+
+        @media (max-width: 1100px){
+            .sx-hero-grid{ grid-template-columns: 200px 1fr 200px; }
+        }
+        @media (max-width: 860px){
+            .sx-hero-grid{ grid-template-columns: 1fr; text-align:center; }
+        }
+
+        *, *::before, *::after { box-sizing: border-box; }
+
+        .sx-logo-card{
+            background: rgba(255,255,255,0.92);
+            border: 1px solid rgba(0,0,0,0.06);
+            border-radius: 16px;
+            width: 100%;
+            max-width: 240px;
+            height: clamp(120px, 12vw, 160px);
+            padding: 10px;
+            display:flex;
+            align-items:center;
+            justify-content:center;
+            box-shadow: 0 10px 26px rgba(0,0,0,0.28);
+        }
+
+        .sx-logo-card img{
+            width: 100%;
+            height: 100%;
+            max-width: 220px;
+            max-height: 100%;
+            object-fit: contain;
+            object-position: center;
+            display: block;
+        }
+
+        .sx-hero-center{
+            text-align: center;
+        }
+        .sx-title{
+            font-size: 2.05rem;
+            font-weight: 800;
+            line-height: 1.12;
+            letter-spacing: 0.06em;
+            text-transform: uppercase;
+            margin: 0;
+        }
+        .sx-subrow{
+            margin-top: 0.45rem;
+            display:flex;
+            gap: 0.55rem;
+            flex-wrap: wrap;
+            justify-content: center;
+            align-items: center;
+            color: rgba(255,255,255,0.78);
+            font-size: 0.95rem;
+        }
+        .sx-pill{
+            display:inline-flex;
+            align-items:center;
+            gap: 0.35rem;
+            padding: 0.22rem 0.60rem;
+            border-radius: 999px;
+            border: 1px solid rgba(255,255,255,0.14);
+            background: rgba(255,255,255,0.06);
+            color: rgba(255,255,255,0.88);
+            font-size: 0.80rem;
+        }
+        .sx-pill.on{
+            border-color: rgba(34,197,94,0.55);
+            box-shadow: 0 0 0 2px rgba(34,197,94,0.10) inset;
+        }
+        .sx-pill.off{
+            border-color: rgba(239,68,68,0.55);
+            box-shadow: 0 0 0 2px rgba(239,68,68,0.10) inset;
+        }
+        .sx-dot{
+            width: 8px; height: 8px; border-radius: 999px; display:inline-block;
+            background: rgba(255,255,255,0.55);
+        }
+        .sx-pill.on .sx-dot{ background: rgba(34,197,94,0.95); }
+        .sx-pill.off .sx-dot{ background: rgba(239,68,68,0.95); }
+
+        /* =========================
+           Sidebar Nav (SpaceX-like)
+           ========================= */
+        .sx-nav{
+            margin-top: 0.25rem;
+        }
+        .sx-nav button{
+            width: 100% !important;
+            text-align: left !important;
+            border-radius: 12px !important;
+            padding: 0.60rem 0.80rem !important;
+            text-transform: uppercase !important;
+            letter-spacing: 0.10em !important;
+            font-size: 0.78rem !important;
+        }
+        .sx-nav button[kind="primary"]{
+            background: linear-gradient(90deg, rgba(22,163,74,0.95), rgba(245,158,11,0.90)) !important;
+            color: rgba(6,26,17,0.95) !important;
+        }
+
+        .sx-section-title{
+            font-size: 0.82rem;
+            letter-spacing: 0.12em;
+            text-transform: uppercase;
+            color: rgba(255,255,255,0.70);
+        }
+
+        /* ==================================================
+           MOBILE ONLY (<=768px) - tidak mengubah desktop
+           ================================================== */
+        @media (max-width: 768px){
+          /* Sidebar disembunyikan di HP */
+          section[data-testid="stSidebar"] { display: none !important; }
+
+          /* Padding konten + ruang untuk bottom nav */
+          .block-container {
+            padding-left: 1rem !important;
+            padding-right: 1rem !important;
+            padding-bottom: 80px !important; /* biar konten tidak ketutup bottom nav */
+          }
+
+          /* Hero dibuat lebih ringkas */
+          .sx-title { font-size: 1.35rem !important; }
+          .sx-hero-grid { grid-template-columns: 1fr !important; }
+
+          /* Logo kiri/kanan dimatikan di HP biar tidak makan tempat */
+          .sx-logo-card { display:none !important; }
+
+          .mobile-bottom-nav{
+            position: fixed;
+            left: 0; right: 0; bottom: 0;
+            padding: 10px 12px;
+            background: rgba(0,0,0,0.75);
+            border-top: 1px solid rgba(255,255,255,0.12);
+            display: flex;
+            justify-content: space-around;
+            gap: 8px;
+            z-index: 9999;
+            backdrop-filter: blur(10px);
+          }
+          .mobile-bottom-nav a{
+            text-decoration:none;
+            color: rgba(255,255,255,0.92);
+            padding: 8px 10px;
+            border-radius: 12px;
+            border: 1px solid rgba(255,255,255,0.12);
+            background: rgba(255,255,255,0.06);
+            font-size: 14px;
+          }
+
+          /* Kurangi efek blur di HP (card form Closing Deal) */
+          div[data-testid="stVerticalBlockBorderWrapper"] > div {
+            backdrop-filter: none !important;
+            background: linear-gradient(
+                180deg,
+                rgba(6, 36, 22, 0.96),
+                rgba(5, 25, 17, 0.98)
+            ) !important;
+          }
+        }
+
+        /* =========================================
+           PATCH KONTRAS TEKS & LOGO (MOBILE + DESKTOP)
+           ========================================= */
+
+        /* 1. Warna label & teks kecil di dalam form Closing Deal */
+        div[data-testid="stForm"] label,
+        div[data-testid="stForm"] p {
+            color: rgba(255, 255, 255, 0.9) !important;
+        }
+
+        /* 2. Warna teks judul field di dalam kartu form (jaga-jaga) */
+        div[data-testid="stVerticalBlockBorderWrapper"] label,
+        div[data-testid="stVerticalBlockBorderWrapper"] p {
+            color: rgba(255, 255, 255, 0.88) !important;
+        }
+
+        /* 3. Biar icon / logo tidak nyaru di navbar / header custom */
+        .sx-nav button,
+        .sx-nav svg,
+        .sx-nav span {
+            color: #ffffff !important;
+            fill: #ffffff !important;
+        }
+
+        /* =========================================
+           PATCH LANJUTAN – KONTRAS TEKS DI DALAM CARD
+           (Riwayat Closing, dst)
+           ========================================= */
+
+        /* Semua teks di dalam card ber-border */
+        div[data-testid="stVerticalBlockBorderWrapper"],
+        div[data-testid="stVerticalBlockBorderWrapper"] p,
+        div[data-testid="stVerticalBlockBorderWrapper"] span,
+        div[data-testid="stVerticalBlockBorderWrapper"] small,
+        div[data-testid="stVerticalBlockBorderWrapper"] li {
+            color: rgba(255, 255, 255, 0.90) !important;
+        }
+
+        /* Teks yang berasal dari st.markdown / st.write */
+        div[data-testid="stMarkdown"],
+        div[data-testid="stMarkdown"] p,
+        div[data-testid="stMarkdown"] span,
+        div[data-testid="stMarkdown"] li,
+        div[data-testid="stMarkdown"] small,
+        div[data-testid="stMarkdownContainer"],
+        div[data-testid="stMarkdownContainer"] p,
+        div[data-testid="stMarkdownContainer"] span,
+        div[data-testid="stMarkdownContainer"] li,
+        div[data-testid="stMarkdownContainer"] small {
+            color: rgba(255, 255, 255, 0.90) !important;
+        }
+
+        /* =========================================
+           FIX KONTRAS METRIC (Total Nilai, Overdue, dll)
+           ========================================= */
+
+        /* Container metric */
+        div[data-testid="stMetric"] {
+            color: var(--text) !important;
+        }
+
+        /* Label kecil di atas angka */
+        div[data-testid="stMetricLabel"],
+        div[data-testid="stMetric"] label {
+            color: rgba(255,255,255,0.80) !important;
+            font-weight: 500 !important;
+        }
+
+        /* Angka besar (nilai utama metric) */
+        div[data-testid="stMetricValue"] {
+            color: var(--gold) !important;  /* ganti ke var(--text) kalau mau putih */
+            font-weight: 700 !important;
+        }
+
+        /* Delta metric (jika dipakai) */
+        div[data-testid="stMetricDelta"] {
+            color: var(--green2) !important;
+            font-weight: 600 !important;
+        }
+
+        /* =========================================
+           LOADING SPINNER OVERLAY (FIXED & FULLSCREEN)
+           ========================================= */
+        /* Container utama spinner: dibuat memenuhi satu layar penuh */
+        div[data-testid="stSpinner"] {
+            position: fixed !important;
+            top: 0 !important;
+            left: 0 !important;
+            width: 100vw !important;
+            height: 100vh !important;
+            z-index: 999999 !important; /* Pastikan di paling depan */
+
+            /* Background Gelap Transparan (Glassmorphism) */
+            background: rgba(0, 0, 0, 0.85) !important;
+            backdrop-filter: blur(8px); /* Efek blur latar belakang */
+
+            /* Posisi konten di tengah */
+            display: flex;
+            flex-direction: column;
+            align-items: center;
+            justify-content: center;
+            gap: 20px;
+
+            /* Reset style bawaan yang mengganggu */
+            transform: none !important;
+            border: none !important;
+            box-shadow: none !important;
+        }
+
+        /* Teks pesan loading (misal: "Sedang menyimpan...") */
+        div[data-testid="stSpinner"] > div {
+            color: #ffffff !important;
+            font-size: 1.1rem !important;
+            font-weight: 500 !important;
+            letter-spacing: 0.05em;
+            text-shadow: 0 2px 4px rgba(0,0,0,0.5);
+        }
+
+        /* Icon Lingkaran Berputar (Spinner) */
+        /* Target elemen SVG atau div lingkaran di dalam spinner */
+        div[data-testid="stSpinner"] > div > div {
+            border-top-color: var(--gold) !important;    /* Warna Emas */
+            border-right-color: var(--green) !important; /* Warna Hijau */
+            border-bottom-color: var(--gold) !important; /* Warna Emas */
+            border-left-color: transparent !important;
+            width: 3.5rem !important;  /* Ukuran icon lebih besar */
+            height: 3.5rem !important;
+            border-width: 4px !important; /* Ketebalan garis */
+        }
+
+"""
+
+
+def static_serving_enabled() -> bool:
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def _static_css_supported() -> bool:
+    """
+    Apakah server Streamlit menyajikan .css di /app/static sebagai text/css.
+    - Server tornado lama: hanya ekstensi di SAFE_APP_STATIC_FILE_EXTENSIONS yang diberi
+      Content-Type asli; lainnya text/plain (+ nosniff) sehingga <link> ke .css diabaikan.
+    - Server starlette (1.5x+): Content-Type ditebak dari ekstensi (guess_content_type).
+    Tidak bisa dipastikan -> False (pakai CSS inline).
+    """
+    try:
+        from streamlit.web.server.app_static_file_handler import SAFE_APP_STATIC_FILE_EXTENSIONS
+        return ".css" in SAFE_APP_STATIC_FILE_EXTENSIONS
+    except ImportError:
+        pass
+    try:
+        from streamlit.web.server.component_file_utils import guess_content_type
+        return guess_content_type("global.css") == "text/css"
+    except Exception:
+        return False
+
+
+@st.cache_resource(show_spinner=False)
+def get_global_css_bundle():
+    """
+    Return {"href", "inline", "css", "hash", "bytes", "original_bytes"}.
+    - href  : URL static (content-hashed) kalau static serving aktif; browser cache file ini.
+    - inline: fallback <style> berisi CSS yang sudah di-minify ("css" = isinya saja).
+    """
+    minified = ap.minify_css(GLOBAL_CSS)
+    use_static = static_serving_enabled() and _static_css_supported()
+    info = ap.publish_text_asset("global", minified, ".css", use_static=use_static)
+    return {
+        "href": info["src"],
+        "inline": f"<style>{minified}</style>",
+        "css": minified,
+        "hash": info["hash"],
+        "bytes": info["bytes"],
+        "original_bytes": len(GLOBAL_CSS.encode("utf-8")),
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _html_js_supported() -> bool:
+    # st.html(unsafe_allow_javascript=...) baru ada di Streamlit versi baru
+    try:
+        return "unsafe_allow_javascript" in inspect.signature(st.html).parameters
+    except (AttributeError, TypeError, ValueError):
+        return False
+
+
+def _css_loader_html(bundle):
+    """Script yang memasang CSS global di <head> dokumen (node-nya bertahan antar rerun)."""
+    node_id = f"sx-global-css-{bundle['hash']}"
+    if bundle["href"]:
+        make = f"el = d.createElement('link'); el.rel = 'stylesheet'; el.href = {json.dumps(bundle['href'])};"
+    else:
+        css = json.dumps(bundle["css"]).replace("</", "<\\/")
+        make = f"el = d.createElement('style'); el.textContent = {css};"
+    return (
+        "<script>(function () {"
+        f"var d = document, el; if (d.getElementById('{node_id}')) return;"
+        "d.querySelectorAll('[data-sx-global-css]').forEach(function (n) { n.remove(); });"
+        f"{make} el.id = '{node_id}'; el.setAttribute('data-sx-global-css', '1');"
+        "d.head.appendChild(el);"
+        "})();</script>"
+    )
+
+
+def inject_global_css():
+    """
+    CSS global dikirim SEKALI per sesi (per hash bundle): script kecil memasangnya di <head>
+    dokumen, jadi rerun berikutnya tidak mengirim ulang <link>/<style> lewat delta websocket.
+    Refresh browser = sesi baru = dipasang lagi. Streamlit lama (st.html tanpa JavaScript):
+    fallback kirim tag lewat st.markdown di setiap rerun.
+    """
+    bundle = get_global_css_bundle()
+    if _html_js_supported():
+        if st.session_state.get("_global_css_hash") == bundle["hash"]:
+            return
+        st.html(_css_loader_html(bundle), unsafe_allow_javascript=True)
+        st.session_state["_global_css_hash"] = bundle["hash"]
+        return
+
+    if bundle["href"]:
+        html = f"<link rel='stylesheet' href='{bundle['href']}' data-css-hash='{bundle['hash']}'>"
+    else:
+        html = bundle["inline"]
+    st.markdown(html, unsafe_allow_html=True)
+
+
+# =========================================================
+# COMPAT HELPERS (toast / link button)
+# =========================================================
+def ui_toast(message: str, icon=None):
+    """Streamlit toast (fallback ke success jika tidak tersedia)."""
+    if hasattr(st, "toast"):
+        try:
+            st.toast(message, icon=icon)
+            return
+        except Exception:
+            pass
+    st.success(message)
+
+
+# =========================================================
+# CONSTANTS
+# =========================================================
+NAMA_GOOGLE_SHEET = "Laporan Kegiatan Harian"
+FOLDER_DROPBOX = "/Laporan_Kegiatan_Harian"
+
+# Sheet Names
+SHEET_CONFIG_NAMA = "Config_Staf"
+SHEET_TARGET_TEAM = "Target_Team_Checklist"
+SHEET_TARGET_INDIVIDU = "Target_Individu_Checklist"
+SHEET_CONFIG_TEAM = "Config_Team"
+SHEET_CLOSING_DEAL = "Closing_Deal"
+SHEET_PEMBAYARAN = "Pembayaran_DP"
+SHEET_PRESENSI = "Presensi_Kehadiran"
+PRESENSI_COLUMNS = ["Timestamp", "Nama", "Tipe Absen", "Hari",
+                    "Tanggal", "Bulan", "Tahun", "Waktu","Link Foto"]
+
+
+def init_presensi_db():
+    """Memastikan sheet presensi tersedia dan header sesuai standar terbaru (termasuk Link Foto)."""
+    try:
+        try:
+            # 1. Mencoba membuka worksheet yang sudah ada
+            ws = spreadsheet.worksheet(SHEET_PRESENSI)
+        except gspread.WorksheetNotFound:
+            # 2. Jika worksheet benar-benar belum ada, buat baru
+            ws = spreadsheet.add_worksheet(
+                title=SHEET_PRESENSI, 
+                rows=2000, 
+                cols=len(PRESENSI_COLUMNS)
+            )
+            # Masukkan header awal untuk pertama kali
+            ws.append_row(PRESENSI_COLUMNS, value_input_option="USER_ENTERED")
+            maybe_auto_format_sheet(ws, force=True)
+        
+        # 3. KUNCI REVISI: Pastikan kolom selalu sinkron. 
+        # Jika Anda baru saja menambah "Link Foto" ke PRESENSI_COLUMNS, 
+        # fungsi ini akan otomatis menambahkannya di Google Sheets Anda.
+        ensure_headers(ws, PRESENSI_COLUMNS)
+        
+        return ws
+    except Exception as e:
+        # Menampilkan log error di terminal agar mudah dilacak jika koneksi bermasalah
+        print(f"Error init_presensi_db: {e}")
+        return None
+
+
+def catat_presensi(nama_staf, tipe="Masuk", file_foto=None):
+    """
+    Logika utama presensi terpadu: 
+    Mendukung tipe Masuk/Pulang, Real-time, Upload Dropbox, dan Validasi Alur.
+    """
+    ws = init_presensi_db()
+    if not ws:
+        return False, "Database Presensi Error"
+
+    # 1. Ambil Waktu Real-Time (WIB)
+    now = datetime.now(TZ_JKT)
+
+    # Mapping Hari Indonesia (Tetap sesuai flow lama Anda)
+    hari_map = {
+        "Monday": "Senin", "Tuesday": "Selasa", "Wednesday": "Rabu",
+        "Thursday": "Kamis", "Friday": "Jumat", "Saturday": "Sabtu", "Sunday": "Minggu"
+    }
+
+    ts_full = now.strftime("%d-%m-%Y %H:%M:%S")
+    hari = hari_map.get(now.strftime("%A"), now.strftime("%A"))
+    tanggal = now.strftime("%d")
+    bulan = now.strftime("%B")
+    tahun = now.strftime("%Y")
+    waktu = now.strftime("%H:%M:%S")
+    today_str = now.strftime("%d-%m-%Y")
+
+    # 2. VALIDASI PINTAR (Mencegah double masuk/pulang & urutan yang salah)
+    records = ws.get_all_records()
+    sudah_masuk = False
+    sudah_pulang = False
+
+    for r in records:
+        # Cek apakah nama sama dan tanggal hari ini ada di kolom Timestamp
+        if str(r.get("Nama")) == nama_staf and today_str in str(r.get("Timestamp")):
+            tipe_record = str(r.get("Tipe Absen", "")).strip()
+            if tipe_record == "Masuk":
+                sudah_masuk = True
+            if tipe_record == "Pulang":
+                sudah_pulang = True
+
+    # Logika pencegahan
+    if tipe == "Masuk":
+        if sudah_masuk:
+            return False, f"Anda sudah melakukan Presensi Masuk hari ini pada sistem."
+    
+    elif tipe == "Pulang":
+        if not sudah_masuk:
+            return False, "Gagal: Anda belum melakukan Presensi Masuk. Silakan Masuk terlebih dahulu."
+        if sudah_pulang:
+            return False, "Anda sudah melakukan Presensi Pulang hari ini."
+
+    # 3. Handle Upload Foto ke Dropbox
+    link_foto = "-" 
+    if file_foto is not None:
+        if KONEKSI_DROPBOX_BERHASIL:
+            # Folder kategori dinamis sesuai tipe: Presensi_Masuk atau Presensi_Pulang
+            url = upload_ke_dropbox(file_foto, nama_staf, kategori=f"Presensi_{tipe}")
+            if url and url != "-":
+                link_foto = url
+        else:
+            return False, "Gagal simpan: Koneksi Dropbox bermasalah (Foto wajib untuk presensi)."
+
+    # 4. Masukkan Data ke GSheet (Update: Menambahkan kolom 'tipe' di posisi ketiga)
+    # Urutan Kolom: Timestamp, Nama, Tipe Absen, Hari, Tanggal, Bulan, Tahun, Waktu, Link Foto
+    row = [
+        f"'{ts_full}", 
+        nama_staf, 
+        tipe,        # Masuk ke kolom Tipe Absen
+        hari, 
+        tanggal, 
+        bulan, 
+        tahun, 
+        waktu, 
+        link_foto
+    ]
+    
+    ws.append_row(row, value_input_option="USER_ENTERED")
+
+    return True, f"Berhasil! Presensi {tipe} tercatat pukul {waktu} WIB."
+
+
+# Kolom laporan harian
+COL_TIMESTAMP = "Timestamp"
+COL_NAMA = "Nama"
+COL_TEMPAT = "Tempat Dikunjungi"
+COL_DESKRIPSI = "Deskripsi"
+COL_LINK_FOTO = "Link Foto"
+COL_LINK_SOSMED = "Link Sosmed"
+COL_KESIMPULAN = "Kesimpulan"
+COL_KENDALA = "Kendala"
+COL_KENDALA_KLIEN = "Kendala Klien"
+COL_PENDING = "Next Plan (Pending)"
+COL_FEEDBACK = "Feedback Lead"
+COL_INTEREST = "Interest (%)"
+COL_NAMA_KLIEN = "Nama Klien"
+COL_KONTAK_KLIEN = "No HP/WA"
+
+NAMA_KOLOM_STANDAR = [
+    COL_TIMESTAMP, COL_NAMA, COL_TEMPAT, COL_DESKRIPSI,
+    COL_LINK_FOTO, COL_LINK_SOSMED,
+    COL_KESIMPULAN, COL_KENDALA, COL_KENDALA_KLIEN,
+    COL_PENDING,
+    COL_FEEDBACK,
+    COL_INTEREST,
+    COL_NAMA_KLIEN,
+    COL_KONTAK_KLIEN
+]
+
+# Audit columns
+COL_TS_UPDATE = "Timestamp Update (Log)"
+COL_UPDATED_BY = "Updated By"
+# [BARU] Stempel versi baris (kolom tersembunyi di ujung kanan, lihat VERSI BARIS)
+COL_ROW_VERSION = "_Row Version"
+# [BARU] ID baris permanen (kolom tersembunyi, lihat ID BARIS)
+COL_ROW_ID = "_Row ID"
+
+# Team config columns
+TEAM_COL_NAMA_TEAM = "Nama Team"
+TEAM_COL_POSISI = "Posisi"
+TEAM_COL_ANGGOTA = "Nama Anggota"
+TEAM_COLUMNS = [TEAM_COL_NAMA_TEAM, TEAM_COL_POSISI, TEAM_COL_ANGGOTA]
+
+# =========================================================
+# DEFINISI KOLOM DATA (DATABASE STRUCTURE)
+# =========================================================
+
+# --- 1. Closing Deal Columns ---
+COL_GROUP = "Nama Group"
+COL_MARKETING = "Nama Marketing"
+COL_TGL_EVENT = "Tanggal Event"
+COL_BIDANG = "Bidang"
+COL_NILAI_KONTRAK = "Nilai Kontrak"  # disimpan sebagai angka (int)
+
+CLOSING_COLUMNS = [
+    COL_GROUP, 
+    COL_MARKETING, 
+    COL_TGL_EVENT, 
+    COL_BIDANG, 
+    COL_NILAI_KONTRAK
+]
+
+# --- 2. Target / Checklist Columns ---
+TEAM_CHECKLIST_COLUMNS = [
+    "Misi", "Tgl_Mulai", "Tgl_Selesai", "Status", 
+    "Bukti/Catatan", COL_TS_UPDATE, COL_UPDATED_BY
+]
+INDIV_CHECKLIST_COLUMNS = [
+    "Nama", "Target", "Tgl_Mulai", "Tgl_Selesai", "Status", 
+    "Bukti/Catatan", COL_TS_UPDATE, COL_UPDATED_BY
+]
+
+# --- 3. Smart Pembayaran Columns (Update Khusus) ---
+COL_TS_BAYAR = "Timestamp Input"
+COL_NILAI_KESEPAKATAN = "Total Nilai Kesepakatan" # [NEW]
+COL_JENIS_BAYAR = "Jenis Pembayaran"             # DP, Cicilan, atau Cash
+COL_NOMINAL_BAYAR = "Nominal Pembayaran"         # Nominal yang masuk saat ini
+COL_TENOR_CICILAN = "Tenor (Bulan)"              # [NEW]
+COL_SISA_BAYAR = "Sisa Pembayaran"               # [NEW] Kalkulator Otomatis
+COL_JATUH_TEMPO = "Batas Waktu Bayar"
+COL_STATUS_BAYAR = "Status Pembayaran"           # Deskripsi status (Lunas/Belum)
+COL_BUKTI_BAYAR = "Bukti Pembayaran"
+COL_CATATAN_BAYAR = "Catatan"
+
+PAYMENT_COLUMNS = [
+    COL_TS_BAYAR,
+    COL_GROUP,
+    COL_MARKETING,
+    COL_TGL_EVENT,
+    COL_NILAI_KESEPAKATAN, # Letakkan total di awal agar alur logika jelas
+    COL_JENIS_BAYAR,
+    COL_NOMINAL_BAYAR,
+    COL_TENOR_CICILAN,
+    COL_SISA_BAYAR,
+    COL_JATUH_TEMPO,
+    COL_STATUS_BAYAR,
+    COL_BUKTI_BAYAR,
+    COL_CATATAN_BAYAR,
+    COL_TS_UPDATE,
+    COL_UPDATED_BY
+]
+
+# --- 4. System Config ---
+TZ_JKT = ZoneInfo("Asia/Jakarta")
+
+# Formatting throttling (menghindari API overload saat batch update)
+FORMAT_THROTTLE_SECONDS = 300  # 5 minutes
+
+# =========================================================
+# [BARU] SCHEMA REGISTRY (TIPE KOLOM PER SHEET)
+# =========================================================
+# Satu sumber kebenaran untuk tipe kolom: konversi data, column_config editor,
+# dan format Google Sheet semuanya membaca dari sini (bukan tebak keyword nama kolom).
+_TXT = sr.ColumnSpec(sr.KIND_TEXT)
+_LONG = sr.ColumnSpec(sr.KIND_LONG_TEXT)
+_LINK = sr.ColumnSpec(sr.KIND_LINK)
+_MONEY = sr.ColumnSpec(sr.KIND_MONEY)
+_DATE = sr.ColumnSpec(sr.KIND_DATE)
+_TS = sr.ColumnSpec(sr.KIND_TIMESTAMP)
+_BOOL = sr.ColumnSpec(sr.KIND_BOOL)
+_NAMA = sr.ColumnSpec(sr.KIND_TEXT, width=160)
+_LOG = sr.ColumnSpec(sr.KIND_LONG_TEXT, width=360)
+_HIDDEN = sr.ColumnSpec(sr.KIND_HIDDEN)
+
+_CHECKLIST_SPECS = {
+    "Misi": _LONG, "Target": _LONG, "Nama": _NAMA,
+    "Tgl_Mulai": _DATE, "Tgl_Selesai": _DATE, "Status": _BOOL,
+    "Bukti/Catatan": _LONG, COL_TS_UPDATE: _LOG, COL_UPDATED_BY: _NAMA,
+    COL_ROW_VERSION: _HIDDEN, COL_ROW_ID: _HIDDEN,
+}
+
+# Dijalankan sekali per proses (app_core di-import sekali); register_sheet juga idempotent,
+# jadi cache compile/editor registry hanya dikosongkan kalau spec benar-benar berubah.
+sr.register_sheet("laporan_harian", {
+    COL_TIMESTAMP: _TS, COL_NAMA: _NAMA, COL_TEMPAT: _LONG, COL_DESKRIPSI: _LONG,
+    COL_LINK_FOTO: _LINK, COL_LINK_SOSMED: _LINK,
+    COL_KESIMPULAN: _LONG, COL_KENDALA: _LONG, COL_KENDALA_KLIEN: _LONG,
+    COL_PENDING: _LONG, COL_FEEDBACK: _LONG,
+    COL_INTEREST: sr.ColumnSpec(sr.KIND_TEXT, width=140, align="CENTER"),
+    COL_NAMA_KLIEN: _LONG,
+    COL_KONTAK_KLIEN: sr.ColumnSpec(sr.KIND_TEXT, width=150, align="CENTER"),
+})
+sr.register_sheet(SHEET_CLOSING_DEAL, {
+    COL_GROUP: _LONG, COL_MARKETING: _LONG, COL_TGL_EVENT: _DATE,
+    COL_BIDANG: _LONG, COL_NILAI_KONTRAK: _MONEY,
+    COL_ROW_VERSION: _HIDDEN, COL_ROW_ID: _HIDDEN,
+})
+sr.register_sheet(SHEET_PEMBAYARAN, {
+    COL_TS_BAYAR: _TS, COL_GROUP: _LONG, COL_MARKETING: _LONG, COL_TGL_EVENT: _DATE,
+    COL_NILAI_KESEPAKATAN: _MONEY, COL_JENIS_BAYAR: _LONG, COL_NOMINAL_BAYAR: _MONEY,
+    COL_TENOR_CICILAN: sr.ColumnSpec(sr.KIND_INT),
+    COL_SISA_BAYAR: _MONEY, COL_JATUH_TEMPO: _DATE,
+    COL_STATUS_BAYAR: sr.ColumnSpec(sr.KIND_BOOL, width=130),
+    COL_BUKTI_BAYAR: _LINK, COL_CATATAN_BAYAR: _LONG,
+    COL_TS_UPDATE: _LOG, COL_UPDATED_BY: _NAMA,
+    COL_ROW_VERSION: _HIDDEN, COL_ROW_ID: _HIDDEN,
+})
+sr.register_sheet(SHEET_TARGET_TEAM, {c: _CHECKLIST_SPECS[c] for c in TEAM_CHECKLIST_COLUMNS + [COL_ROW_VERSION, COL_ROW_ID]})
+sr.register_sheet(SHEET_TARGET_INDIVIDU, {c: _CHECKLIST_SPECS[c] for c in INDIV_CHECKLIST_COLUMNS + [COL_ROW_VERSION, COL_ROW_ID]})
+sr.register_sheet(SHEET_CONFIG_TEAM, {c: _LONG for c in TEAM_COLUMNS})
+sr.register_sheet(SHEET_PRESENSI, {
+    "Timestamp": _TS, "Nama": _NAMA, "Tipe Absen": _TXT, "Hari": _TXT,
+    # "Tanggal" & "Tahun" di presensi = angka hari/tahun, bukan tanggal lengkap
+    "Tanggal": sr.ColumnSpec(sr.KIND_INT), "Bulan": _TXT, "Tahun": sr.ColumnSpec(sr.KIND_INT),
+    "Waktu": _TXT, "Link Foto": _LINK,
+})
+
+# =========================================================
+# MOBILE DETECTION (safe, tidak mengubah desktop)
+# =========================================================
+
+
+def is_mobile_device() -> bool:
+    """
+    Deteksi via User-Agent. Hanya dipakai untuk membedakan UI HP vs Desktop.
+    Jika st.context tidak tersedia, fallback = False (anggap desktop).
+    """
+    try:
+        ua = ""
+        if hasattr(st, "context") and hasattr(st.context, "headers"):
+            headers = st.context.headers
+            ua = (headers.get("user-agent")
+                  or headers.get("User-Agent") or "").lower()
+        return any(k in ua for k in ["android", "iphone", "ipad", "mobile"])
+    except Exception:
+        return False
+
+
+# =========================================================
+# SMALL HELPERS
+# =========================================================
+TS_FORMAT = "%d-%m-%Y %H:%M:%S"
+
+
+def now_ts_str() -> str:
+    """Timestamp akurat (WIB) untuk semua perubahan."""
+    return datetime.now(tz=TZ_JKT).strftime(TS_FORMAT)
+
+
+def parse_ts_series(series, fmt=TS_FORMAT):
+    """Parse kolom timestamp dengan format eksak (tanpa tebak format per baris)."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    s = series.astype(str).str.strip().str.lstrip("'")
+    return pd.to_datetime(s, format=fmt, errors="coerce")
+
+
+# Kunci kanonik timestamp untuk mencocokkan baris (sheet string vs RAM datetime)
+TS_KEY_FORMAT = "%Y%m%d%H%M%S"
+
+
+def ts_key_series(series):
+    """
+    Timestamp -> kunci "YYYYmmddHHMMSS". Nilai yang tidak bisa diparse (data lama)
+    jatuh ke versi digit-saja dari teks aslinya.
+    """
+    series = pd.Series(series)
+    keys = parse_ts_series(series).dt.strftime(TS_KEY_FORMAT)
+    sisa = keys.isna()
+    if sisa.any():
+        keys[sisa] = series[sisa].astype(str).str.replace(r"\D", "", regex=True)
+    return keys.fillna("").astype(str)
+
+
+def ts_key(value) -> str:
+    if isinstance(value, (datetime, pd.Timestamp)):
+        return "" if pd.isna(value) else value.strftime(TS_KEY_FORMAT)
+    return ts_key_series([value]).iloc[0]
+
+# =========================================================
+# [MIGRASI] PEMBAYARAN LOGIC HELPERS
+# =========================================================
+def safe_str(x, default="") -> str:
+    try:
+        if x is None or (isinstance(x, float) and pd.isna(x)):
+            return default
+        s = str(x)
+        if s.lower() in {"nan", "none"}:
+            return default
+        return s
+    except Exception:
+        return default
+
+
+def normalize_bool(x) -> bool:
+    if isinstance(x, bool):
+        return x
+    s = safe_str(x, "").strip().upper()
+    return True if s == "TRUE" else False
+
+
+def normalize_date(x):
+    """Return datetime.date or None."""
+    if x is None or (isinstance(x, float) and pd.isna(x)):
+        return None
+    if isinstance(x, date) and not isinstance(x, datetime):
+        return x
+    try:
+        return pd.to_datetime(x, errors="coerce").date()
+    except Exception:
+        return None
+
+
+def get_actor_fallback(default="-") -> str:
+    """
+    Ambil 'actor' (siapa yang mengedit) dari session_state yang tersedia.
+    Jika tidak ada, fallback ke default.
+    """
+    for k in ["pelapor_main", "sidebar_user", "payment_editor_name"]:
+        if k in st.session_state and safe_str(st.session_state.get(k), "").strip():
+            return safe_str(st.session_state.get(k)).strip()
+    return default
+
+
+def dynamic_column_mapper(df):
+    mapping = {}
+    # Tambahkan keyword yang mungkin ada di GSheet Anda
+    keywords = {
+        "Waktu": "Waktu",
+        "Pelaku": "User",
+        "User": "User",
+        "Aksi": "Status",     # Menangkap "Aksi Dilakukan"
+        "Status": "Status",   # Menangkap "Status"
+        "Nama Data": "Target Data",
+        "Target": "Target Data",
+        "Sheet": "Target Data",
+        "Alasan": "Chat & Catatan",
+        "Chat": "Chat & Catatan",
+        "Rincian": "Detail Perubahan",
+        "Detail": "Detail Perubahan"
+    }
+
+    for col in df.columns:
+        for key, standard_name in keywords.items():
+            if key.lower() in str(col).lower():
+                mapping[col] = standard_name
+                break
+
+    return df.rename(columns=mapping)
+
+# =========================================================
+# [BARU] FALLBACK INSIGHT GENERATOR (MACHINE LEARNING/STATISTIK)
+# =========================================================
+# =========================================================
+# [FINAL REVISI] FALLBACK INSIGHT (MOTIVATIONAL & INCLUSIVE)
+# =========================================================
+def generate_smart_insight_fallback(df_rollup, total_laporan=None):
+    """
+    Menghasilkan insight otomatis dengan nada motivasi tinggi.
+    Fokus: Mengangkat kerja keras tim vs kompetitor luar (Us vs Them).
+    Input berupa rollup produktivitas (lihat get_report_rollup), bukan laporan mentah.
+    """
+    try:
+        if df_rollup is None or df_rollup.empty:
+            return "Belum ada laporan masuk. Tim sedang bersiap untuk memulai pergerakan hari ini."
+
+        if total_laporan is None:
+            total_laporan = int(df_rollup["Jumlah"].sum())
+
+        # 1. Ambil Nama Tim (Inklusif - menyebut semua yang berkontribusi)
+        active_names = rollup_counts(df_rollup, "Nama").index.tolist()
+        
+        # Format nama agar rapi (A, B, dan C)
+        if len(active_names) > 2:
+            names_str = ", ".join(active_names[:-1]) + ", dan " + active_names[-1]
+        elif len(active_names) == 2:
+            names_str = " dan ".join(active_names)
+        else:
+            names_str = active_names[0]
+
+        # 2. Deteksi Dominasi Kegiatan untuk Konteks
+        top_activity = rollup_counts(df_rollup, "Kategori").index[0]
+
+        # 3. Narasi Psikologis (Sesuai Request)
+        # Paragraf 1: Fakta Data (Total & Siapa)
+        p1 = (
+            f"Saat ini, total produktivitas yang terekam telah mencapai **{total_laporan} laporan**. "
+            f"Seluruh aktivitas ini merupakan hasil eksekusi langsung dari **semua anggota team Bapak** ({names_str}) yang bergerak sinergis."
+        )
+
+        # Paragraf 2: Perbandingan dengan Kompetitor (Motivational Hook)
+        p2 = (
+            f"Secara performa, nilai aktivitas ini **jauh lebih baik daripada tim lapangan pada perusahaan lain di luar sana**. "
+            f"Di saat kompetitor mungkin hari ini masih sibuk berkutat dengan rapat atau baru sekadar merencanakan strategi di atas kertas, "
+            f"team Bapak sudah satu langkah di depan dengan eksekusi nyata di lapangan."
+        )
+
+        # Paragraf 3: Penutup (Validasi Usaha)
+        if "Kunjungan" in top_activity:
+            p3 = "Setiap kunjungan yang terjadi hari ini adalah aset data riil yang tidak dimiliki oleh mereka yang hanya menunggu di kantor."
+        else:
+            p3 = "Konsistensi aktivitas ini adalah fondasi yang kuat untuk memenangkan pasar sebelum kompetitor menyadarinya."
+
+        # Gabungkan
+        insight = f"**Analisis Eksekutif (Mode Statistik):**\n\n{p1}\n\n{p2}\n\n{p3}"
+        return insight
+
+    except Exception as e:
+        return f"Sistem sedang mengkalkulasi data tim... ({str(e)})"
+
+# =========================================================
+# [BARU] DYNAMIC UI HELPERS (Anti-Crash & Auto-Type)
+# =========================================================
+
+def clean_df_types_dynamically(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Samakan tipe data mentah dari Sheet sesuai schema registry (uang -> int,
+    tanggal -> datetime64, status -> bool) agar editor tidak error.
+    """
+    return sr.to_typed(df)
+
+
+def generate_dynamic_column_config(df):
+    """column_config editor dari schema registry (di-memo per kombinasi kolom)."""
+    return sr.editor_column_config(df.columns)
+
+
+# =========================================================
+# ADMIN PASSWORD HELPERS
+# =========================================================
+def verify_admin_password(pwd_input: str) -> bool:
+    """
+    - Support 2 mode:
+      (A) st.secrets["password_admin_hash"] = SHA256 hex dari password
+      (B) st.secrets["password_admin"] = password plain (legacy)
+    """
+    pwd_input = safe_str(pwd_input, "").strip()
+    if not pwd_input:
+        return False
+
+    # Mode hash (disarankan)
+    hash_secret = None
+    try:
+        hash_secret = st.secrets.get("password_admin_hash", None)
+    except Exception:
+        hash_secret = None
+
+    if hash_secret and safe_str(hash_secret, "").strip():
+        try:
+            digest = hashlib.sha256(pwd_input.encode("utf-8")).hexdigest()
+            return hmac.compare_digest(digest, safe_str(hash_secret, "").strip())
+        except Exception:
+            return False
+
+    # Mode plain (legacy)
+    plain_secret = None
+    try:
+        plain_secret = st.secrets.get("password_admin", None)
+    except Exception:
+        plain_secret = None
+
+    if plain_secret and safe_str(plain_secret, "").strip():
+        return hmac.compare_digest(pwd_input, safe_str(plain_secret, "").strip())
+
+    return False
+
+
+def admin_secret_configured() -> bool:
+    try:
+        return bool(
+            safe_str(st.secrets.get("password_admin_hash", ""), "").strip()
+            or safe_str(st.secrets.get("password_admin", ""), "").strip()
+        )
+    except Exception:
+        return False
+
+
+# =========================================================
+# CONNECTIONS (PERSISTENT FOR VPS)
+# =========================================================
+KONEKSI_GSHEET_BERHASIL = False
+KONEKSI_DROPBOX_BERHASIL = False
+spreadsheet = None
+dbx = None
+
+@st.cache_resource(show_spinner="Menghubungkan ke Database VPS...", ttl=None)
+def init_connection_gsheet():
+    """Koneksi disimpan selamanya di RAM Server (VPS)."""
+    try:
+        if "gcp_service_account" in st.secrets:
+            scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+            creds_dict = dict(st.secrets["gcp_service_account"])
+            if "private_key" in creds_dict:
+                creds_dict["private_key"] = creds_dict["private_key"].replace("\\n", "\n")
+            creds = Credentials.from_service_account_info(creds_dict, scopes=scopes)
+            gc = gspread.authorize(creds)
+            return gc.open(NAMA_GOOGLE_SHEET)
+    except Exception as e:
+        print(f"GSheet Error: {e}")
+    return None
+
+@st.cache_resource(show_spinner=False, ttl=None)
+def init_connection_dropbox():
+    """Koneksi Dropbox persisten."""
+    try:
+        if "dropbox" in st.secrets:
+            APP_KEY = st.secrets["dropbox"]["app_key"]
+            APP_SECRET = st.secrets["dropbox"]["app_secret"]
+            REFRESH_TOKEN = st.secrets["dropbox"]["refresh_token"]
+            dbx_obj = dropbox.Dropbox(app_key=APP_KEY, app_secret=APP_SECRET, oauth2_refresh_token=REFRESH_TOKEN)
+            dbx_obj.users_get_current_account()
+            return dbx_obj
+    except: return None
+
+
+# Eksekusi Koneksi
+def connect_services():
+    """
+    [BARU] Ambil koneksi GSheet & Dropbox dari cache_resource dan simpan di global modul ini.
+    Dipanggil router app.py di setiap rerun (murah: objek koneksi sudah di-cache per proses).
+    """
+    global spreadsheet, dbx, KONEKSI_GSHEET_BERHASIL, KONEKSI_DROPBOX_BERHASIL
+    spreadsheet = init_connection_gsheet()
+    KONEKSI_GSHEET_BERHASIL = bool(spreadsheet)
+    try:
+        dbx = init_connection_dropbox()
+    except Exception:
+        # Silent fail agar aplikasi tetap bisa dibuka meski Dropbox error
+        dbx = None
+    KONEKSI_DROPBOX_BERHASIL = bool(dbx)
+    return KONEKSI_GSHEET_BERHASIL
+
+
+def get_spreadsheet():
+    return spreadsheet
+
+
+def gsheet_ready():
+    return KONEKSI_GSHEET_BERHASIL
+
+
+def dropbox_ready():
+    return KONEKSI_DROPBOX_BERHASIL
+
+
+# === Konfigurasi AI Robust (Tiruan Proyek Telesales) ===
+# SDK baru (google.genai) diutamakan; import & inisialisasi client ditunda sampai dipakai.
+SDK = "new" if is_available("google.genai") else "legacy"
+genai_new = LazyModule("google.genai")
+genai_legacy = LazyModule("google.generativeai")
+
+# AMBIL DARI SECRETS (SANGAT AMAN)
+API_KEY = st.secrets.get("gemini_api_key", "")
+
+# Daftar model cadangan agar tidak muncul pesan "berhalangan" jika satu model error
+MODEL_FALLBACKS = ["gemini-1.5-flash", "gemini-1.5-pro", "gemini-2.0-flash-exp"]
+
+
+@st.cache_resource(show_spinner=False)
+def get_ai_client():
+    """Client AI dibuat sekali per proses, saat insight pertama kali diminta."""
+    if SDK == "new":
+        return genai_new.Client(api_key=API_KEY)
+    genai_legacy.configure(api_key=API_KEY)
+    return None
+
+
+# =========================================================
+# [BARU] AI INSIGHT (CACHE + BACKGROUND THREAD + CIRCUIT BREAKER)
+# =========================================================
+def _generate_ai_text(model_name, prompt):
+    if SDK == "new":
+        resp = get_ai_client().models.generate_content(model=model_name, contents=prompt)
+    else:
+        resp = genai_legacy.GenerativeModel(model_name).generate_content(prompt)
+    return resp.text
+
+
+@st.cache_resource
+def get_insight_engine():
+    # Satu engine per proses: cache insight & status model dipakai bersama semua sesi
+    return InsightEngine(_generate_ai_text, MODEL_FALLBACKS)
+
+
+def _show_ai_fallback(df_rollup, short=False):
+    fallback_msg = generate_smart_insight_fallback(df_rollup)
+    if short:
+        st.warning(f"⚠️ Kuota AI sedang penuh. Beralih ke analisis statistik otomatis.\n\n{fallback_msg}")
+    else:
+        st.warning(
+            "⚠️ **AI Insight Limit Reached (Quota Exceeded)**\n"
+            "Sistem secara otomatis beralih ke analisis statistik data internal (Fallback Mode) "
+            "agar Anda tetap mendapatkan ringkasan kinerja."
+        )
+        st.success(fallback_msg)
+
+
+@ui_fragment(run_every=3)
+def _ai_insight_poll(cache_key, df_rollup, short=False):
+    status, entry = get_insight_engine().peek(cache_key)
+    if status in (INSIGHT_READY, INSIGHT_FAILED):
+        # Hasil final sudah ada: rerun penuh agar render_ai_insight menampilkannya
+        # tanpa fragment polling (run_every berhenti bersama fragment ini)
+        st.rerun()
+    if entry:
+        st.info(entry["text"])
+        st.caption("⏳ Menampilkan insight terakhir. Analisis terbaru sedang disiapkan...")
+    else:
+        st.success(generate_smart_insight_fallback(df_rollup))
+        st.caption("⏳ Asisten Pak Nugroho sedang meninjau kinerja tim...")
+
+
+def render_ai_insight(cache_key, prompt, df_rollup, short=False):
+    """Tampilkan insight dari cache; jika belum ada, generate di background tanpa memblokir rerun."""
+    try:
+        get_ai_client()  # siapkan client di thread utama (worker thread tinggal memakai cache)
+    except Exception as e:
+        print(f"AI client error: {e}")
+        _show_ai_fallback(df_rollup, short)
+        return
+    status, entry = get_insight_engine().request(cache_key, prompt)
+    if status == INSIGHT_READY:
+        st.info(entry["text"])
+    elif status == INSIGHT_FAILED:
+        _show_ai_fallback(df_rollup, short)
+    else:
+        _ai_insight_poll(cache_key, df_rollup, short)
+
+
+# =========================================================
+# RUPIAH PARSER (input bebas -> int Rupiah)
+# =========================================================
+def parse_rupiah_to_int(value):
+    """Parser Rupiah yang lebih pintar."""
+    if value is None:
+        return None
+
+    # jika sudah numeric
+    if isinstance(value, (int, float)) and not pd.isna(value):
+        try:
+            return int(round(float(value)))
+        except Exception:
+            return None
+
+    s = str(value).strip()
+    if not s:
+        return None
+
+    s_lower = s.lower().strip()
+    if s_lower in {"nan", "none", "-", "null"}:
+        return None
+
+    # hilangkan spasi + penanda mata uang
+    s_lower = re.sub(r"\\s+", "", s_lower)
+    s_lower = s_lower.replace("idr", "").replace("rp", "")
+
+    # deteksi satuan
+    multiplier = 1
+    if "miliar" in s_lower or "milyar" in s_lower:
+        multiplier = 1_000_000_000
+    elif "jt" in s_lower or "juta" in s_lower:
+        multiplier = 1_000_000
+    elif "rb" in s_lower or "ribu" in s_lower:
+        multiplier = 1_000
+
+    # buang kata satuan dari string angka
+    s_num = re.sub(r"(miliar|milyar|juta|jt|ribu|rb)", "", s_lower)
+
+    # sisakan digit + pemisah ribuan/desimal
+    s_num = re.sub(r"[^0-9.,]", "", s_num)
+    if not s_num:
+        return None
+
+    def to_float_locale(num_str: str) -> float:
+        if "." in num_str and "," in num_str:
+            if num_str.rfind(",") > num_str.rfind("."):
+                cleaned = num_str.replace(".", "").replace(",", ".")
+            else:
+                cleaned = num_str.replace(",", "")
+            return float(cleaned)
+
+        if "," in num_str:
+            if num_str.count(",") > 1:
+                return float(num_str.replace(",", ""))
+            after = num_str.split(",")[1]
+            if len(after) == 3:
+                return float(num_str.replace(",", ""))
+            return float(num_str.replace(",", "."))
+
+        if "." in num_str:
+            if num_str.count(".") > 1:
+                return float(num_str.replace(".", ""))
+            after = num_str.split(".")[1]
+            if len(after) == 3:
+                return float(num_str.replace(".", ""))
+            return float(num_str)
+
+        return float(num_str)
+
+    try:
+        base = to_float_locale(s_num)
+    except Exception:
+        digits = re.sub(r"\\D", "", s_num)
+        return int(digits) if digits else None
+
+    if multiplier != 1:
+        if base >= multiplier:
+            return int(round(base))
+        return int(round(base * multiplier))
+
+    return int(round(base))
+
+
+def format_rupiah_display(amount) -> str:
+    """Hanya untuk display di UI (bukan untuk disimpan)."""
+    try:
+        if amount is None or pd.isna(amount):
+            return ""
+        n = int(amount)
+        return "Rp " + f"{n:,}".replace(",", ".")
+    except Exception:
+        return str(amount)
+
+
+sr.configure_codecs(money_parser=parse_rupiah_to_int,
+                    money_formatter=format_rupiah_display,
+                    date_parser=normalize_date)
+
+
+# =========================================================
+# AUDIT LOG HELPERS (PEMBAYARAN)
+# =========================================================
+def _fmt_payment_val_for_log(col_name: str, v):
+    """Format nilai agar enak dibaca di log."""
+    if col_name == COL_NOMINAL_BAYAR:
+        x = parse_rupiah_to_int(v)
+        return format_rupiah_display(x) if x is not None else "-"
+    if col_name == COL_STATUS_BAYAR:
+        return "✅ Dibayar" if normalize_bool(v) else "⏳ Belum"
+    if col_name in {COL_JATUH_TEMPO, COL_TGL_EVENT}:
+        d = normalize_date(v)
+        return d.strftime("%Y-%m-%d") if d else "-"
+    s = safe_str(v, "-").replace("\\n", " ").strip()
+    return s if s else "-"
+
+
+# Kolom yang perubahannya dicatat ke log pembayaran
+PAYMENT_LOG_WATCHED_COLS = [
+    COL_JENIS_BAYAR,
+    COL_NOMINAL_BAYAR,
+    COL_JATUH_TEMPO,
+    COL_STATUS_BAYAR,
+    COL_BUKTI_BAYAR,
+    COL_CATATAN_BAYAR,
+]
+_PAYMENT_LOG_LABELS = {COL_STATUS_BAYAR: "Status", COL_NOMINAL_BAYAR: "Nominal",
+                       COL_JATUH_TEMPO: "Jatuh Tempo"}
+# Log lama (sebelum Payment_Event_Log) berupa teks bernomor "1. ...", "2. ..." di satu sel
+_LEGACY_PAYMENT_LOG = re.compile(r"^\s*1\.\s")
+
+
+def payment_field_changes(prev, row):
+    """Perubahan kolom yang dipantau antara dua baris pembayaran -> list (kolom, lama, baru)."""
+    changes = []
+    for col in PAYMENT_LOG_WATCHED_COLS:
+        if col not in row or col not in prev:
+            continue
+        oldv, newv = prev[col], row[col]
+        if col == COL_STATUS_BAYAR:
+            changed = normalize_bool(oldv) != normalize_bool(newv)
+        elif col == COL_JATUH_TEMPO:
+            changed = normalize_date(oldv) != normalize_date(newv)
+        elif col == COL_NOMINAL_BAYAR:
+            changed = parse_rupiah_to_int(oldv) != parse_rupiah_to_int(newv)
+        else:
+            changed = safe_str(oldv, "").strip() != safe_str(newv, "").strip()
+        if changed:
+            changes.append((_PAYMENT_LOG_LABELS.get(col, col),
+                            _fmt_payment_val_for_log(col, oldv), _fmt_payment_val_for_log(col, newv)))
+    return changes
+
+
+def payment_change_summary(ts: str, actor: str, changes):
+    """
+    Ringkasan SATU baris untuk kolom log di baris pembayaran (riwayat lengkap ada di
+    Payment_Event_Log). changes: list (kolom, lama, baru).
+    """
+    actor = safe_str(actor, "-").strip() or "-"
+    text = f"[{ts}] ({actor})"
+    if changes:
+        field, old, new = changes[0]
+        text += f" {field}: {old} → {new}" if old else f" {field}: {new}"
+        if len(changes) > 1:
+            text += f" (+{len(changes) - 1} perubahan lain)"
+    return text
+
+
+def is_legacy_payment_log(text) -> bool:
+    return bool(_LEGACY_PAYMENT_LOG.match(safe_str(text, "")))
+
+
+# =========================================================
+# UI DISPLAY HELPERS (RUPIAH)
+# =========================================================
+def payment_df_for_display(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mengubah kolom angka menjadi format string 'Rp 2.000.000' khusus untuk tampilan UI.
+    """
+    if df is None or df.empty:
+        return df
+    # Uang -> "Rp 2.000.000", Tanggal Event/Jatuh Tempo -> date (cocok dengan DateColumn)
+    return sr.to_display(sn.decompact_frame(df))
+
+
+def on_change_pay_nominal():
+    """Auto-format input nominal ke 'Rp 15.000.000' (untuk UI)."""
+    raw = st.session_state.get("pay_nominal", "")
+    val = parse_rupiah_to_int(raw)
+    if val is not None:
+        st.session_state["pay_nominal"] = format_rupiah_display(val)
+
+
+def reset_payment_form_state():
+    """Reset field input pembayaran (agar terasa seperti clear_on_submit)."""
+    keys = [
+        "pay_group",
+        "pay_marketing",
+        "pay_event_date",
+        "pay_jenis_opt",
+        "pay_jenis_custom",
+        "pay_nominal",
+        "pay_due_date",
+        "pay_status",
+        "pay_note",
+        "pay_file",
+    ]
+    for k in keys:
+        try:
+            if k == "pay_event_date":
+                st.session_state[k] = datetime.now(tz=TZ_JKT).date()
+            elif k == "pay_due_date":
+                st.session_state[k] = datetime.now(
+                    tz=TZ_JKT).date() + timedelta(days=7)
+            elif k == "pay_jenis_opt":
+                st.session_state[k] = "Down Payment (DP)"
+            elif k == "pay_status":
+                st.session_state[k] = False
+            else:
+                st.session_state[k] = ""
+        except Exception:
+            pass
+
+
+# =========================================================
+# EXCEL EXPORT
+# =========================================================
+def df_to_excel_bytes(
+    df: pd.DataFrame,
+    sheet_name="Sheet1",
+    col_widths=None,
+    wrap_cols=None,
+    right_align_cols=None,
+    number_format_cols=None
+):
+    """Export dataframe ke .xlsx rapi."""
+    if not HAS_OPENPYXL:
+        return None
+
+    df_export = df.copy()
+    df_export = df_export.where(pd.notna(df_export), None)
+
+    output = io.BytesIO()
+    wb = Workbook()
+    ws = wb.active
+    ws.title = (sheet_name or "Sheet1")[:31]
+
+    for r in openpyxl_df_utils.dataframe_to_rows(df_export, index=False, header=True):
+        ws.append(r)
+
+    header_fill = openpyxl_styles.PatternFill("solid", fgColor="E6E6E6")
+    header_font = openpyxl_styles.Font(bold=True)
+
+    for cell in ws[1]:
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = openpyxl_styles.Alignment(
+            horizontal="center", vertical="center", wrap_text=True)
+
+    ws.freeze_panes = "A2"
+
+    wrap_cols = set(wrap_cols or [])
+    right_align_cols = set(right_align_cols or [])
+    number_format_cols = dict(number_format_cols or {})
+    col_widths = dict(col_widths or {})
+
+    cols = list(df_export.columns)
+
+    for i, col_name in enumerate(cols, 1):
+        col_letter = openpyxl_utils.get_column_letter(i)
+
+        if col_name in col_widths:
+            ws.column_dimensions[col_letter].width = col_widths[col_name]
+        else:
+            max_len = len(str(col_name))
+            try:
+                for v in df_export[col_name]:
+                    v_str = "" if v is None else str(v)
+                    max_len = max(max_len, len(v_str))
+            except Exception:
+                pass
+            ws.column_dimensions[col_letter].width = min(
+                max(10, max_len + 2), 60)
+
+        for cell in ws[col_letter][1:]:
+            wrap = col_name in wrap_cols
+            horiz = "right" if col_name in right_align_cols else "left"
+            cell.alignment = openpyxl_styles.Alignment(
+                vertical="top", horizontal=horiz, wrap_text=wrap)
+
+            if col_name in number_format_cols:
+                cell.number_format = number_format_cols[col_name]
+
+    wb.save(output)
+    return output.getvalue()
+
+
+# =========================================================
+# GOOGLE SHEETS FORMATTING
+# =========================================================
+def maybe_auto_format_sheet(worksheet, force: bool = False):
+    """Throttled formatting: avoid calling heavy formatting too often."""
+    try:
+        if worksheet is None:
+            return
+        if "_fmt_sheet_last" not in st.session_state:
+            st.session_state["_fmt_sheet_last"] = {}
+
+        now = time.time()
+        key = str(getattr(worksheet, "id", "unknown"))
+        last = float(st.session_state["_fmt_sheet_last"].get(key, 0))
+        if force or (now - last) > FORMAT_THROTTLE_SECONDS:
+            auto_format_sheet(worksheet)
+            st.session_state["_fmt_sheet_last"][key] = now
+    except Exception:
+        # Never break app due to formatting.
+        pass
+
+
+def auto_format_sheet(worksheet):
+    """Auto-format Google Sheet."""
+    try:
+        sheet_id = worksheet.id
+        all_values = worksheet.get_all_values()
+        if not all_values:
+            return
+
+        headers = all_values[0]
+        data_row_count = len(all_values)
+        formatting_row_count = max(worksheet.row_count, data_row_count)
+
+        requests = []
+        default_body_format = {
+            "verticalAlignment": "TOP", "wrapStrategy": "CLIP"}
+
+        # 1) Reset body base style
+        requests.append({
+            "repeatCell": {
+                "range": {"sheetId": sheet_id, "startRowIndex": 1, "endRowIndex": formatting_row_count},
+                "cell": {"userEnteredFormat": default_body_format},
+                "fields": "userEnteredFormat(verticalAlignment,wrapStrategy)"
+            }
+        })
+
+        # 2) Column sizing + per-column overrides
+        for i, col_name in enumerate(headers):
+            col_index = i
+            # Lebar, perataan, wrap & format Rupiah per kolom dari schema registry
+            width, cell_format_override = sr.sheet_column_format(col_name)
+
+            # Set width (kolom sistem seperti versi baris sekalian disembunyikan)
+            properties, fields = {"pixelSize": width}, "pixelSize"
+            if sr.is_hidden(col_name):
+                properties["hiddenByUser"] = True
+                fields += ",hiddenByUser"
+            requests.append({
+                "updateDimensionProperties": {
+                    "range": {
+                        "sheetId": sheet_id,
+                        "dimension": "COLUMNS",
+                        "startIndex": col_index,
+                        "endIndex": col_index + 1
+                    },
+                    "properties": properties,
+                    "fields": fields
+                }
+            })
+
+            # Apply per-column format
+            if cell_format_override:
+                fields = ",".join(cell_format_override.keys())
+                requests.append({
+                    "repeatCell": {
+                        "range": {
+                            "sheetId": sheet_id,
+                            "startRowIndex": 1,
+                            "endRowIndex": formatting_row_count,
+                            "startColumnIndex": col_index,
+                            "endColumnIndex": col_index + 1
+                        },
+                        "cell": {"userEnteredFormat": cell_format_override},
+                        "fields": f"userEnteredFormat({fields})"
+                    }
+                })
+
+        # 3) Header style
+        requests.append({
+            "repeatCell": {
+                "range": {"sheetId": sheet_id, "startRowIndex": 0, "endRowIndex": 1},
+                "cell": {"userEnteredFormat": {
+                    "textFormat": {"bold": True},
+                    "horizontalAlignment": "CENTER",
+                    "verticalAlignment": "MIDDLE",
+                    "backgroundColor": {"red": 0.90, "green": 0.92, "blue": 0.96},
+                    "wrapStrategy": "WRAP"
+                }},
+                "fields": "userEnteredFormat(textFormat,horizontalAlignment,verticalAlignment,backgroundColor,wrapStrategy)"
+            }
+        })
+
+        # 4) Freeze header
+        requests.append({
+            "updateSheetProperties": {
+                "properties": {"sheetId": sheet_id, "gridProperties": {"frozenRowCount": 1}},
+                "fields": "gridProperties.frozenRowCount"
+            }
+        })
+
+        worksheet.spreadsheet.batch_update({"requests": requests})
+    except Exception as e:
+        print(f"Format Error: {e}")
+
+
+HEADER_CHECK_TTL = 600  # detik, sama dengan cache objek worksheet
+
+
+@st.cache_resource(show_spinner=False)
+def _get_header_check_cache():
+    # (judul sheet, header) -> waktu terakhir header terverifikasi
+    return {"lock": threading.Lock(), "checked": {}}
+
+
+def ensure_headers(worksheet, desired_headers):
+    """
+    Pastikan header sesuai urutan standar.
+    [BARU] Hasil cek di-cache per sheet, jadi row_values(1) tidak dipanggil di setiap simpan.
+    """
+    cache = _get_header_check_cache()
+    cache_key = (getattr(worksheet, "title", ""), tuple(desired_headers))
+    with cache["lock"]:
+        if time.time() - cache["checked"].get(cache_key, 0.0) < HEADER_CHECK_TTL:
+            return
+
+    try:
+        if worksheet.col_count < len(desired_headers):
+            worksheet.resize(cols=len(desired_headers))
+
+        headers = worksheet.row_values(1)
+        need_reset = (
+            not headers
+            or (len(headers) < len(desired_headers))
+            or (headers[:len(desired_headers)] != desired_headers)
+        )
+        if need_reset:
+            worksheet.update(range_name="A1", values=[
+                             desired_headers], value_input_option="USER_ENTERED")
+            maybe_auto_format_sheet(worksheet, force=True)
+        with cache["lock"]:
+            cache["checked"][cache_key] = time.time()
+    except Exception as e:
+        print(f"Ensure Header Error: {e}")
+
+
+# =========================================================
+# [BARU] VERSI BARIS (OPTIMISTIC CONCURRENCY / COMPARE-AND-SET)
+# =========================================================
+# Sheet yang ditulis per baris (Pembayaran, Closing Deal, Target Team/Individu) punya kolom tersembunyi
+# COL_ROW_VERSION di ujung kanan (lihat managed_columns). Setiap penulisan baris memberi versi baru.
+# Sebelum menulis, versi yang dibaca saat load dibandingkan dengan versi di sheet:
+# beda = baris sudah diubah/digeser orang lain -> tulis dibatalkan & HANYA baris itu
+# yang dimuat ulang. Versi kosong = belum diketahui (tidak dicek); loader mengisinya.
+ROW_CONFLICT_MSG = ("Data ini baru saja diubah pengguna lain. Data terbaru sudah dimuat ulang, "
+                    "silakan cek lalu ulangi.")
+
+
+def managed_columns(columns):
+    """Kolom sheet yang dikelola: kolom data + kolom sistem tersembunyi (versi & ID baris)."""
+    return list(columns) + [COL_ROW_VERSION, COL_ROW_ID]
+
+
+def _random_token(prefix, k):
+    # Awalan huruf supaya tidak pernah dibaca sebagai angka oleh get_all_records
+    return prefix + "".join(random.choices(string.ascii_lowercase + string.digits, k=k))
+
+
+def new_row_version():
+    return _random_token("v", 9)
+
+
+def new_row_id():
+    return _random_token("r", 12)
+
+
+def _version_col(headers):
+    """Nomor kolom (1-based) versi baris, atau None kalau sheet belum punya kolom versi."""
+    return headers.index(COL_ROW_VERSION) + 1 if COL_ROW_VERSION in headers else None
+
+
+def _version_str(v):
+    return _paged_cell_str(v).strip()
+
+
+def version_matches(expected, current):
+    """Versi kosong (belum diketahui) selalu dianggap cocok."""
+    expected = _version_str(expected)
+    return not expected or expected == _version_str(current)
+
+
+def backfill_system_columns(ws, df, headers):
+    """
+    Isi versi & ID baris yang masih kosong (baris lama / baris yang di-copy manual dengan ID
+    kembar) dengan SATU batch_update. Return df yang sudah terisi.
+    """
+    if df.empty:
+        return df
+
+    updates, filled = [], {}
+    for col_name, factory in ((COL_ROW_VERSION, new_row_version), (COL_ROW_ID, new_row_id)):
+        if col_name not in headers:
+            continue
+        col = headers.index(col_name) + 1
+        values = [_version_str(v) for v in df[col_name]] if col_name in df.columns else [""] * len(df)
+        seen = set()
+        for pos, v in enumerate(values):
+            if not v or (col_name == COL_ROW_ID and v in seen):
+                values[pos] = factory()
+                updates.append({"range": gspread.utils.rowcol_to_a1(pos + 2, col), "values": [[values[pos]]]})
+            seen.add(values[pos])
+        filled[col_name] = values
+    if not updates:
+        return df
+
+    try:
+        ws.batch_update(updates, value_input_option="RAW")
+    except Exception as e:
+        print(f"Backfill System Columns Error: {e}")
+        return df
+    df = df.copy()
+    for col_name, values in filled.items():
+        df[col_name] = values
+    return df
+
+
+def check_row_version(ws, headers, row_pos, expected):
+    """
+    Compare satu baris (row_pos 0-based): baca SATU sel versi lalu bandingkan.
+    Return (ok, versi_di_sheet). expected kosong / sheet tanpa kolom versi -> selalu ok.
+    """
+    col = _version_col(headers)
+    if col is None or not _version_str(expected):
+        return True, None
+    current = _version_str(ws.cell(row_pos + 2, col).value)
+    return version_matches(expected, current), current
+
+
+def row_version_update(headers, row_pos, version):
+    """Item batch_update untuk versi baru satu baris ([] kalau sheet tanpa kolom versi)."""
+    col = _version_col(headers)
+    if col is None:
+        return []
+    return [{"range": gspread.utils.rowcol_to_a1(row_pos + 2, col), "values": [[version]]}]
+
+
+def find_version_conflicts(ws, headers, expected_versions):
+    """
+    Compare seluruh tabel sebelum tulis ulang penuh: SATU col_values kolom versi.
+    Return (posisi_konflik, jumlah_baris_di_sheet). Konflik = versi beda, baris hilang,
+    atau baris baru yang ditambahkan orang lain sejak load.
+    """
+    col = _version_col(headers)
+    expected = [_version_str(v) for v in expected_versions]
+    if col is None:
+        return [], len(expected)
+
+    current = [_version_str(v) for v in ws.col_values(col)[1:]]
+    conflicts = []
+    for pos in range(max(len(expected), len(current))):
+        exp = expected[pos] if pos < len(expected) else None
+        cur = current[pos] if pos < len(current) else None
+        if exp is None:
+            conflicts.append(pos)
+        elif exp and exp != (cur or ""):
+            conflicts.append(pos)
+    return conflicts, len(current)
+
+
+def stamp_system_columns(df_after, df_before, compare_cols):
+    """
+    Kolom sistem untuk frame yang akan ditulis ulang: baris yang isinya berubah / baris baru
+    dapat versi baru, baris lain tetap. Dicocokkan lewat versi (bukan posisi), jadi aman walau
+    ada baris yang dihapus/ditambah di editor. Baris baru (tanpa ID) juga dapat ID baru.
+    """
+    out = df_after.copy()
+    for c in (COL_ROW_VERSION, COL_ROW_ID):
+        if c not in out.columns:
+            out[c] = ""
+    out[COL_ROW_ID] = [_version_str(v) or new_row_id() for v in out[COL_ROW_ID]]
+    cols = [c for c in compare_cols if c in out.columns]
+
+    def _cell(v):
+        # 2000000.0 vs 2000000, Timestamp tengah malam vs date: isi sama, jangan dianggap berubah
+        if isinstance(v, float) and v.is_integer():
+            v = int(v)
+        elif isinstance(v, pd.Timestamp) and not pd.isna(v) and v == v.normalize():
+            v = v.date()
+        return _paged_cell_str(v)
+
+    def _sig(row):
+        return tuple(_cell(row[c]) for c in cols)
+
+    before = {}
+    if df_before is not None and COL_ROW_VERSION in df_before.columns:
+        for _, r in df_before.iterrows():
+            v = _version_str(r[COL_ROW_VERSION])
+            if v:
+                before[v] = _sig(r)
+
+    versions = []
+    for _, r in out.iterrows():
+        v = _version_str(r[COL_ROW_VERSION])
+        if not v or before.get(v) != _sig(r):
+            v = new_row_version()
+        versions.append(v)
+    out[COL_ROW_VERSION] = versions
+    return out
+
+
+def fetch_sheet_rows(ws, headers, positions):
+    """Ambil beberapa baris (posisi 0-based) dengan SATU batch_get -> list dict per baris."""
+    last_col = gspread.utils.rowcol_to_a1(1, len(headers)).rstrip("0123456789")
+    blocks = ws.batch_get([f"A{p + 2}:{last_col}{p + 2}" for p in positions])
+    records = []
+    for block in blocks:
+        vals = list(block[0]) if block else []
+        records.append({h: (vals[i] if i < len(vals) else "") for i, h in enumerate(headers)})
+    return records
+
+
+def refresh_rows_after_write(sheet_name, ws, headers, positions, sheet_rows=None):
+    """
+    Segarkan cache untuk baris yang baru ditulis / konflik saja.
+    sheet_rows = jumlah baris di sheet kalau diketahui (beda dgn RAM = ada geser -> reload penuh).
+    """
+    try:
+        if sheet_name == SHEET_PEMBAYARAN:
+            refresh_payment_rows(ws, headers, positions, sheet_rows=sheet_rows)
+        elif sheet_name in (SHEET_TARGET_TEAM, SHEET_TARGET_INDIVIDU):
+            # load_checklist memakai st.cache_data (tidak bisa di-patch per baris); sheet kecil
+            load_checklist.clear()
+    except Exception as e:
+        print(f"Refresh Rows Error ({sheet_name}): {e}")
+
+
+# =========================================================
+# [BARU] ID BARIS (KOLOM TERSEMBUNYI + MAP ID -> NOMOR BARIS)
+# =========================================================
+# Baris dicari lewat COL_ROW_ID (acak, tidak pernah berubah), bukan lewat teks / posisi.
+# Map ID -> nomor baris sheet di-cache per proses. Setiap pemakaian diverifikasi dengan
+# membaca baris itu saja (1 batch_get, sekaligus dapat isi terbarunya). Map basi (baris
+# bergeser karena sesi lain) -> dibangun ulang dari kolom ID (1 col_values), coba sekali lagi.
+@st.cache_resource
+def _get_row_id_maps():
+    return {"lock": threading.Lock(), "sheets": {}}   # sheet -> {row_id: nomor baris sheet}
+
+
+def set_row_id_map(sheet_name, row_ids, first_row=2):
+    """Map dari urutan ID: ID ke-i ada di baris sheet (first_row + i)."""
+    rows = {}
+    for i, rid in enumerate(row_ids):
+        rid = _version_str(rid)
+        if rid:
+            rows.setdefault(rid, first_row + i)
+    store = _get_row_id_maps()
+    with store["lock"]:
+        store["sheets"][sheet_name] = rows
+
+
+def add_row_ids(sheet_name, row_ids, first_row):
+    """ID baris hasil append. first_row None (respons tanpa range) -> dicari saat dipakai."""
+    store = _get_row_id_maps()
+    with store["lock"]:
+        rows = store["sheets"].get(sheet_name)
+        if rows is None or first_row is None:
+            return
+        for i, rid in enumerate(row_ids):
+            rows[rid] = first_row + i
+
+
+def drop_row_id(sheet_name, row_id, row_number):
+    """Setelah delete_rows: buang ID-nya & geser baris di bawahnya naik satu."""
+    store = _get_row_id_maps()
+    with store["lock"]:
+        rows = store["sheets"].get(sheet_name)
+        if rows is None:
+            return
+        rows.pop(row_id, None)
+        for rid, r in rows.items():
+            if r > row_number:
+                rows[rid] = r - 1
+
+
+def locate_rows(ws, sheet_name, headers, row_ids):
+    """
+    Versi banyak baris dari locate_row: semua baris dibaca dengan SATU batch_get.
+    Return {row_id: (nomor_baris_sheet, dict isi baris)}; ID yang tidak ketemu tidak ada di hasil.
+    """
+    wanted = [rid for rid in dict.fromkeys(_version_str(r) for r in row_ids) if rid]
+    if not wanted or COL_ROW_ID not in headers:
+        return {}
+
+    store = _get_row_id_maps()
+    found = {}
+    for attempt in range(2):
+        pending = [rid for rid in wanted if rid not in found]
+        with store["lock"]:
+            rows = store["sheets"].get(sheet_name, {})
+            targets = [(rid, rows[rid]) for rid in pending if rid in rows]
+        if targets:
+            records = fetch_sheet_rows(ws, headers, [row - 2 for _, row in targets])
+            for (rid, row), record in zip(targets, records):
+                if _version_str(record.get(COL_ROW_ID)) == rid:
+                    found[rid] = (row, record)
+        if len(found) == len(wanted):
+            break
+        if attempt == 0:
+            set_row_id_map(sheet_name, ws.col_values(headers.index(COL_ROW_ID) + 1)[1:])
+    return found
+
+
+def cached_row_number(sheet_name, row_id):
+    """Nomor baris sheet menurut map (tanpa API call, belum diverifikasi). None kalau tidak ada."""
+    store = _get_row_id_maps()
+    with store["lock"]:
+        return store["sheets"].get(sheet_name, {}).get(_version_str(row_id))
+
+
+def fetch_row_stamp(ws, headers, row_number):
+    """Baca versi & ID satu baris saja (2 sel, 1 batch_get) -> (versi, id)."""
+    c_ver, c_id = headers.index(COL_ROW_VERSION) + 1, headers.index(COL_ROW_ID) + 1
+    lo, hi = min(c_ver, c_id), max(c_ver, c_id)
+    rng = f"{gspread.utils.rowcol_to_a1(row_number, lo)}:{gspread.utils.rowcol_to_a1(row_number, hi)}"
+    block = ws.batch_get([rng])[0]
+    vals = list(block[0]) if block else []
+    cell = lambda c: _version_str(vals[c - lo]) if c - lo < len(vals) else ""
+    return cell(c_ver), cell(c_id)
+
+
+def locate_row(ws, sheet_name, headers, row_id):
+    """
+    Cari baris lewat ID. Return (nomor_baris_sheet, dict isi baris) atau (None, None).
+    headers = urutan kolom sheet (harus memuat COL_ROW_ID).
+    """
+    return locate_rows(ws, sheet_name, headers, [row_id]).get(_version_str(row_id), (None, None))
+
+
+# =========================================================
+# WORKSHEET GET/CREATE + STAFF LIST
+# =========================================================
+@st.cache_resource(ttl=600)
+def _get_or_create_ws_cached(nama_worksheet: str):
+    """Get/create worksheet object (cached)."""
+    try:
+        ws = spreadsheet.worksheet(nama_worksheet)
+        return ws
+    except gspread.WorksheetNotFound:
+        ws = spreadsheet.add_worksheet(
+            title=nama_worksheet, rows=200, cols=len(NAMA_KOLOM_STANDAR))
+        ws.append_row(NAMA_KOLOM_STANDAR, value_input_option="USER_ENTERED")
+        maybe_auto_format_sheet(ws, force=True)
+        return ws
+    except Exception:
+        return None
+
+
+@st.cache_resource(ttl=600)
+def get_existing_worksheet(nama_worksheet: str):
+    """[BARU] Handle worksheet yang sudah ada (cached). Sheet tidak ada -> exception, tidak di-cache."""
+    return spreadsheet.worksheet(nama_worksheet)
+
+
+def get_or_create_worksheet(nama_worksheet):
+    """
+    Pastikan header selalu up-to-date.
+    """
+    ws = _get_or_create_ws_cached(nama_worksheet)
+    if ws is not None:
+        ensure_headers(ws, NAMA_KOLOM_STANDAR)
+    return ws
+
+# Config_Staf: kolom A = nama staf, kolom B = ID baris (tersembunyi). Judul A1 dibiarkan apa adanya.
+STAFF_SHEET_COLUMNS = ["Nama Staf", COL_ROW_ID]
+
+
+def get_daftar_staf_terbaru():
+    # Cek RAM
+    ram = get_ram_data("staff")
+    if ram: return ram
+    
+    # Download
+    default = ["Saya"]
+    if not KONEKSI_GSHEET_BERHASIL: return default
+    try:
+        ws = spreadsheet.worksheet(SHEET_CONFIG_NAMA)
+        # Satu baca untuk nama + ID baris (dulu col_values(1))
+        vals = ws.get_all_values()
+        if len(vals) <= 1:
+            return default
+        if len(vals[0]) < 2 or vals[0][1] != COL_ROW_ID:
+            ws.update(range_name="B1", values=[[COL_ROW_ID]], value_input_option="RAW")
+            maybe_auto_format_sheet(ws, force=True)
+
+        body = [(r[0] if r else "", r[1] if len(r) > 1 else "") for r in vals[1:]]
+        while body and not str(body[-1][0]).strip():
+            body.pop()
+        df = pd.DataFrame(body, columns=STAFF_SHEET_COLUMNS)
+        df = backfill_system_columns(ws, df, STAFF_SHEET_COLUMNS)
+
+        res = df["Nama Staf"].tolist()
+        set_row_id_map(SHEET_CONFIG_NAMA, df[COL_ROW_ID])
+        update_ram_data("staff_ids", dict(zip(res, df[COL_ROW_ID])))
+        update_ram_data("staff", res)
+        return res
+    except: return default
+
+def hapus_staf_by_name(nama_staf):
+    """
+    Menghapus nama staf dari worksheet Config_Staf.
+    [BARU] Baris dicari lewat ID baris (map nama -> ID di RAM), bukan ws.find ke seluruh sheet.
+    """
+    try:
+        ws = spreadsheet.worksheet(SHEET_CONFIG_NAMA)
+        get_daftar_staf_terbaru()  # pastikan map nama -> ID ada (hit RAM = tanpa I/O)
+        row_id = (get_ram_data("staff_ids") or {}).get(nama_staf)
+
+        row, record = locate_row(ws, SHEET_CONFIG_NAMA, STAFF_SHEET_COLUMNS, row_id)
+        if row is None or str(record.get("Nama Staf", "")).strip() != str(nama_staf).strip():
+            return False, "Nama staf tidak ditemukan di database."
+
+        ws.delete_rows(row)
+        drop_row_id(SHEET_CONFIG_NAMA, row_id, row)
+
+        # Mirror RAM
+        staff = [n for n in (get_ram_data("staff") or []) if n != nama_staf]
+        update_ram_data("staff", staff)
+        (get_ram_data("staff_ids") or {}).pop(nama_staf, None)
+        return True, f"Staf '{nama_staf}' berhasil dihapus."
+    except Exception as e:
+        return False, f"Gagal menghapus: {e}"
+
+
+def tambah_staf_baru(nama_baru):
+    try:
+        try:
+            ws = spreadsheet.worksheet(SHEET_CONFIG_NAMA)
+        except Exception:
+            ws = spreadsheet.add_worksheet(
+                title=SHEET_CONFIG_NAMA, rows=100, cols=len(STAFF_SHEET_COLUMNS))
+
+        if nama_baru in ws.col_values(1):
+            return False, "Nama sudah ada!"
+
+        row_id = new_row_id()
+        resp = ws.append_row([nama_baru, row_id], value_input_option="USER_ENTERED")
+        add_row_ids(SHEET_CONFIG_NAMA, [row_id], _first_row_from_append(resp))
+
+        # Mirror RAM (kalau daftar staf sudah pernah dimuat)
+        staff = get_ram_data("staff")
+        if staff:
+            update_ram_data("staff", staff + [nama_baru])
+            (get_ram_data("staff_ids") or {})[nama_baru] = row_id
+        # maybe_auto_format_sheet(ws)
+        return True, "Berhasil tambah tim!"
+    except Exception as e:
+        return False, str(e)
+
+
+# =========================================================
+# TEAM CONFIG
+# =========================================================
+@st.cache_data(ttl=3600)
+def load_team_config():
+    if not KONEKSI_GSHEET_BERHASIL:
+        return pd.DataFrame(columns=TEAM_COLUMNS)
+
+    try:
+        try:
+            ws = spreadsheet.worksheet(SHEET_CONFIG_TEAM)
+        except Exception:
+            ws = spreadsheet.add_worksheet(
+                title=SHEET_CONFIG_TEAM, rows=300, cols=len(TEAM_COLUMNS))
+            ws.append_row(TEAM_COLUMNS, value_input_option="USER_ENTERED")
+            maybe_auto_format_sheet(ws, force=True)
+            return pd.DataFrame(columns=TEAM_COLUMNS)
+
+        data = ws.get_all_records()
+        df = pd.DataFrame(data).fillna("")
+        for c in TEAM_COLUMNS:
+            if c not in df.columns:
+                df[c] = ""
+        return df[TEAM_COLUMNS].copy()
+    except Exception:
+        return pd.DataFrame(columns=TEAM_COLUMNS)
+
+
+def tambah_team_baru(nama_team, posisi, anggota_list):
+    if not KONEKSI_GSHEET_BERHASIL:
+        return False, "Koneksi GSheet belum aktif."
+
+    try:
+        nama_team = str(nama_team).strip()
+        posisi = str(posisi).strip()
+        anggota_list = [str(a).strip() for a in anggota_list if str(a).strip()]
+
+        if not nama_team or not posisi or not anggota_list:
+            return False, "Nama team, posisi, dan minimal 1 anggota wajib diisi."
+
+        try:
+            ws = spreadsheet.worksheet(SHEET_CONFIG_TEAM)
+        except Exception:
+            ws = spreadsheet.add_worksheet(
+                title=SHEET_CONFIG_TEAM, rows=300, cols=len(TEAM_COLUMNS))
+            ws.append_row(TEAM_COLUMNS, value_input_option="USER_ENTERED")
+            maybe_auto_format_sheet(ws, force=True)
+
+        existing = set()
+        try:
+            for r in ws.get_all_records():
+                key = (
+                    str(r.get(TEAM_COL_NAMA_TEAM, "")).strip(),
+                    str(r.get(TEAM_COL_POSISI, "")).strip(),
+                    str(r.get(TEAM_COL_ANGGOTA, "")).strip()
+                )
+                existing.add(key)
+        except Exception:
+            pass
+
+        rows_to_add = []
+        for anggota in anggota_list:
+            key = (nama_team, posisi, anggota)
+            if key not in existing:
+                rows_to_add.append([nama_team, posisi, anggota])
+
+        if not rows_to_add:
+            return False, "Semua anggota sudah terdaftar di team tersebut."
+
+        ws.append_rows(rows_to_add, value_input_option="USER_ENTERED")
+        # maybe_auto_format_sheet(ws)
+        return True, f"Berhasil tambah team '{nama_team}' ({len(rows_to_add)} anggota)."
+    except Exception as e:
+        return False, str(e)
+
+
+# =========================================================
+# DROPBOX UPLOAD
+# =========================================================
+def upload_ke_dropbox(file_obj, nama_staf, kategori="Umum"):
+    if not KONEKSI_DROPBOX_BERHASIL or dbx is None:
+        return "Koneksi Dropbox Error"
+
+    try:
+        file_data = file_obj.getvalue()
+        ts = datetime.now(tz=TZ_JKT).strftime("%Y%m%d_%H%M%S")
+
+        clean_filename = "".join(
+            [c for c in file_obj.name if c.isalnum() or c in (".", "_")])
+        clean_user_folder = "".join(
+            [c for c in nama_staf if c.isalnum() or c in (" ", "_")]).replace(" ", "_")
+        clean_kategori = "".join(
+            [c for c in kategori if c.isalnum() or c in (" ", "_")]).replace(" ", "_")
+
+        path = f"{FOLDER_DROPBOX}/{clean_user_folder}/{clean_kategori}/{ts}_{clean_filename}"
+        dbx.files_upload(file_data, path, mode=dropbox_files.WriteMode.add)
+
+        settings = dropbox_sharing.SharedLinkSettings(
+            requested_visibility=dropbox_sharing.RequestedVisibility.public)
+        try:
+            link = dbx.sharing_create_shared_link_with_settings(
+                path, settings=settings)
+        except dropbox_exceptions.ApiError as e:
+            if e.error.is_shared_link_already_exists():
+                link = dbx.sharing_list_shared_links(
+                    path, direct_only=True).links[0]
+            else:
+                return "-"
+
+        return link.url.replace("?dl=0", "?raw=1")
+    except Exception:
+        return "-"
+
+
+def hapus_file_dropbox(link):
+    """
+    [BARU] Hapus file hasil upload_ke_dropbox lewat shared link-nya. Dipakai kalau file sudah
+    ter-upload tapi penulisan sheet batal (konflik versi / error), supaya tidak ada file yatim.
+    """
+    if not link or link == "-" or not KONEKSI_DROPBOX_BERHASIL or dbx is None:
+        return False
+    try:
+        meta = dbx.sharing_get_shared_link_metadata(link.replace("?raw=1", "?dl=0"))
+        dbx.files_delete_v2(meta.path_lower)
+        return True
+    except Exception as e:
+        print(f"Dropbox Delete Error: {e}")
+        return False
+
+
+# =========================================================
+# TARGET / CHECKLIST HELPERS
+# =========================================================
+def clean_bulk_input(text_input):
+    # GUNAKAN \n (satu backslash), bukan \\n
+    lines = (text_input or "").split("\n") 
+    cleaned_targets = []
+    for line in lines:
+        # Regex ini akan menghapus angka "1.", "2.", "-", atau "*" di awal baris
+        cleaned = re.sub(r"^[\d\.\-\*\s]+", "", line).strip()
+        if cleaned:
+            cleaned_targets.append(cleaned)
+    return cleaned_targets
+
+
+@st.cache_data(ttl=3600)
+def load_checklist(sheet_name, columns):
+    # Frame membawa kolom tersembunyi versi & ID baris (compare-and-set / cari baris lewat ID)
+    all_cols = managed_columns(columns)
+    try:
+        try:
+            ws = spreadsheet.worksheet(sheet_name)
+        except Exception:
+            ws = spreadsheet.add_worksheet(
+                title=sheet_name, rows=200, cols=len(all_cols))
+            ws.append_row(all_cols, value_input_option="USER_ENTERED")
+            maybe_auto_format_sheet(ws, force=True)
+            return pd.DataFrame(columns=all_cols)
+
+        ensure_headers(ws, all_cols)
+
+        data = ws.get_all_records()
+        df = pd.DataFrame(data).fillna("")
+
+        for col in all_cols:
+            if col not in df.columns:
+                if col == "Status":
+                    df[col] = False
+                else:
+                    df[col] = ""
+
+        if "Status" in df.columns:
+            df["Status"] = df["Status"].apply(
+                lambda x: True if str(x).upper() == "TRUE" else False)
+
+        df = backfill_system_columns(ws, df, all_cols)
+        set_row_id_map(sheet_name, df[COL_ROW_ID])
+        return compact_ram_frame("checklist", df[all_cols].copy(), label=f"checklist/{sheet_name}")
+    except Exception:
+        return pd.DataFrame(columns=all_cols)
+
+
+def save_checklist(sheet_name, df, columns):
+    """
+    Tulis ulang sheet checklist dengan compare-and-set terhadap versi baris saat load.
+    Versi acuan = kolom versi yang ikut di frame hasil edit `df` (versi yang dilihat user),
+    BUKAN cache load_checklist: cache itu milik semua sesi dan bisa sudah dimuat ulang
+    setelah sesi lain menyimpan, sehingga editan basi lolos dan menimpa perubahan mereka.
+    Konflik (baris diubah/ditambah/dihapus orang lain) -> batal, cache checklist dimuat ulang.
+    """
+    try:
+        all_cols = managed_columns(columns)
+        ws = spreadsheet.worksheet(sheet_name)
+        ensure_headers(ws, all_cols)
+
+        # Frame pembanding isi (baris mana yang berubah) dicocokkan lewat versi, jadi aman
+        # walau cache sudah lebih baru/lebih lama dari frame yang diedit user
+        df_before = load_checklist(sheet_name, columns)
+        expected = df[COL_ROW_VERSION] if COL_ROW_VERSION in df.columns else df_before[COL_ROW_VERSION]
+        conflicts, _ = find_version_conflicts(ws, all_cols, expected)
+        if conflicts:
+            refresh_rows_after_write(sheet_name, ws, all_cols, conflicts)
+            st.warning(f"⚠️ {len(conflicts)} baris target berubah sejak dimuat. {ROW_CONFLICT_MSG}")
+            return False
+
+        df_save = stamp_system_columns(df, df_before, columns)
+
+        ws.clear()
+
+        rows_needed = len(df_save) + 1
+        if ws.row_count < rows_needed:
+            ws.resize(rows=rows_needed)
+
+        df_save = df_save.fillna("")
+        for c in columns:
+            if c not in df_save.columns:
+                df_save[c] = ""
+
+        if "Status" in df_save.columns:
+            df_save["Status"] = df_save["Status"].apply(
+                lambda x: "TRUE" if bool(x) else "FALSE")
+
+        df_save = df_save[all_cols].astype(str)
+        data_to_save = [df_save.columns.values.tolist()] + \
+            df_save.values.tolist()
+
+        ws.update(range_name="A1", values=data_to_save,
+                  value_input_option="USER_ENTERED")
+        set_row_id_map(sheet_name, df_save[COL_ROW_ID])
+        # Versi di cache sudah basi setelah tulis ulang
+        load_checklist.clear()
+        # maybe_auto_format_sheet(ws)
+        return True
+    except Exception:
+        return False
+
+
+def apply_audit_checklist_changes(df_before: pd.DataFrame, df_after: pd.DataFrame, key_cols, actor: str):
+    """Update audit columns hanya untuk baris yang benar-benar berubah."""
+    if df_after is None or df_after.empty:
+        return df_after
+
+    actor = safe_str(actor, "-").strip() or "-"
+
+    before = df_before.copy() if df_before is not None else pd.DataFrame()
+    after = df_after.copy()
+
+    for c in [COL_TS_UPDATE, COL_UPDATED_BY]:
+        if c not in after.columns:
+            after[c] = ""
+
+    def make_key_row(r):
+        return tuple(safe_str(r.get(k, "")).strip() for k in key_cols)
+
+    before_map = {}
+    if not before.empty:
+        for _, r in before.iterrows():
+            before_map[make_key_row(r)] = r.to_dict()
+
+    ts = now_ts_str()
+    watched_cols = {"Status", "Bukti/Catatan"}
+
+    for idx, r in after.iterrows():
+        k = make_key_row(r)
+        prev = before_map.get(k, None)
+        if prev is None:
+            after.at[idx, COL_TS_UPDATE] = ts
+            after.at[idx, COL_UPDATED_BY] = actor
+            continue
+
+        changed = False
+        for col in watched_cols:
+            if col not in after.columns:
+                continue
+            oldv = prev.get(col, "")
+            newv = r.get(col, "")
+            if col == "Status":
+                if normalize_bool(oldv) != normalize_bool(newv):
+                    changed = True
+            else:
+                if safe_str(oldv, "").strip() != safe_str(newv, "").strip():
+                    changed = True
+
+        if changed:
+            after.at[idx, COL_TS_UPDATE] = ts
+            after.at[idx, COL_UPDATED_BY] = actor
+
+    return after
+
+
+def add_bulk_targets(sheet_name, base_row_data, targets_list):
+    try:
+        try:
+            ws = spreadsheet.worksheet(sheet_name)
+        except Exception:
+            return False
+
+        columns = TEAM_CHECKLIST_COLUMNS if sheet_name == SHEET_TARGET_TEAM else INDIV_CHECKLIST_COLUMNS
+        ensure_headers(ws, managed_columns(columns))
+
+        actor = get_actor_fallback(default="Admin")
+        ts = now_ts_str()
+
+        rows_to_add = []
+        for t in targets_list:
+            row_vals = list(base_row_data) if base_row_data else []
+            new_row = [""] * len(columns)
+
+            for i in range(min(len(row_vals), len(columns))):
+                new_row[i] = row_vals[i]
+
+            if sheet_name == SHEET_TARGET_TEAM:
+                new_row[0] = t
+            elif sheet_name == SHEET_TARGET_INDIVIDU:
+                new_row[1] = t
+
+            if COL_TS_UPDATE in columns:
+                new_row[columns.index(COL_TS_UPDATE)] = ts
+            if COL_UPDATED_BY in columns:
+                new_row[columns.index(COL_UPDATED_BY)] = actor
+
+            rows_to_add.append(new_row + [new_row_version(), new_row_id()])
+
+        resp = ws.append_rows(rows_to_add, value_input_option="USER_ENTERED")
+        add_row_ids(sheet_name, [r[-1] for r in rows_to_add], _first_row_from_append(resp))
+        load_checklist.clear()
+        # maybe_auto_format_sheet(ws)
+        return True
+    except Exception:
+        return False
+
+
+def update_evidence_row(sheet_name, target_name, note, file_obj, user_folder_name, kategori_folder,
+                        row_id=None, expected_version=""):
+    """
+    Update bukti/catatan untuk checklist (Team/Individu).
+    ✅ Optimasi: gunakan batch_update untuk mengurangi jumlah API call.
+    [BARU] Baris dicari lewat ID baris (row_id dari frame load_checklist), bukan scan seluruh
+    sheet. Nama target saja (pemanggil lama) -> ID & versi diambil dari frame cache.
+    expected_version = COL_ROW_VERSION baris yang dilihat user (compare-and-set).
+    """
+    if not row_id:
+        columns = TEAM_CHECKLIST_COLUMNS if sheet_name == SHEET_TARGET_TEAM else INDIV_CHECKLIST_COLUMNS
+        col_target_key = "Misi" if sheet_name == SHEET_TARGET_TEAM else "Target"
+        df_cached = load_checklist(sheet_name, columns)
+        matches = df_cached.loc[df_cached[col_target_key] == target_name]
+        if matches.empty:
+            return False, "Target tidak ditemukan."
+        row_id = matches[COL_ROW_ID].iloc[0]
+        expected_version = expected_version or matches[COL_ROW_VERSION].iloc[0]
+    return update_evidence_rows(sheet_name, [row_id], note, file_obj, user_folder_name, kategori_folder,
+                                expected_versions={row_id: expected_version})
+
+
+def update_evidence_rows(sheet_name, row_ids, note, file_obj, user_folder_name, kategori_folder,
+                         expected_versions=None):
+    """
+    [BARU] Satu bukti/catatan untuk beberapa target sekaligus (row_ids dari frame load_checklist).
+    Baris target dibaca (1 batch_get) & dicek versinya DULU, baru file di-upload sekali,
+    lalu semua sel ditulis dengan SATU batch_update.
+    expected_versions = {row_id: COL_ROW_VERSION yang dilihat user}; kalau versi salah satu
+    baris di sheet sudah beda (diubah orang lain), tidak ada yang ditulis.
+    Upload yang batal dipakai (baris berubah selama upload / tulis gagal) dihapus lagi.
+    """
+    if not row_ids:
+        return False, "Pilih minimal satu target."
+
+    link_bukti = ""
+    try:
+        ws = get_existing_worksheet(sheet_name)
+
+        columns = TEAM_CHECKLIST_COLUMNS if sheet_name == SHEET_TARGET_TEAM else INDIV_CHECKLIST_COLUMNS
+        headers = managed_columns(columns)
+        ensure_headers(ws, headers)
+
+        located = locate_rows(ws, sheet_name, headers, row_ids)
+
+        if len(located) < len(set(_version_str(r) for r in row_ids)):
+            load_checklist.clear()
+            return False, "Target tidak ditemukan (mungkin sudah dihapus)."
+
+        # Compare-and-set: versi yang dilihat user vs versi baris yang baru dibaca
+        expected = {_version_str(k): v for k, v in (expected_versions or {}).items()}
+        stale = [row for rid, (row, record) in located.items()
+                 if not version_matches(expected.get(rid, ""), record.get(COL_ROW_VERSION))]
+        if stale:
+            refresh_rows_after_write(sheet_name, ws, headers, [row - 2 for row in stale])
+            return False, ROW_CONFLICT_MSG
+
+        if file_obj:
+            link_bukti = upload_ke_dropbox(file_obj, user_folder_name, kategori=kategori_folder)
+            # Upload bisa makan beberapa detik: baca ulang baris target (1 batch_get) untuk
+            # catatan lama terbaru & pastikan tidak ada yang berubah/bergeser selama itu
+            rows = list(located.items())
+            records = fetch_sheet_rows(ws, headers, [row - 2 for _, (row, _) in rows])
+            moved = [row for (rid, (row, old)), rec in zip(rows, records)
+                     if _version_str(rec.get(COL_ROW_ID)) != rid
+                     or _version_str(rec.get(COL_ROW_VERSION)) != _version_str(old.get(COL_ROW_VERSION))]
+            if moved:
+                hapus_file_dropbox(link_bukti)
+                refresh_rows_after_write(sheet_name, ws, headers, [row - 2 for row in moved])
+                return False, ROW_CONFLICT_MSG
+            located = {rid: (row, rec) for (rid, (row, _)), rec in zip(rows, records)}
+
+        ts_update = now_ts_str()
+        actor = safe_str(user_folder_name, "-").strip() or "-"
+
+        update_text = f"[{ts_update}] "
+        if note:
+            update_text += f"{note}. "
+        if link_bukti and link_bukti != "-":
+            update_text += f"[FOTO: {link_bukti}]"
+
+        col_note = headers.index("Bukti/Catatan") + 1
+        col_ts = headers.index(COL_TS_UPDATE) + 1
+        col_by = headers.index(COL_UPDATED_BY) + 1
+
+        updates = []
+        for row_idx_gsheet, record in located.values():
+            catatan_lama = str(record.get("Bukti/Catatan", ""))
+            if catatan_lama in {"-", "nan"}:
+                catatan_lama = ""
+
+            final_note = f"{catatan_lama}\\n{update_text}" if catatan_lama.strip(
+            ) else update_text
+            final_note = final_note.strip() if final_note.strip() else "-"
+
+            updates += [
+                {"range": gspread.utils.rowcol_to_a1(row_idx_gsheet, col_note), "values": [[final_note]]},
+                {"range": gspread.utils.rowcol_to_a1(row_idx_gsheet, col_ts), "values": [[ts_update]]},
+                {"range": gspread.utils.rowcol_to_a1(row_idx_gsheet, col_by), "values": [[actor]]},
+            ]
+            updates += row_version_update(headers, row_idx_gsheet - 2, new_row_version())
+
+        try:
+            ws.batch_update(updates, value_input_option="USER_ENTERED")
+        except Exception:
+            hapus_file_dropbox(link_bukti)
+            raise
+        refresh_rows_after_write(sheet_name, ws, headers, [row - 2 for row, _ in located.values()])
+
+        # maybe_auto_format_sheet(ws)
+        if len(located) > 1:
+            return True, f"Berhasil update {len(located)} target!"
+        return True, "Berhasil update!"
+    except Exception as e:
+        return False, f"Error: {e}"
+
+
+# =========================================================
+# FEEDBACK + DAILY REPORT
+# =========================================================
+# =========================================================
+# [BARU] INDEX BARIS LAPORAN (posisi DataFrame RAM -> baris sheet)
+# =========================================================
+# Laporan harian tidak punya kolom ID; identitas baris = (sheet staf, posisi di frame RAM).
+# Frame RAM dibaca utuh dari sheet lalu hanya ditambah di ujung, jadi posisi ke-i = baris
+# sheet ke-(i + 2). Timestamp dipakai untuk verifikasi & pemetaan ulang saja, karena satu
+# laporan mobile berisi beberapa foto menulis beberapa baris dengan timestamp yang sama.
+def _get_ts_index_store():
+    init_ram_storage()
+    return st.session_state["RAM_DB"].setdefault("ts_index", {})
+
+
+def set_report_ts_index(nama_staf, df, first_sheet_row=2):
+    """Index dari frame RAM: rows[i] = nomor baris sheet untuk posisi ke-i."""
+    n = 0 if df is None else len(df)
+    _get_ts_index_store()[nama_staf] = {
+        "rows": list(range(first_sheet_row, first_sheet_row + n)), "sheet_ok": True}
+
+
+def add_to_report_ts_index(nama_staf, new_df, first_sheet_row):
+    """
+    Tambahkan baris hasil append. first_sheet_row None = nomor baris sheet tidak diketahui
+    (respons API tanpa updatedRange) -> index ditandai perlu dipetakan ulang dari sheet.
+    """
+    idx = _get_ts_index_store().get(nama_staf)
+    if idx is None:
+        return
+    if first_sheet_row is None:
+        idx["sheet_ok"] = False
+        return
+    idx["rows"].extend(range(first_sheet_row, first_sheet_row + len(new_df)))
+
+
+def _occurrences(keys):
+    """Urutan kemunculan tiap key: ["a", "b", "a"] -> [0, 0, 1]."""
+    seen, out = {}, []
+    for key in keys:
+        out.append(seen.get(key, 0))
+        seen[key] = out[-1] + 1
+    return out
+
+
+def _reindex_sheet_rows(ws, nama_staf, ram_keys):
+    """
+    Fallback: baca kolom Timestamp sekali, lalu petakan posisi RAM ke baris sheet lewat
+    (timestamp, kemunculan ke-k). Baris bertimestamp kosong tidak bisa dipetakan (None).
+    """
+    sheet_keys = ts_key_series(ws.col_values(1)[1:]).tolist()
+    by_key = {}
+    for i, key in enumerate(sheet_keys):
+        by_key.setdefault(key, []).append(i + 2)
+    rows = []
+    for key, k in zip(ram_keys, _occurrences(ram_keys)):
+        cands = by_key.get(key, []) if key else []
+        rows.append(cands[k] if k < len(cands) else None)
+    idx = {"rows": rows, "sheet_ok": True}
+    _get_ts_index_store()[nama_staf] = idx
+    return idx
+
+
+def _first_row_from_append(resp):
+    """Ambil nomor baris awal dari respons append_rows ("'Sheet'!A12:N14" -> 12)."""
+    try:
+        rng = resp["updates"]["updatedRange"]
+        return int(re.search(r"![A-Z]+(\d+)", rng).group(1))
+    except Exception:
+        return None
+
+
+def kirim_feedback_admin_bulk(items):
+    """
+    Kirim banyak feedback sekaligus.
+    items: list (nama_staf, posisi baris di frame RAM staf, timestamp baris, isi_feedback).
+    Timestamp dipakai untuk memastikan posisi masih menunjuk laporan yang sama.
+    Per staf cukup SATU batch_update berisi sel-sel Feedback; baris sheet dicari lewat index
+    posisi (tanpa row_values / col_values). RAM ikut di-mirror lewat posisi DataFrame.
+    Return: list (ok, pesan) sesuai urutan items.
+    """
+    results = [None] * len(items)
+    per_staf = {}
+    for n, (nama_staf, pos, timestamp, isi_feedback) in enumerate(items):
+        per_staf.setdefault(str(nama_staf), []).append((n, int(pos), ts_key(timestamp), isi_feedback))
+
+    ts_now = now_ts_str()
+    actor = get_actor_fallback(default="Admin")
+    col_idx = NAMA_KOLOM_STANDAR.index(COL_FEEDBACK) + 1
+
+    for nama_staf, entries in per_staf.items():
+        try:
+            # Header sudah dijamin ensure_headers (hasilnya di-cache), jadi kolom Feedback tetap
+            ws = get_or_create_worksheet(nama_staf)
+            if ws is None:
+                raise RuntimeError("Worksheet staf tidak tersedia.")
+
+            df_view = load_daily_report_ram(nama_staf)  # pastikan frame & index ada (hit RAM = tanpa I/O)
+            ram_keys = ts_key_series(df_view[COL_TIMESTAMP]).tolist() if not df_view.empty else []
+
+            targets = []
+            for n, pos, key, isi_feedback in entries:
+                if not 0 <= pos < len(ram_keys) or ram_keys[pos] != key:
+                    results[n] = (False, "Data laporan berubah / tidak ditemukan. Muat ulang antrean.")
+                    continue
+                targets.append((n, pos, isi_feedback))
+
+            idx = _get_ts_index_store().get(nama_staf) or {"rows": [], "sheet_ok": False}
+            if not idx["sheet_ok"] or len(idx["rows"]) != len(ram_keys):
+                idx = _reindex_sheet_rows(ws, nama_staf, ram_keys)
+
+            updates, mirror = [], []
+            for n, pos, isi_feedback in targets:
+                row = idx["rows"][pos]
+                if row is None:
+                    results[n] = (False, "Data laporan tidak ditemukan di sheet.")
+                    continue
+                fb_text = f"[{ts_now}] ({actor}) {isi_feedback}"
+                updates.append({"range": gspread.utils.rowcol_to_a1(row, col_idx), "values": [[fb_text]]})
+                mirror.append((n, pos, fb_text))
+
+            if not updates:
+                continue
+            ws.batch_update(updates, value_input_option="USER_ENTERED")
+
+            # Update RAM (Mirroring) langsung ke posisi baris; lewat put_report_frame agar
+            # catatan ukuran frame (budget LRU) ikut diperbarui
+            df_ram = st.session_state["RAM_DB"]["reports"].get(nama_staf)
+            if df_ram is not None:
+                df_ram = df_ram.copy(deep=False) if PANDAS_COW else df_ram
+                col_fb = df_ram.columns.get_loc(COL_FEEDBACK)
+                for _, pos, fb_text in mirror:
+                    if pos < len(df_ram):
+                        df_ram.iat[pos, col_fb] = fb_text
+                put_report_frame(nama_staf, df_ram)
+            for n, _, _ in mirror:
+                results[n] = (True, "Feedback terkirim!")
+        except Exception as e:
+            for n, _, _, _ in entries:
+                if results[n] is None:
+                    results[n] = (False, f"Error: {e}")
+
+    return [r if r is not None else (False, "Error: tidak diproses.") for r in results]
+
+
+def kirim_feedback_admin(nama_staf, row_pos, timestamp, isi_feedback):
+    """
+    Kirim feedback ke GSheet DAN update RAM secara lokal agar UI responsif.
+    """
+    return kirim_feedback_admin_bulk([(nama_staf, row_pos, timestamp, isi_feedback)])[0]
+
+
+def is_feedback_kosong(series):
+    return series.fillna("").astype(str).str.strip().isin(["", "-", "nan", "None"])
+
+
+# Kolom bantu antrean review: identitas baris untuk widget & kirim_feedback_admin_bulk
+REVIEW_COL_STAF = "_Sheet Staf"
+REVIEW_COL_POS = "_Posisi RAM"
+
+
+def build_review_queue(daftar_staf):
+    """
+    [BARU] Antrean review: semua laporan yang belum punya Feedback, terbaru di atas.
+    Dibaca dari RAM per staf, jadi feedback yang baru terkirim langsung hilang dari antrean.
+    Setiap baris membawa sheet staf & posisinya di frame RAM (REVIEW_COL_STAF / REVIEW_COL_POS).
+    """
+    pin_report_frames(daftar_staf)
+    parts = []
+    for nama in daftar_staf:
+        if nama == "Saya":
+            continue
+        df = load_daily_report_ram(nama)
+        if df.empty:
+            continue
+        if COL_FEEDBACK in df.columns:
+            mask = is_feedback_kosong(df[COL_FEEDBACK]).to_numpy()
+        else:
+            mask = pd.Series(True, index=df.index).to_numpy()
+        if not mask.any():
+            continue
+        part = df[mask].assign(**{REVIEW_COL_STAF: nama, REVIEW_COL_POS: mask.nonzero()[0]})
+        parts.append(part)
+
+    if not parts:
+        return pd.DataFrame(columns=NAMA_KOLOM_STANDAR + [REVIEW_COL_STAF, REVIEW_COL_POS])
+    queue = recast_report_categories(pd.concat(parts, ignore_index=True))
+    return queue.sort_values(by=COL_TIMESTAMP, ascending=False, na_position="last")
+
+
+def simpan_laporan_harian_batch(list_of_rows, nama_staf):
+    """
+    [SMART SAVE] 
+    1. Kirim data ke Google Sheets (Persistensi).
+    2. Suntikkan data baru langsung ke RAM (Kecepatan UI).
+    """
+    try:
+        # 1. Simpan Cloud (GSheet) - Proses I/O
+        ws = get_or_create_worksheet(nama_staf)
+        if ws is None: return False
+
+        resp = ws.append_rows(list_of_rows, value_input_option="USER_ENTERED")
+        first_row = _first_row_from_append(resp)
+        
+        # 2. Simpan RAM (Memory) - UI Update Instan
+        init_ram_storage()
+        
+        # Konversi input list menjadi DataFrame (dinormalisasi hanya baris barunya)
+        new_df = normalize_report_frame(pd.DataFrame(list_of_rows, columns=NAMA_KOLOM_STANDAR), nama_staf)
+        new_df = compact_ram_frame("laporan_harian", new_df, label=f"laporan_harian/{nama_staf}")
+        
+        # Ambil data lama dari RAM (jika ada)
+        if nama_staf in st.session_state["RAM_DB"]["reports"]:
+            current_df = st.session_state["RAM_DB"]["reports"][nama_staf]
+            # Gabungkan (Append)
+            # concat category beda kategori -> object; kompaksi ulang mengembalikannya
+            updated_df = compact_ram_frame("laporan_harian", pd.concat([current_df, new_df], ignore_index=True),
+                                           label=f"laporan_harian/{nama_staf}")
+            put_report_frame(nama_staf, recast_report_categories(updated_df))
+            add_to_report_ts_index(nama_staf, new_df, first_row)
+        else:
+            # Jika belum ada di RAM, buat baru
+            put_report_frame(nama_staf, new_df)
+            set_report_ts_index(nama_staf, new_df, first_sheet_row=first_row or 2)
+            if first_row is None:
+                _get_ts_index_store()[nama_staf]["sheet_ok"] = False
+
+        add_to_report_rollup(nama_staf, new_df)
+
+        return True
+    except Exception as e:
+        print(f"Error saving daily report batch: {e}")
+        return False
+
+
+def get_reminder_pending(nama_staf):
+    """Mengambil reminder 'Next Plan' terakhir langsung dari RAM."""
+    try:
+        # Panggil loader RAM (Cepat)
+        # Jika data staf belum ada di RAM, dia akan download sekali.
+        # Jika sudah ada, dia langsung return.
+        df = load_daily_report_ram(nama_staf)
+        
+        if df.empty:
+            return None
+            
+        # Ambil baris terakhir
+        last_row = df.iloc[-1]
+        pending_task = str(last_row.get(COL_PENDING, "")).strip()
+        
+        if pending_task and pending_task not in ["-", "", "nan", "None"]:
+            return pending_task
+        return None
+    except Exception:
+        return None
+
+
+# =========================================================
+# [BARU] NORMALISASI LAPORAN (sekali per frame yang di-load)
+# =========================================================
+KATEGORI_DIGITAL = "Digital/Kantor"
+KATEGORI_LAPANGAN = "Kunjungan Lapangan"
+KEYWORD_AKTIVITAS_DIGITAL = ["Digital", "Marketing", "Ads", "Konten", "Telesales"]
+RE_AKTIVITAS_DIGITAL = re.compile("|".join(re.escape(k) for k in KEYWORD_AKTIVITAS_DIGITAL))
+
+# Kolom turunan (hanya di RAM, tidak pernah ditulis ke GSheet)
+COL_TANGGAL_DATE = "Tanggal_Date"
+COL_KATEGORI_AKTIVITAS = "Kategori_Aktivitas"
+COL_INTEREST_BUCKET = "Interest_Bucket"
+REPORT_DERIVED_COLUMNS = [COL_TANGGAL_DATE, COL_KATEGORI_AKTIVITAS, COL_INTEREST_BUCKET]
+REPORT_CATEGORY_COLUMNS = [COL_NAMA, COL_KATEGORI_AKTIVITAS, COL_INTEREST_BUCKET]
+
+
+def klasifikasi_aktivitas(series_tempat):
+    """Versi vektor dari klasifikasi Digital/Kantor vs Kunjungan Lapangan."""
+    is_digital = series_tempat.astype(str).str.contains(RE_AKTIVITAS_DIGITAL, na=False)
+    return is_digital.map({True: KATEGORI_DIGITAL, False: KATEGORI_LAPANGAN})
+
+
+def bucket_interest(series_interest):
+    s = series_interest.fillna("").astype(str)
+    out = pd.Series("-", index=s.index, dtype=object)
+    out[s.str.contains("75", regex=False) & ~s.str.contains("50-75", regex=False)] = "75%-100%"
+    out[s.str.contains("50-75", regex=False)] = "50-75%"
+    out[s.str.contains("Under 50", case=False, regex=False)] = "Under 50%"
+    return out
+
+
+def recast_report_categories(df):
+    """pd.concat frame kategorikal beda kategori menghasilkan object; kembalikan ke category."""
+    for c in REPORT_CATEGORY_COLUMNS:
+        if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype("category")
+    return df
+
+
+def normalize_report_frame(df, nama_staf):
+    """
+    Pipeline normalisasi laporan harian. Dijalankan SEKALI saat frame masuk RAM
+    (load / append), hasilnya ikut tersimpan sehingga dashboard, rollup & insight
+    tidak perlu parsing tanggal atau klasifikasi ulang.
+    """
+    for col in NAMA_KOLOM_STANDAR:
+        if col not in df.columns:
+            df[col] = ""
+
+    df[COL_TIMESTAMP] = parse_ts_series(df[COL_TIMESTAMP])
+
+    nama = df[COL_NAMA].astype(object)
+    kosong = nama.isna() | nama.astype(str).str.strip().isin(["", "-", "nan"])
+    df[COL_NAMA] = nama.mask(kosong, nama_staf).astype(str).astype("category")
+
+    df[COL_TANGGAL_DATE] = df[COL_TIMESTAMP].dt.date
+    df[COL_KATEGORI_AKTIVITAS] = klasifikasi_aktivitas(df[COL_TEMPAT]).astype("category")
+    df[COL_INTEREST_BUCKET] = bucket_interest(df[COL_INTEREST]).astype("category")
+    return df
+
+
+def build_report_rollup(df, nama_staf):
+    if df is None or df.empty:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    if COL_KATEGORI_AKTIVITAS not in df.columns:
+        df = normalize_report_frame(df.copy(), nama_staf)
+
+    tmp = pd.DataFrame({
+        "Nama": df[COL_NAMA].astype(str),
+        "Tanggal": df[COL_TANGGAL_DATE],
+        "Kategori": df[COL_KATEGORI_AKTIVITAS].astype(str),
+        "Interest": df[COL_INTEREST_BUCKET].astype(str),
+    }).dropna(subset=["Tanggal"])
+
+    return tmp.groupby(ROLLUP_COLUMNS[:-1]).size().reset_index(name="Jumlah")
+
+
+# =========================================================
+# [BARU] ROLLUP PRODUKTIVITAS (Staf x Hari x Kategori x Interest)
+# =========================================================
+ROLLUP_COLUMNS = ["Nama", "Tanggal", "Kategori", "Interest", "Jumlah"]
+
+
+def _merge_rollup(old, new):
+    if old is None or old.empty:
+        return new
+    if new is None or new.empty:
+        return old
+    merged = pd.concat([old, new], ignore_index=True)
+    return merged.groupby(ROLLUP_COLUMNS[:-1], as_index=False)["Jumlah"].sum()
+
+
+def set_report_rollup(nama_staf, df_rollup):
+    init_ram_storage()
+    st.session_state["RAM_DB"].setdefault("rollup", {})[nama_staf] = df_rollup
+
+
+def add_to_report_rollup(nama_staf, df_new_rows):
+    """Update inkremental: hanya baris baru yang diagregasi lalu digabung."""
+    init_ram_storage()
+    store = st.session_state["RAM_DB"].setdefault("rollup", {})
+    if nama_staf not in store:
+        # Belum pernah dibangun: biarkan get_report_rollup membangun dari data lengkap
+        return
+    store[nama_staf] = _merge_rollup(store[nama_staf], build_report_rollup(df_new_rows, nama_staf))
+
+
+def get_report_rollup(daftar_staf, since=None):
+    """Gabungan rollup semua staf (ukuran ~ jumlah hari, bukan jumlah laporan)."""
+    init_ram_storage()
+    store = st.session_state["RAM_DB"].setdefault("rollup", {})
+    parts = []
+    for nama in daftar_staf:
+        if nama == "Saya":
+            continue
+        if nama not in store:
+            store[nama] = build_report_rollup(load_daily_report_ram(nama), nama)
+        if not store[nama].empty:
+            parts.append(store[nama])
+
+    if not parts:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    df_r = pd.concat(parts, ignore_index=True)
+    if since is not None:
+        df_r = df_r[df_r["Tanggal"] >= since]
+    return df_r
+
+
+def rollup_counts(df_rollup, by):
+    if df_rollup is None or df_rollup.empty:
+        return pd.Series(dtype="int64", name="Jumlah")
+    return df_rollup.groupby(by)["Jumlah"].sum().sort_values(ascending=False)
+
+
+def load_all_reports(daftar_staf):
+    """
+    Menggabungkan laporan semua staf.
+    Looping memanggil `load_daily_report_ram` sehingga efisien.
+    """
+    all_dfs = []
+    
+    # Semua frame dipakai sekaligus: di-pin agar memuat staf berikutnya tidak membuang yang sebelumnya
+    pin_report_frames(daftar_staf)
+
+    # Progress bar agar Admin tahu proses sedang berjalan (hanya muncul jika belum di-cache)
+    init_ram_storage()
+    show_progress = any(nm not in st.session_state["RAM_DB"]["reports"] for nm in daftar_staf if nm != "Saya")
+    
+    p_bar = None
+    if show_progress:
+        p_bar = st.progress(0, text="Sinkronisasi Data Laporan dari Cloud...")
+        
+    total = len(daftar_staf)
+
+    for i, nama in enumerate(daftar_staf):
+        if nama == "Saya": continue # Skip placeholder
+        
+        # Ini otomatis cek RAM dulu. Jika sudah ada, dia skip download.
+        df_staf = load_daily_report_ram(nama)
+        
+        # Kolom Nama sudah diisi oleh normalize_report_frame saat load
+        if not df_staf.empty:
+            all_dfs.append(df_staf)
+        
+        if p_bar: p_bar.progress((i + 1) / total)
+    
+    if p_bar: p_bar.empty()
+
+    if not all_dfs:
+        return pd.DataFrame(columns=NAMA_KOLOM_STANDAR)
+        
+    # Gabung semua jadi satu DataFrame besar
+    final_df = recast_report_categories(pd.concat(all_dfs, ignore_index=True))
+    return final_df
+
+
+def render_hybrid_table(df_data, unique_key, main_text_col):
+    """
+    Editor checklist (AgGrid kalau ada, fallback st.data_editor).
+    [BARU] Lewat paged_data_editor: hanya halaman aktif yang dikirim, return frame
+    penuh dengan index asli + editan semua halaman.
+    """
+    def _render_aggrid(page_df, widget_key):
+        df_grid = page_df.reset_index(drop=True)
+        gb = st_aggrid.GridOptionsBuilder.from_dataframe(df_grid)
+
+        if "Status" in df_grid.columns:
+            gb.configure_column("Status", editable=True, width=90)
+
+        if main_text_col in df_grid.columns:
+            gb.configure_column(
+                main_text_col, wrapText=True, autoHeight=True, width=400, editable=False)
+
+        if "Bukti/Catatan" in df_grid.columns:
+            gb.configure_column(
+                "Bukti/Catatan",
+                wrapText=True,
+                autoHeight=True,
+                editable=True,
+                cellEditor="agLargeTextCellEditor",
+                width=300
+            )
+
+        if COL_TS_UPDATE in df_grid.columns:
+            gb.configure_column(COL_TS_UPDATE, editable=False, width=420)
+        if COL_UPDATED_BY in df_grid.columns:
+            gb.configure_column(COL_UPDATED_BY, editable=False, width=160)
+        for sys_col in (COL_ROW_VERSION, COL_ROW_ID):
+            if sys_col in df_grid.columns:
+                gb.configure_column(sys_col, hide=True)
+
+        gb.configure_default_column(editable=False)
+        gridOptions = gb.build()
+
+        grid_response = st_aggrid.AgGrid(
+            df_grid,
+            gridOptions=gridOptions,
+            update_mode=st_aggrid.GridUpdateMode.MODEL_CHANGED,
+            fit_columns_on_grid_load=True,
+            height=420,
+            theme="streamlit",
+            key=f"aggrid_{widget_key}"
+        )
+        return pd.DataFrame(grid_response["data"])
+
+    if HAS_AGGRID:
+        try:
+            return paged_data_editor(df_data, f"hybrid_{unique_key}", render_page=_render_aggrid)
+        except Exception:
+            pass
+
+    column_config = {}
+    if "Status" in df_data.columns:
+        column_config["Status"] = st.column_config.CheckboxColumn(
+            "Done?", width="small")
+    if main_text_col in df_data.columns:
+        column_config[main_text_col] = st.column_config.TextColumn(
+            main_text_col, disabled=True, width="large")
+    if "Bukti/Catatan" in df_data.columns:
+        column_config["Bukti/Catatan"] = st.column_config.TextColumn(
+            "Bukti/Note", width="large")
+    if COL_TS_UPDATE in df_data.columns:
+        column_config[COL_TS_UPDATE] = st.column_config.TextColumn(
+            COL_TS_UPDATE, disabled=True, width="large")
+    if COL_UPDATED_BY in df_data.columns:
+        column_config[COL_UPDATED_BY] = st.column_config.TextColumn(
+            COL_UPDATED_BY, disabled=True, width="medium")
+    for sys_col in (COL_ROW_VERSION, COL_ROW_ID):
+        if sys_col in df_data.columns:
+            column_config[sys_col] = None
+
+    return paged_data_editor(
+        df_data,
+        f"editor_native_{unique_key}",
+        column_config=column_config,
+        hide_index=True,
+        use_container_width=True
+    )
+
+
+# =========================================================
+# CLOSING DEAL
+# =========================================================
+def load_closing_deal():
+    # Cek RAM
+    ram = get_ram_data("closing")
+    if ram is not None: return ram_view(ram)
+
+    # Frame membawa kolom tersembunyi versi & ID baris (edit admin dicari lewat ID, bukan posisi)
+    all_cols = managed_columns(CLOSING_COLUMNS)
+
+    # Download
+    if not KONEKSI_GSHEET_BERHASIL: return pd.DataFrame(columns=all_cols)
+    try:
+        ws = get_or_create_worksheet(SHEET_CLOSING_DEAL)
+        ensure_headers(ws, all_cols)
+        df = pd.DataFrame(ws.get_all_records())
+        # Cleaning
+        for c in all_cols: 
+            if c not in df.columns: df[c] = ""
+        if "Nilai Kontrak" in df.columns:
+            df["Nilai Kontrak"] = df["Nilai Kontrak"].apply(lambda x: parse_rupiah_to_int(x) or 0)
+
+        df = backfill_system_columns(ws, df, all_cols)
+        set_row_id_map(SHEET_CLOSING_DEAL, df[COL_ROW_ID])
+        df = compact_ram_frame("closing_deal", df)
+        update_ram_data("closing", df)
+        return ram_view(df)
+    except: return pd.DataFrame(columns=all_cols)
+
+
+def tambah_closing_deal(nama_group, nama_marketing, tanggal_event, bidang, nilai_kontrak_input):
+    if not KONEKSI_GSHEET_BERHASIL:
+        return False, "Koneksi GSheet belum aktif."
+
+    try:
+        nama_group = str(nama_group).strip() if nama_group is not None else ""
+        nama_marketing = str(nama_marketing).strip(
+        ) if nama_marketing is not None else ""
+        bidang = str(bidang).strip() if bidang is not None else ""
+
+        if not nama_group:
+            nama_group = "-"
+
+        if not nama_marketing or not tanggal_event or not bidang or not str(nilai_kontrak_input).strip():
+            return False, "Field wajib: Nama Marketing, Tanggal Event, Bidang, dan Nilai Kontrak."
+
+        nilai_int = parse_rupiah_to_int(nilai_kontrak_input)
+        if nilai_int is None:
+            return False, "Nilai Kontrak tidak valid. Contoh: 15000000 / 15.000.000 / Rp 15.000.000 / 15jt / 15,5jt"
+
+        all_cols = managed_columns(CLOSING_COLUMNS)
+        try:
+            ws = spreadsheet.worksheet(SHEET_CLOSING_DEAL)
+        except Exception:
+            ws = spreadsheet.add_worksheet(
+                title=SHEET_CLOSING_DEAL, rows=300, cols=len(all_cols))
+            ws.append_row(all_cols, value_input_option="USER_ENTERED")
+
+        ensure_headers(ws, all_cols)
+
+        tgl_str = tanggal_event.strftime(
+            "%Y-%m-%d") if hasattr(tanggal_event, "strftime") else str(tanggal_event)
+
+        ws.append_row([nama_group, nama_marketing, tgl_str, bidang, int(
+            nilai_int), new_row_version(), new_row_id()], value_input_option="USER_ENTERED")
+
+        # maybe_auto_format_sheet(ws)
+        return True, "Closing deal berhasil disimpan!"
+    except Exception as e:
+        return False, str(e)
+
+# =========================================================
+# [BARU] LOG PERUBAHAN PEMBAYARAN (Payment_Event_Log, APPEND-ONLY)
+# =========================================================
+# Satu baris per kolom yang berubah. Baris pembayaran hanya menyimpan ringkasan perubahan
+# terakhir (payment_change_summary), jadi load/simpan tidak lagi mem-parse log per baris.
+SHEET_PAYMENT_EVENTS = "Payment_Event_Log"
+PAYMENT_EVENT_COLUMNS = ["Timestamp", "Payment ID", "Actor", "Field", "Old Value", "New Value"]
+LEGACY_LOG_FIELD = "Log Lama"
+
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def _get_payment_event_ws_cached():
+    try:
+        return spreadsheet.worksheet(SHEET_PAYMENT_EVENTS)
+    except gspread.WorksheetNotFound:
+        ws = spreadsheet.add_worksheet(
+            title=SHEET_PAYMENT_EVENTS, rows=1000, cols=len(PAYMENT_EVENT_COLUMNS))
+        ws.append_row(PAYMENT_EVENT_COLUMNS, value_input_option="USER_ENTERED")
+        maybe_auto_format_sheet(ws, force=True)
+        return ws
+
+
+def payment_event_rows(payment_id, ts, actor, changes, old_log=""):
+    """
+    Baris event untuk satu pembayaran. old_log = isi kolom log sebelum diganti ringkasan;
+    kalau masih log lama bernomor, ikut disimpan sekali sebagai event LEGACY_LOG_FIELD.
+    """
+    actor = safe_str(actor, "-").strip() or "-"
+    rows = []
+    if is_legacy_payment_log(old_log):
+        rows.append([ts, payment_id, actor, LEGACY_LOG_FIELD, safe_str(old_log, ""), ""])
+    rows += [[ts, payment_id, actor, field, old, new] for field, old, new in changes]
+    return rows
+
+
+def append_payment_events(rows):
+    """Tulis event dengan SATU append_rows. Gagal log tidak membatalkan simpan data pembayaran."""
+    if not rows:
+        return True
+    try:
+        ws = _get_payment_event_ws_cached()
+        ensure_headers(ws, PAYMENT_EVENT_COLUMNS)
+        ws.append_rows(rows, value_input_option="RAW")
+        load_payment_events.clear()
+        return True
+    except Exception as e:
+        print(f"Payment Event Log Error: {e}")
+        return False
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_payment_events():
+    """Seluruh event (dibaca hanya saat riwayat dibuka, tidak ikut load pembayaran)."""
+    try:
+        ws = _get_payment_event_ws_cached()
+        df = pd.DataFrame(ws.get_all_records())
+        for c in PAYMENT_EVENT_COLUMNS:
+            if c not in df.columns:
+                df[c] = ""
+        return df[PAYMENT_EVENT_COLUMNS].astype(str)
+    except Exception as e:
+        print(f"Payment Event Load Error: {e}")
+        return pd.DataFrame(columns=PAYMENT_EVENT_COLUMNS)
+
+
+def get_payment_history(payment_id):
+    """Riwayat satu pembayaran, terbaru di atas."""
+    df = load_payment_events()
+    hist = df[df["Payment ID"] == _version_str(payment_id)]
+    return hist.iloc[::-1].drop(columns=["Payment ID"]).reset_index(drop=True)
+
+
+def build_payment_save_events(df_in, df_save, df_before):
+    """Event untuk simpan tabel: hanya baris yang dapat versi baru (isi berubah / baris baru)."""
+    prev_by_id = {}
+    if df_before is not None and COL_ROW_ID in df_before.columns:
+        for _, r in sn.decompact_frame(df_before).iterrows():
+            prev_by_id[_version_str(r[COL_ROW_ID])] = r
+
+    versions_in = df_in[COL_ROW_VERSION].tolist() if COL_ROW_VERSION in df_in.columns else [""] * len(df_in)
+    ts = now_ts_str()
+    rows = []
+    for (_, r), v_in in zip(df_save.iterrows(), versions_in):
+        if _version_str(r[COL_ROW_VERSION]) == _version_str(v_in):
+            continue
+        payment_id = _version_str(r[COL_ROW_ID])
+        prev = prev_by_id.get(payment_id)
+        if prev is None:
+            changes = [("Input Baru", "", _fmt_payment_val_for_log(COL_JENIS_BAYAR, r.get(COL_JENIS_BAYAR)))]
+            rows += payment_event_rows(payment_id, ts, r.get(COL_UPDATED_BY), changes)
+        else:
+            rows += payment_event_rows(payment_id, ts, r.get(COL_UPDATED_BY),
+                                       payment_field_changes(prev, r), old_log=prev.get(COL_TS_UPDATE, ""))
+    return rows
+
+
+# =========================================================
+# [BARU] JADWAL CICILAN (Payment_Schedule) & LEDGER SALDO
+# =========================================================
+# Baris Pembayaran_DP = kontrak. Jadwalnya ada di Payment_Schedule: cicilan ke-0 = pembayaran
+# awal (DP), lalu N cicilan dari tenor & jatuh tempo. Total terbayar kontrak dialokasikan
+# berurutan ke cicilan (yang paling awal lunas dulu). Ringkasan per kontrak (sisa, jatuh tempo
+# & nominal berikutnya) di-cache per versi baris: hanya baris yang berubah yang dihitung ulang.
+# Total / tenor / Batas Waktu Bayar diubah -> jadwal baru di-append (append-only, riwayat tetap
+# ada); "Versi Kontrak" = versi baris kontrak saat jadwal dibuat, generasi terakhir yang dipakai.
+SHEET_PAYMENT_SCHEDULE = "Payment_Schedule"
+PAYMENT_SCHEDULE_COLUMNS = ["Payment ID", "Cicilan Ke", "Jatuh Tempo", "Nominal Tagihan", "Versi Kontrak"]
+ALERT_MIN_SISA = 100
+
+
+def add_months(d, n):
+    """Tanggal yang sama n bulan kemudian (31 Jan + 1 bulan -> 28/29 Feb)."""
+    y, m = divmod(d.month - 1 + n, 12)
+    y, m = d.year + y, m + 1
+    last_day = (date(y + m // 12, m % 12 + 1, 1) - timedelta(days=1)).day
+    return date(y, m, min(d.day, last_day))
+
+
+def build_installment_plan(paid_now, sisa, tenor, first_due, paid_date=None):
+    """
+    Jadwal kontrak baru -> list (cicilan ke, jatuh tempo, nominal).
+    Sisa dibagi rata per bulan mulai first_due; selisih pembulatan masuk cicilan terakhir.
+    """
+    plan = []
+    if paid_now > 0:
+        plan.append((0, paid_date or first_due, int(paid_now)))
+    if sisa > 0:
+        n = max(int(tenor or 0), 1)
+        per = int(sisa) // n
+        for k in range(1, n + 1):
+            amount = per if k < n else int(sisa) - per * (n - 1)
+            plan.append((k, add_months(first_due, k - 1), amount))
+    return plan
+
+
+def rebuild_installment_plan(old_plan, paid, sisa, tenor, first_due):
+    """
+    Jadwal pengganti setelah total / tenor / Batas Waktu Bayar diubah: cicilan yang sudah
+    terbayar dipertahankan (yang terbayar sebagian dipotong sebesar yang dibayar), lalu sisa
+    tagihan dibagi ulang dengan tenor baru mulai first_due.
+    """
+    kept, cum = [], 0
+    for ke, due, amount in old_plan or []:
+        if cum >= paid:
+            break
+        applied = min(amount, paid - cum)
+        kept.append((ke, due, applied))
+        cum += applied
+    rest = build_installment_plan(paid - cum, sisa, tenor, first_due,
+                                  paid_date=datetime.now(tz=TZ_JKT).date())
+    if not rest:
+        return kept
+    start = kept[-1][0] + 1 if kept else rest[0][0]
+    return kept + [(start + i, due, amount) for i, (_, due, amount) in enumerate(rest)]
+
+
+def _plan_inputs(row):
+    """(total, tenor, Batas Waktu Bayar) kontrak dalam bentuk yang bisa dibandingkan."""
+    tenor = pd.to_numeric(row.get(COL_TENOR_CICILAN), errors="coerce")
+    due = normalize_date(row.get(COL_JATUH_TEMPO))
+    return (parse_rupiah_to_int(row.get(COL_NILAI_KESEPAKATAN)) or 0,
+            0 if pd.isna(tenor) else int(tenor),
+            None if due is None or pd.isna(due) else due)
+
+
+def plan_inputs_changed(old_row, new_row):
+    """True kalau total / tenor / Batas Waktu Bayar kontrak berbeda (jadwal harus dibangun ulang)."""
+    return _plan_inputs(old_row) != _plan_inputs(new_row)
+
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def _get_payment_schedule_ws_cached():
+    try:
+        return spreadsheet.worksheet(SHEET_PAYMENT_SCHEDULE)
+    except gspread.WorksheetNotFound:
+        ws = spreadsheet.add_worksheet(
+            title=SHEET_PAYMENT_SCHEDULE, rows=1000, cols=len(PAYMENT_SCHEDULE_COLUMNS))
+        ws.append_row(PAYMENT_SCHEDULE_COLUMNS, value_input_option="USER_ENTERED")
+        maybe_auto_format_sheet(ws, force=True)
+        return ws
+
+
+def get_payment_schedule():
+    """Semua jadwal cicilan (RAM; download sekali per sesi). Sheet belum ada -> kosong."""
+    ram = get_ram_data("payment_schedule")
+    if ram is not None:
+        return ram
+
+    plans, generation = {}, {}
+    if KONEKSI_GSHEET_BERHASIL:
+        try:
+            values = spreadsheet.worksheet(SHEET_PAYMENT_SCHEDULE).get_all_values()
+            for r in values[1:]:
+                r = list(r) + [""] * (len(PAYMENT_SCHEDULE_COLUMNS) - len(r))
+                pid, due = _version_str(r[0]), normalize_date(r[2])
+                if not pid or due is None:
+                    continue
+                # Baris jadwal generasi baru (di-append belakangan) menggantikan jadwal lama
+                if generation.get(pid) != _version_str(r[4]):
+                    generation[pid] = _version_str(r[4])
+                    plans[pid] = []
+                ke = pd.to_numeric(r[1], errors="coerce")
+                plans[pid].append(
+                    (0 if pd.isna(ke) else int(ke), due, parse_rupiah_to_int(r[3]) or 0))
+        except gspread.WorksheetNotFound:
+            pass
+        except Exception as e:
+            print(f"Payment Schedule Load Error: {e}")
+            return {}
+    for plan in plans.values():
+        plan.sort(key=lambda x: x[0])
+    update_ram_data("payment_schedule", plans)
+    return plans
+
+
+def append_payment_schedule(payment_id, plan, contract_version=""):
+    """Tulis jadwal satu kontrak (SATU append_rows) & tambahkan ke RAM."""
+    return append_payment_schedules({payment_id: (plan, contract_version)})
+
+
+def append_payment_schedules(items):
+    """
+    Tulis jadwal beberapa kontrak sekaligus (SATU append_rows) & ganti jadwalnya di RAM.
+    items = {Payment ID: (plan, versi baris kontrak)}.
+    """
+    items = {pid: (plan, ver) for pid, (plan, ver) in items.items() if plan}
+    if not items:
+        return True
+    try:
+        ws = _get_payment_schedule_ws_cached()
+        ensure_headers(ws, PAYMENT_SCHEDULE_COLUMNS)
+        ws.append_rows([[pid, ke, due.strftime("%Y-%m-%d"), amount, _version_str(ver)]
+                        for pid, (plan, ver) in items.items() for ke, due, amount in plan],
+                       value_input_option="USER_ENTERED")
+    except Exception as e:
+        print(f"Payment Schedule Error: {e}")
+        return False
+    plans = get_ram_data("payment_schedule")
+    if plans is not None:
+        for pid, (plan, _) in items.items():
+            plans[pid] = list(plan)
+    return True
+
+
+def regenerate_payment_plans(rows):
+    """
+    Bangun ulang jadwal kontrak yang total / tenor / Batas Waktu Bayar-nya diubah
+    (rows = dict nilai TERBARU baris kontrak, termasuk versi barunya). SATU append_rows.
+    """
+    plans = get_payment_schedule()
+    today = datetime.now(tz=TZ_JKT).date()
+    items = {}
+    for row in rows:
+        pid = _version_str(row.get(COL_ROW_ID))
+        if not pid:
+            continue
+        total, tenor, first_due = _plan_inputs(row)
+        paid = parse_rupiah_to_int(row.get(COL_NOMINAL_BAYAR)) or 0
+        plan = rebuild_installment_plan(plans.get(pid), paid, max(total - paid, 0), tenor, first_due or today)
+        items[pid] = (plan, row.get(COL_ROW_VERSION, ""))
+    return append_payment_schedules(items)
+
+
+def _ledger_entry(row, plan):
+    """(sisa, jatuh tempo berikutnya, nominal berikutnya) untuk satu baris kontrak."""
+    total = parse_rupiah_to_int(row.get(COL_NILAI_KESEPAKATAN)) or 0
+    paid = parse_rupiah_to_int(row.get(COL_NOMINAL_BAYAR)) or 0
+    sisa = max(total - paid, 0)
+    if sisa <= 0 or normalize_bool(row.get(COL_STATUS_BAYAR)):
+        return 0, None, 0
+    if not plan:
+        # Kontrak lama tanpa jadwal: satu tagihan di Batas Waktu Bayar
+        return sisa, normalize_date(row.get(COL_JATUH_TEMPO)), sisa
+
+    cum = 0
+    for _, due, amount in plan:
+        cum += amount
+        if cum > paid:
+            return sisa, due, min(cum - paid, sisa)
+    # Nilai kesepakatan dinaikkan melebihi jadwal: kekurangannya ditagih di cicilan terakhir
+    return sisa, plan[-1][1], sisa
+
+
+def payment_ledger(df):
+    """
+    Ringkasan saldo per baris df (index sama): kolom "sisa", "next_due" (datetime64),
+    "next_amount". Dihitung ulang hanya untuk baris yang versinya belum ada di cache.
+    """
+    init_ram_storage()
+    memo = st.session_state["RAM_DB"].setdefault("payment_ledger", {})
+    if df is None or df.empty:
+        return pd.DataFrame(columns=["sisa", "next_due", "next_amount"])
+
+    ids = [_version_str(x) for x in df[COL_ROW_ID]]
+    versions = [_version_str(x) for x in df[COL_ROW_VERSION]]
+    # Baris tanpa ID / versi (backfill belum jalan / gagal) dihitung langsung per posisi,
+    # tidak lewat memo: semua ID kosong akan berbagi satu slot memo[""]
+    entries = [None] * len(ids)
+    stale = [i for i, (pid, v) in enumerate(zip(ids, versions))
+             if not pid or not v or memo.get(pid, (None,))[0] != v]
+    if stale:
+        plans = get_payment_schedule()
+        for i in stale:
+            entry = (versions[i],) + _ledger_entry(df.iloc[i], plans.get(ids[i]) if ids[i] else None)
+            if ids[i] and versions[i]:
+                memo[ids[i]] = entry
+            else:
+                entries[i] = entry
+    if len(memo) > 2 * len(df) + 100:
+        # Buang ringkasan baris yang sudah tidak ada
+        keep = set(ids)
+        for pid in [k for k in memo if k not in keep]:
+            memo.pop(pid, None)
+
+    entries = [e if e is not None else memo[pid] for e, pid in zip(entries, ids)]
+    return pd.DataFrame({
+        "sisa": [e[1] for e in entries],
+        "next_due": pd.to_datetime([e[2] for e in entries], errors="coerce"),
+        "next_amount": [e[3] for e in entries],
+    }, index=df.index)
+
+
+def payment_alert_masks(ledger, days_due_soon=3):
+    """(overdue, due_soon) berupa mask boolean dari ringkasan ledger."""
+    today = pd.Timestamp(datetime.now(tz=TZ_JKT).date())
+    aktif = (ledger["sisa"] > ALERT_MIN_SISA) & ledger["next_due"].notna()
+    overdue = aktif & (ledger["next_due"] <= today)
+    due_soon = aktif & (ledger["next_due"] > today) & (
+        ledger["next_due"] <= today + pd.Timedelta(days=days_due_soon))
+    return overdue, due_soon
+
+
+def _build_payment_alert_index(df):
+    """Jatuh tempo (ordinal) semua tagihan aktif, terurut naik."""
+    ledger = payment_ledger(df)
+    aktif = ledger[(ledger["sisa"] > ALERT_MIN_SISA) & ledger["next_due"].notna()]
+    return {
+        "frame": df,        # frame RAM yang diindeks (dibandingkan lewat identitas objek)
+        "dues": sorted(d.toordinal() for d in aktif["next_due"].dt.date),
+        "counts": {},       # (tanggal, N hari) -> (overdue, due soon)
+    }
+
+
+def get_payment_alert_index():
+    """
+    Index alert untuk frame pembayaran di RAM. Setiap penulisan pembayaran mengganti objek
+    frame RAM, jadi index hanya dibangun ulang kalau objek frame-nya berganti.
+    """
+    ram = get_ram_data("payment")
+    if ram is None:
+        load_pembayaran_dp()
+        ram = get_ram_data("payment")
+    if ram is None or ram.empty:
+        return None
+
+    db = st.session_state["RAM_DB"]
+    idx = db.get("payment_alert_index")
+    if idx is None or idx["frame"] is not ram:
+        idx = _build_payment_alert_index(ram)
+        db["payment_alert_index"] = idx
+    return idx
+
+
+def payment_schedule_status(row):
+    """Jadwal satu kontrak + alokasi pembayaran per cicilan (untuk ditampilkan)."""
+    plan = get_payment_schedule().get(_version_str(row.get(COL_ROW_ID)), [])
+    paid = parse_rupiah_to_int(row.get(COL_NOMINAL_BAYAR)) or 0
+    out = []
+    for ke, due, amount in plan:
+        applied = min(max(paid, 0), amount)
+        paid -= applied
+        status = "✅ Lunas" if applied >= amount else ("🟡 Sebagian" if applied > 0 else "⏳ Belum")
+        out.append({"Cicilan Ke": "DP" if ke == 0 else ke, "Jatuh Tempo": due,
+                    "Tagihan": format_rupiah_display(amount),
+                    "Terbayar": format_rupiah_display(applied), "Status": status})
+    return pd.DataFrame(out)
+
+
+# =========================================================
+# PEMBAYARAN (OPTIMIZED: RAM + CLOUD DUAL WRITE)
+# =========================================================
+def _normalize_payment_frame(df):
+    """Normalisasi data mentah sheet Pembayaran (agar Editor Streamlit tidak error)."""
+    # Pastikan semua kolom ada
+    for c in managed_columns(PAYMENT_COLUMNS):
+        if c not in df.columns:
+            df[c] = ""
+
+    # Sisa yang kosong di sheet (data lama) dihitung di sini; sisanya sudah dihitung saat simpan
+    sisa_kosong = df[COL_SISA_BAYAR].isna() | df[COL_SISA_BAYAR].astype(str).str.strip().isin(["", "nan", "None"])
+
+    # Clean Type Data: Numeric (Hapus Rp/Titik -> Jadi Int)
+    numeric_cols = [COL_NOMINAL_BAYAR, COL_NILAI_KESEPAKATAN, COL_SISA_BAYAR]
+    for c in numeric_cols:
+        if c in df.columns:
+            df[c] = df[c].apply(lambda x: parse_rupiah_to_int(x) if isinstance(x, str) else x)
+            df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0)
+
+    if sisa_kosong.any():
+        df.loc[sisa_kosong, COL_SISA_BAYAR] = (
+            df.loc[sisa_kosong, COL_NILAI_KESEPAKATAN] - df.loc[sisa_kosong, COL_NOMINAL_BAYAR]).clip(lower=0)
+
+    # Clean Type Data: Boolean Status
+    if COL_STATUS_BAYAR in df.columns:
+        df[COL_STATUS_BAYAR] = df[COL_STATUS_BAYAR].apply(
+            lambda x: True if str(x).strip().upper() == "TRUE" else False)
+
+    # Clean Type Data: Date (String -> Date Object untuk UI DatePicker)
+    if COL_JATUH_TEMPO in df.columns:
+        def smart_date_parser(x):
+            s = str(x).strip()
+            if not s or s.lower() in ["nan", "none", "-", ""]:
+                return pd.NaT
+            try:
+                return pd.to_datetime(s, format="%Y-%m-%d").date()
+            except:
+                try:
+                    return pd.to_datetime(s, dayfirst=True).date()
+                except:
+                    return pd.NaT
+
+        df[COL_JATUH_TEMPO] = df[COL_JATUH_TEMPO].apply(smart_date_parser)
+
+    # Clean Type Data: String
+    text_cols = [COL_TS_BAYAR, COL_GROUP, COL_MARKETING, COL_TGL_EVENT, COL_JENIS_BAYAR,
+                 COL_BUKTI_BAYAR, COL_CATATAN_BAYAR, COL_TS_UPDATE, COL_UPDATED_BY,
+                 COL_ROW_VERSION, COL_ROW_ID]
+    for c in text_cols:
+        if c in df.columns:
+            df[c] = df[c].fillna("").astype(str)
+
+    return df[managed_columns(PAYMENT_COLUMNS)]
+
+
+def load_pembayaran_dp():
+    """
+    [SMART LOAD] 
+    1. Cek RAM. Jika ada, return detik itu juga (Instan).
+    2. Jika kosong, Download dari GSheet, normalisasi data, simpan ke RAM, baru return.
+    Frame membawa kolom tersembunyi versi & ID baris (compare-and-set / cari baris lewat ID).
+    """
+    # 1. Cek RAM (Hit Cache)
+    ram_data = get_ram_data("payment")
+    if ram_data is not None:
+        return ram_view(ram_data)
+
+    payment_cols = managed_columns(PAYMENT_COLUMNS)
+
+    # 2. Download Cloud (Miss Cache - Hanya terjadi 1x saat VPS start/restart)
+    if not KONEKSI_GSHEET_BERHASIL:
+        return pd.DataFrame(columns=payment_cols)
+
+    try:
+        try:
+            ws = spreadsheet.worksheet(SHEET_PEMBAYARAN)
+        except Exception:
+            # Buat baru jika tidak ada dan kembalikan frame kosong ke RAM
+            ws = spreadsheet.add_worksheet(title=SHEET_PEMBAYARAN, rows=500, cols=len(payment_cols))
+            ws.append_row(payment_cols, value_input_option="USER_ENTERED")
+            empty = pd.DataFrame(columns=payment_cols)
+            update_ram_data("payment", empty)
+            return empty
+
+        ensure_headers(ws, payment_cols)
+        
+        data = ws.get_all_records()
+        df = pd.DataFrame(data)
+
+        # --- NORMALISASI DATA (Agar Editor Streamlit Tidak Error) ---
+        df = _normalize_payment_frame(df)
+        # Baris lama yang belum punya versi / ID diberi sekali (satu batch_update)
+        df = backfill_system_columns(ws, df, payment_cols)
+        set_row_id_map(SHEET_PEMBAYARAN, df[COL_ROW_ID])
+
+        # 3. SIMPAN KE RAM (Mirroring)
+        # Dataframe ini bersih dan siap pakai untuk UI
+        df = compact_ram_frame("pembayaran_dp", df)
+        update_ram_data("payment", df)
+
+        return ram_view(df)
+
+    except Exception as e:
+        print(f"Error load_pembayaran_dp: {e}")
+        return pd.DataFrame(columns=payment_cols)
+
+
+def refresh_payment_rows(ws, headers, positions, sheet_rows=None):
+    """
+    Muat ulang HANYA baris pembayaran tertentu ke RAM (1x batch_get), bukan seluruh sheet.
+    Kalau jumlah baris di sheet sudah beda dari RAM (ada baris dihapus/ditambah orang lain),
+    posisi tidak bisa dipercaya -> RAM dikosongkan & load berikutnya download ulang.
+    """
+    ram = get_ram_data("payment")
+    if ram is None or not positions:
+        return
+    if (sheet_rows is not None and sheet_rows != len(ram)) or max(positions) >= len(ram):
+        update_ram_data("payment", None)
+        return
+
+    fresh = _normalize_payment_frame(pd.DataFrame(fetch_sheet_rows(ws, headers, positions)))
+    records = sn.decompact_frame(ram).reset_index(drop=True).to_dict("records")
+    for pos, rec in zip(positions, fresh.to_dict("records")):
+        records[pos] = rec
+    df = pd.DataFrame(records, columns=fresh.columns)
+    update_ram_data("payment", compact_ram_frame("pembayaran_dp", df))
+
+
+def tambah_pembayaran_dp(nama_group, nama_marketing, tgl_event, jenis_bayar, nominal_input, total_sepakat_input, tenor, jatuh_tempo, bukti_file, catatan):
+    """
+    [SMART SAVE] 
+    Menambah record pembayaran dengan validasi lengkap.
+    Data disimpan ke GSheet (Cloud) DAN disuntikkan ke RAM (Instan).
+    """
+    if not KONEKSI_GSHEET_BERHASIL: 
+        return False, "Sistem Error: Koneksi Google Sheets tidak aktif."
+
+    try:
+        # --- 1. LOGIKA VALIDASI & KALKULASI (ASLI) ---
+        group = str(nama_group).strip() if nama_group else "-"
+        marketing = str(nama_marketing).strip() if nama_marketing else "Unknown"
+        catatan_clean = str(catatan).strip() if catatan else "-"
+        
+        nom_bayar = parse_rupiah_to_int(nominal_input) or 0
+        total_sepakat = parse_rupiah_to_int(total_sepakat_input) or 0
+        tenor_val = int(tenor) if tenor else 0
+        
+        if total_sepakat <= 0:
+            return False, "Input Gagal: Total nilai kesepakatan harus diisi dengan benar."
+
+        sisa_bayar = total_sepakat - nom_bayar
+        
+        info_cicilan = ""
+        if tenor_val > 0 and sisa_bayar > 0:
+            nilai_per_cicilan = sisa_bayar / tenor_val
+            info_cicilan = f" | Cicilan: {format_rupiah_display(nilai_per_cicilan)} x{tenor_val} term"
+
+        status_fix = "✅ Lunas"
+        is_lunas_bool = True # Flag untuk Boolean di RAM
+        
+        if sisa_bayar <= 0:
+            status_fix = "✅ Lunas"
+            if jenis_bayar == "Cash": 
+                status_fix += " (Cash)"
+            is_lunas_bool = True
+        else:
+            if jenis_bayar == "Down Payment (DP)":
+                status_fix = f"⏳ DP (Sisa: {format_rupiah_display(sisa_bayar)}){info_cicilan}"
+            elif jenis_bayar == "Cicilan":
+                status_fix = f"💳 Cicilan (Sisa: {format_rupiah_display(sisa_bayar)}){info_cicilan}"
+            else:
+                status_fix = f"⚠️ Belum Lunas (Sisa: {format_rupiah_display(sisa_bayar)}){info_cicilan}"
+            is_lunas_bool = False
+
+        # --- 2. UPLOAD DROPBOX (ASLI) ---
+        link_bukti = "-"
+        if bukti_file and KONEKSI_DROPBOX_BERHASIL:
+            link_bukti = upload_ke_dropbox(bukti_file, marketing, kategori="Bukti_Pembayaran")
+
+        ts_in = now_ts_str()
+        
+        # Format Tanggal string untuk GSheet (YYYY-MM-DD)
+        fmt_tgl_event = tgl_event.strftime("%Y-%m-%d") if hasattr(tgl_event, "strftime") else str(tgl_event)
+        fmt_jatuh_tempo = jatuh_tempo.strftime("%Y-%m-%d") if hasattr(jatuh_tempo, "strftime") else str(jatuh_tempo)
+
+        new_changes = [("Input Baru", "", f"{jenis_bayar}{info_cicilan}")]
+        final_log_str = payment_change_summary(ts_in, marketing, new_changes)
+
+        # --- 3. SIMPAN KE CLOUD (GSHEET) ---
+        row_version, row_id = new_row_version(), new_row_id()
+        row_gsheet = [
+            ts_in,
+            group,
+            marketing,
+            fmt_tgl_event,
+            total_sepakat,
+            jenis_bayar,
+            nom_bayar,
+            tenor_val,
+            sisa_bayar,
+            fmt_jatuh_tempo,
+            status_fix,
+            link_bukti,
+            catatan_clean,
+            final_log_str,
+            marketing,
+            row_version,
+            row_id
+        ]
+
+        ws = spreadsheet.worksheet(SHEET_PEMBAYARAN)
+        ensure_headers(ws, managed_columns(PAYMENT_COLUMNS))
+        resp = ws.append_row(row_gsheet, value_input_option="USER_ENTERED")
+        add_row_ids(SHEET_PEMBAYARAN, [row_id], _first_row_from_append(resp))
+        append_payment_events(payment_event_rows(row_id, ts_in, marketing, new_changes))
+        first_due = normalize_date(jatuh_tempo) or datetime.now(tz=TZ_JKT).date()
+        append_payment_schedule(row_id, build_installment_plan(
+            nom_bayar, sisa_bayar, tenor_val, first_due, paid_date=datetime.now(tz=TZ_JKT).date()),
+            contract_version=row_version)
+
+        # --- 4. UPDATE RAM (DUAL WRITE) ---
+        # Kita suntikkan data baru ke RAM agar user melihatnya seketika (tanpa download ulang)
+        # PENTING: Gunakan tipe data asli (Int, String, Date Object, Bool) agar kompatibel dengan UI Editor
+        new_ram_entry = {
+            COL_TS_BAYAR: ts_in,
+            COL_GROUP: group,
+            COL_MARKETING: marketing,
+            # RAM tetap menyimpan Tgl Event sebagai String agar konsisten dengan kolom Text lain
+            COL_TGL_EVENT: fmt_tgl_event, 
+            COL_NILAI_KESEPAKATAN: int(total_sepakat),
+            COL_JENIS_BAYAR: jenis_bayar,
+            COL_NOMINAL_BAYAR: int(nom_bayar),
+            COL_TENOR_CICILAN: int(tenor_val),
+            COL_SISA_BAYAR: int(sisa_bayar),
+            # RAM menyimpan Jatuh Tempo sebagai Date Object agar UI DatePicker berfungsi
+            COL_JATUH_TEMPO: jatuh_tempo, 
+            # RAM menyimpan Status sebagai Boolean agar UI Checkbox berfungsi
+            COL_STATUS_BAYAR: is_lunas_bool, 
+            COL_BUKTI_BAYAR: link_bukti,
+            COL_CATATAN_BAYAR: catatan_clean,
+            COL_TS_UPDATE: final_log_str,
+            COL_UPDATED_BY: marketing,
+            COL_ROW_VERSION: row_version,
+            COL_ROW_ID: row_id
+        }
+        
+        # Fungsi ini akan menambahkan dict di atas ke DataFrame yang ada di RAM
+        append_ram_data("payment", new_ram_entry, prepare=lambda df: compact_ram_frame(
+            "pembayaran_dp", _normalize_payment_frame(df)))
+
+        # Pesan Sukses
+        msg_feedback = f"Pembayaran berhasil disimpan! "
+        if sisa_bayar > 0:
+            msg_feedback += f"Sisa tagihan: {format_rupiah_display(sisa_bayar)} dengan rincian {info_cicilan.replace(' | ', '')}."
+        else:
+            msg_feedback += "Status: LUNAS."
+
+        return True, msg_feedback
+
+    except Exception as e:
+        return False, f"System Error: {str(e)}"
+
+def save_pembayaran_dp(df: pd.DataFrame) -> bool:
+    """
+    Tulis ulang sheet Pembayaran dari hasil editor, dengan compare-and-set:
+    versi baris di sheet harus sama dengan versi di RAM (data yang dilihat user saat edit).
+    Kalau ada yang beda, simpan dibatalkan dan hanya baris yang konflik dimuat ulang.
+    """
+    try:
+        payment_cols = managed_columns(PAYMENT_COLUMNS)
+        ws = spreadsheet.worksheet(SHEET_PEMBAYARAN)
+        ensure_headers(ws, payment_cols)
+
+        # 1. Compare: satu col_values untuk seluruh kolom versi
+        df_before = get_ram_data("payment")
+        if df_before is not None:
+            conflicts, sheet_rows = find_version_conflicts(ws, payment_cols, df_before[COL_ROW_VERSION])
+            if conflicts:
+                refresh_rows_after_write(SHEET_PEMBAYARAN, ws, payment_cols, conflicts, sheet_rows=sheet_rows)
+                st.warning(f"⚠️ {len(conflicts)} baris pembayaran berubah sejak dimuat. {ROW_CONFLICT_MSG}")
+                return False
+
+        # 2. Set: baris yang berubah / baru dapat versi baru
+        df_save = stamp_system_columns(df, df_before, PAYMENT_COLUMNS)
+
+        # Sisa dihitung ulang hanya untuk baris yang berubah (baris lain sudah konsisten)
+        versions_in = df[COL_ROW_VERSION].map(_version_str) if COL_ROW_VERSION in df.columns else ""
+        changed = df_save[COL_ROW_VERSION].map(_version_str) != versions_in
+        if changed.any():
+            total = df_save.loc[changed, COL_NILAI_KESEPAKATAN].map(lambda x: parse_rupiah_to_int(x) or 0)
+            paid = df_save.loc[changed, COL_NOMINAL_BAYAR].map(lambda x: parse_rupiah_to_int(x) or 0)
+            df_save[COL_SISA_BAYAR] = df_save[COL_SISA_BAYAR].astype(object)
+            df_save.loc[changed, COL_SISA_BAYAR] = (total - paid).clip(lower=0)
+
+        ws.clear()
+
+        rows_needed = len(df_save) + 1
+        if ws.row_count < rows_needed:
+            ws.resize(rows=rows_needed)
+
+        for c in PAYMENT_COLUMNS:
+            if c not in df_save.columns:
+                df_save[c] = ""
+
+        df_save[COL_STATUS_BAYAR] = df_save[COL_STATUS_BAYAR].apply(
+            lambda x: "TRUE" if bool(x) else "FALSE")
+
+        def _to_int_or_blank(x):
+            if x is None or pd.isna(x):
+                return ""
+            val = parse_rupiah_to_int(x)
+            return "" if val is None else int(val)
+
+        df_save[COL_NOMINAL_BAYAR] = df_save[COL_NOMINAL_BAYAR].apply(
+            _to_int_or_blank)
+
+        def _fmt_date(d):
+            if d is None or pd.isna(d):
+                return ""
+            if hasattr(d, "strftime"):
+                return d.strftime("%Y-%m-%d")
+            s = str(d).strip()
+            return s if s and s.lower() not in {"nan", "none"} else ""
+
+        df_save[COL_JATUH_TEMPO] = df_save[COL_JATUH_TEMPO].apply(_fmt_date)
+
+        df_save[COL_UPDATED_BY] = df_save[COL_UPDATED_BY].apply(
+            lambda x: safe_str(x, "-").strip() or "-")
+
+        df_save = df_save[payment_cols].fillna("")
+        data_to_save = [df_save.columns.values.tolist()] + \
+            df_save.values.tolist()
+
+        ws.update(range_name="A1", values=data_to_save,
+                  value_input_option="USER_ENTERED")
+        set_row_id_map(SHEET_PEMBAYARAN, df_save[COL_ROW_ID])
+        append_payment_events(build_payment_save_events(df, df_save, df_before))
+
+        # Jadwal cicilan kontrak yang total / tenor / Batas Waktu Bayar-nya diubah dibangun ulang
+        if df_before is not None and changed.any():
+            prev_by_id = {_version_str(r[COL_ROW_ID]): r for r in df_before.to_dict("records")}
+            replan = []
+            for r in df_save.loc[changed].to_dict("records"):
+                prev = prev_by_id.get(_version_str(r[COL_ROW_ID]))
+                if prev is not None and plan_inputs_changed(prev, r):
+                    replan.append(r)
+            regenerate_payment_plans(replan)
+
+        # 3. RAM = isi sheet yang baru ditulis (termasuk versi baru), tanpa download ulang
+        df_ram = _normalize_payment_frame(df_save.copy())
+        update_ram_data("payment", compact_ram_frame("pembayaran_dp", df_ram))
+        # maybe_auto_format_sheet(ws)
+        return True
+    except Exception as e:
+        print(f"Error saving payment: {e}")
+        return False
+
+
+def build_alert_pembayaran(df: pd.DataFrame, days_due_soon: int = 3):
+    """
+    Tagihan overdue & jatuh tempo dekat, dibaca dari ringkasan ledger (payment_ledger).
+    Kolom Sisa & Batas Waktu Bayar di hasil = sisa kontrak & jatuh tempo cicilan berikutnya.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=PAYMENT_COLUMNS), pd.DataFrame(columns=PAYMENT_COLUMNS)
+
+    ledger = payment_ledger(df)
+    mask_overdue, mask_soon = payment_alert_masks(ledger, days_due_soon)
+
+    def _pick(mask):
+        # Urut jatuh tempo paling awal di atas (paling mendesak)
+        order = ledger.loc[mask, "next_due"].sort_values(kind="stable").index
+        out = df.loc[order].copy()
+        out[COL_SISA_BAYAR] = ledger.loc[order, "sisa"]
+        out[COL_JATUH_TEMPO] = ledger.loc[order, "next_due"].dt.date
+        return out
+
+    return _pick(mask_overdue), _pick(mask_soon)
+
+
+def payment_alert_counts(days_due_soon: int = 3):
+    """
+    (jumlah overdue, jumlah jatuh tempo dekat) untuk sidebar, dibaca dari index alert.
+    Hitungan di-cache per hari: dihitung ulang (bisect) hanya saat ganti tanggal.
+    """
+    idx = get_payment_alert_index()
+    if not idx:
+        return 0, 0
+
+    today = datetime.now(tz=TZ_JKT).date()
+    counts = idx["counts"]
+    key = (today, days_due_soon)
+    if key not in counts:
+        if any(k[0] != today for k in counts):
+            counts.clear()
+        t = today.toordinal()
+        n_overdue = bisect.bisect_right(idx["dues"], t)
+        n_due_soon = bisect.bisect_right(idx["dues"], t + days_due_soon) - n_overdue
+        counts[key] = (n_overdue, n_due_soon)
+    return counts[key]
+
+
+def update_bukti_pembayaran_by_id(row_id: str, file_obj, nama_marketing: str, actor: str = "-",
+                                  expected_version: str = ""):
+    """
+    Ganti bukti bayar satu baris, dicari lewat ID baris (bukan posisi).
+    expected_version = COL_ROW_VERSION baris yang dipilih user; kalau versi di sheet sudah
+    beda (baris diubah orang lain), tidak ada yang ditulis.
+    [BARU] Nilai lama & nomor baris diambil dari RAM + map ID. Baris di-resolve & dicek versinya
+    SEBELUM upload (konflik / baris hilang tidak meninggalkan file di Dropbox), dicek lagi 2 sel
+    setelah upload, lalu SATU batch_update; RAM di-patch di tempat. Upload yang batal dipakai dihapus.
+    """
+    if not KONEKSI_GSHEET_BERHASIL:
+        return False, "Koneksi GSheet belum aktif."
+    if not KONEKSI_DROPBOX_BERHASIL:
+        return False, "Dropbox non-aktif. Upload bukti dimatikan."
+    if file_obj is None:
+        return False, "File bukti belum dipilih."
+
+    row_id = _version_str(row_id)
+    try:
+        headers = managed_columns(PAYMENT_COLUMNS)
+        ram = get_ram_data("payment")
+        cached = ram.loc[ram[COL_ROW_ID].astype(str) == row_id] if ram is not None else None
+        record = cached.iloc[0].to_dict() if cached is not None and not cached.empty else None
+        if record is not None and not version_matches(expected_version, record.get(COL_ROW_VERSION)):
+            return False, ROW_CONFLICT_MSG
+
+        ws = get_existing_worksheet(SHEET_PEMBAYARAN)
+        ensure_headers(ws, headers)
+        row_gsheet = cached_row_number(SHEET_PEMBAYARAN, row_id)
+
+        # Resolve baris & cek versi SEBELUM upload
+        stamp_ok = False
+        if record is not None and row_gsheet is not None:
+            sheet_version, sheet_id = fetch_row_stamp(ws, headers, row_gsheet)
+            stamp_ok = sheet_id == row_id and sheet_version == _version_str(record.get(COL_ROW_VERSION))
+        if not stamp_ok:
+            # RAM / map basi: cari ulang barisnya & pakai isi sheet sebagai nilai lama
+            row_gsheet, record = locate_row(ws, SHEET_PEMBAYARAN, headers, row_id)
+            if row_gsheet is None:
+                update_ram_data("payment", None)
+                return False, "Data pembayaran tidak ditemukan (mungkin sudah dihapus)."
+            if not version_matches(expected_version, record.get(COL_ROW_VERSION)):
+                refresh_rows_after_write(SHEET_PEMBAYARAN, ws, headers, [row_gsheet - 2])
+                return False, ROW_CONFLICT_MSG
+
+        link = upload_ke_dropbox(file_obj, nama_marketing or "Unknown", kategori="Bukti_Pembayaran")
+        if not link or link == "-":
+            return False, "Gagal upload ke Dropbox."
+
+        # Cek ulang versi tepat sebelum tulis (upload bisa makan beberapa detik)
+        sheet_version, sheet_id = fetch_row_stamp(ws, headers, row_gsheet)
+        if sheet_id != row_id or sheet_version != _version_str(record.get(COL_ROW_VERSION)):
+            hapus_file_dropbox(link)
+            refresh_rows_after_write(SHEET_PEMBAYARAN, ws, headers, [row_gsheet - 2])
+            return False, ROW_CONFLICT_MSG
+
+        col_bukti = headers.index(COL_BUKTI_BAYAR) + 1
+        old_bukti = record.get(COL_BUKTI_BAYAR, "")
+        cell_bukti = gspread.utils.rowcol_to_a1(row_gsheet, col_bukti)
+
+        ts = now_ts_str()
+        actor_final = safe_str(actor, "-").strip() or "-"
+
+        updates = [{"range": cell_bukti, "values": [[link]]}]
+
+        col_ts = headers.index(COL_TS_UPDATE) + 1
+        changes = [(COL_BUKTI_BAYAR, _fmt_payment_val_for_log(COL_BUKTI_BAYAR, old_bukti),
+                    _fmt_payment_val_for_log(COL_BUKTI_BAYAR, link))]
+        new_log = payment_change_summary(ts, actor_final, changes)
+        cell_ts = gspread.utils.rowcol_to_a1(row_gsheet, col_ts)
+        updates.append({"range": cell_ts, "values": [[new_log]]})
+
+        col_by = headers.index(COL_UPDATED_BY) + 1
+        cell_by = gspread.utils.rowcol_to_a1(row_gsheet, col_by)
+        updates.append({"range": cell_by, "values": [[actor_final]]})
+
+        version = new_row_version()
+        updates += row_version_update(headers, row_gsheet - 2, version)
+        try:
+            ws.batch_update(updates, value_input_option="USER_ENTERED")
+        except Exception:
+            hapus_file_dropbox(link)
+            raise
+        append_payment_events(payment_event_rows(
+            row_id, ts, actor_final, changes, old_log=record.get(COL_TS_UPDATE, "")))
+
+        # Patch RAM di tempat (tabel pembayaran tidak perlu download ulang)
+        if not patch_ram_row("payment", COL_ROW_ID, row_id, {
+                COL_BUKTI_BAYAR: link, COL_TS_UPDATE: new_log,
+                COL_UPDATED_BY: actor_final, COL_ROW_VERSION: version}):
+            update_ram_data("payment", None)
+        # maybe_auto_format_sheet(ws)
+        return True, "Bukti pembayaran berhasil di-update!"
+    except Exception as e:
+        return False, f"Error: {e}"
+
+
+# =========================================================
+# [BARU] KOMPAKSI DTYPE FRAME DI RAM
+# =========================================================
+# Kolom yang tidak disebut: teks -> string (pyarrow), sisanya dibiarkan.
+# Tipe (uang/status) diturunkan dari schema registry; yang ditulis di sini hanya hint
+# category. Category hanya untuk kolom berkardinalitas rendah (dicek otomatis di compact_frame).
+_RAM_KIND_MAP = {sr.KIND_MONEY: sn.KIND_MONEY, sr.KIND_BOOL: sn.KIND_BOOL}
+
+RAM_COMPACT_SCHEMAS = {
+    "laporan_harian": sr.storage_schema("laporan_harian", _RAM_KIND_MAP, {
+        COL_NAMA: sn.KIND_CATEGORY,
+        COL_TEMPAT: sn.KIND_CATEGORY,
+        COL_INTEREST: sn.KIND_CATEGORY,
+        COL_KATEGORI_AKTIVITAS: sn.KIND_CATEGORY,
+        COL_INTEREST_BUCKET: sn.KIND_CATEGORY,
+    }),
+    "pembayaran_dp": sr.storage_schema(SHEET_PEMBAYARAN, _RAM_KIND_MAP, {
+        COL_JENIS_BAYAR: sn.KIND_CATEGORY,
+    }),
+    "closing_deal": sr.storage_schema(SHEET_CLOSING_DEAL, _RAM_KIND_MAP, {
+        COL_MARKETING: sn.KIND_CATEGORY,
+        COL_BIDANG: sn.KIND_CATEGORY,
+    }),
+    "checklist": sr.storage_schema((SHEET_TARGET_TEAM, SHEET_TARGET_INDIVIDU), _RAM_KIND_MAP),
+    "presensi": sr.storage_schema(SHEET_PRESENSI, _RAM_KIND_MAP, {
+        # Timestamp presensi tidak dipakai sebagai kunci baris, aman disimpan datetime
+        "Timestamp": sn.KIND_DATETIME,
+        "Nama": sn.KIND_CATEGORY,
+        "Tipe Absen": sn.KIND_CATEGORY,
+        "Hari": sn.KIND_CATEGORY,
+        "Bulan": sn.KIND_CATEGORY,
+    }),
+}
+
+
+@st.cache_resource(show_spinner=False)
+def _get_compaction_stats():
+    # label tabel -> {"rows", "before", "after"} (hasil kompaksi terakhir, semua sesi)
+    return {"lock": threading.Lock(), "tables": {}}
+
+
+def compact_ram_frame(table, df, label=None):
+    """Kompaksi frame sebelum disimpan di RAM/cache + catat footprint sebelum/sesudah."""
+    if df is None or df.empty:
+        return df
+    try:
+        before = frame_nbytes(df)
+        out = sn.compact_frame(df, RAM_COMPACT_SCHEMAS.get(table, {}), money_parser=parse_rupiah_to_int)
+        after = frame_nbytes(out)
+    except Exception as e:
+        print(f"Compact Error ({table}): {e}")
+        return df
+
+    stats = _get_compaction_stats()
+    with stats["lock"]:
+        stats["tables"][label or table] = {"rows": int(len(out)), "before": before, "after": after}
+    return out
+
+
+def compaction_report():
+    stats = _get_compaction_stats()
+    with stats["lock"]:
+        items = list(stats["tables"].items())
+    rows = []
+    for label, v in sorted(items):
+        hemat = (1 - v["after"] / v["before"]) * 100 if v["before"] else 0.0
+        rows.append({
+            "Tabel": label,
+            "Baris": v["rows"],
+            "Sebelum (KB)": round(v["before"] / 1024, 1),
+            "Sesudah (KB)": round(v["after"] / 1024, 1),
+            "Hemat (%)": round(hemat, 1),
+        })
+    return pd.DataFrame(rows)
+
+
+# =========================================================
+# [BARU] SNAPSHOT ANALITIK (PARQUET KOLUMNAR)
+# =========================================================
+# Tipe kolom per tabel diturunkan dari schema registry (tanggal & timestamp -> datetime);
+# di sini hanya hint category + kolom turunan. Kolom yang tidak disebut disimpan sebagai teks.
+_SNAPSHOT_KIND_MAP = {
+    sr.KIND_MONEY: sn.KIND_MONEY, sr.KIND_INT: sn.KIND_INT, sr.KIND_BOOL: sn.KIND_BOOL,
+    sr.KIND_DATE: sn.KIND_DATETIME, sr.KIND_TIMESTAMP: sn.KIND_DATETIME,
+}
+
+SNAPSHOT_SCHEMAS = {
+    "laporan_harian": sr.storage_schema("laporan_harian", _SNAPSHOT_KIND_MAP, {
+        COL_NAMA: sn.KIND_CATEGORY,
+        COL_INTEREST: sn.KIND_CATEGORY,
+        COL_TANGGAL_DATE: sn.KIND_DATETIME,
+        COL_KATEGORI_AKTIVITAS: sn.KIND_CATEGORY,
+        COL_INTEREST_BUCKET: sn.KIND_CATEGORY,
+    }),
+    "pembayaran_dp": sr.storage_schema(SHEET_PEMBAYARAN, _SNAPSHOT_KIND_MAP, {
+        COL_GROUP: sn.KIND_CATEGORY,
+        COL_MARKETING: sn.KIND_CATEGORY,
+        COL_JENIS_BAYAR: sn.KIND_CATEGORY,
+    }),
+    "closing_deal": sr.storage_schema(SHEET_CLOSING_DEAL, _SNAPSHOT_KIND_MAP, {
+        COL_GROUP: sn.KIND_CATEGORY,
+        COL_MARKETING: sn.KIND_CATEGORY,
+        COL_BIDANG: sn.KIND_CATEGORY,
+    }),
+    "presensi": sr.storage_schema(SHEET_PRESENSI, _SNAPSHOT_KIND_MAP, {
+        "Nama": sn.KIND_CATEGORY,
+        "Tipe Absen": sn.KIND_CATEGORY,
+        "Hari": sn.KIND_CATEGORY,
+        "Bulan": sn.KIND_CATEGORY,
+    }),
+    # Audit log tidak ada di registry (sheet milik audit_service): tipe ditulis langsung
+    "audit_log": {
+        "Waktu & Tanggal": sn.KIND_DATETIME,
+        "Pelaku (User)": sn.KIND_CATEGORY,
+        "Jabatan / Role": sn.KIND_CATEGORY,
+        "Fitur yg Digunakan": sn.KIND_CATEGORY,
+        "Nama Data / Sheet": sn.KIND_CATEGORY,
+        "Aksi Dilakukan": sn.KIND_CATEGORY,
+    },
+}
+
+
+def load_presensi_df():
+    ws = init_presensi_db()
+    if not ws:
+        return pd.DataFrame(columns=PRESENSI_COLUMNS)
+    try:
+        df = pd.DataFrame(ws.get_all_records())
+        for c in PRESENSI_COLUMNS:
+            if c not in df.columns:
+                df[c] = ""
+        return compact_ram_frame("presensi", df)
+    except Exception:
+        return pd.DataFrame(columns=PRESENSI_COLUMNS)
+
+
+def export_analytics_snapshot():
+    """
+    Tulis snapshot Parquet (bertipe) untuk laporan, pembayaran, closing, presensi & audit log.
+    Data diambil dari RAM bila sudah ada, sehingga dashboard/analitik tidak perlu
+    membaca ulang Google Sheets setiap kali dibuka.
+    """
+    if not sn.HAS_PYARROW:
+        return False, "pyarrow belum terpasang. Tambahkan 'pyarrow' di requirements."
+    if not KONEKSI_GSHEET_BERHASIL:
+        return False, "Koneksi GSheet belum aktif."
+
+    try:
+        from audit_service import load_audit_log
+
+        tables = {
+            "laporan_harian": load_all_reports(get_daftar_staf_terbaru()),
+            "pembayaran_dp": load_pembayaran_dp(),
+            "closing_deal": load_closing_deal(),
+            "presensi": load_presensi_df(),
+            "audit_log": load_audit_log(spreadsheet),
+        }
+        hasil = sn.write_snapshot(
+            {name: (df, SNAPSHOT_SCHEMAS[name]) for name, df in tables.items()},
+            money_parser=parse_rupiah_to_int,
+        )
+        if not hasil:
+            return False, "Snapshot gagal ditulis (cek log server)."
+
+        ringkas = ", ".join(f"{k}: {v} baris" for k, v in hasil.items())
+        return True, f"Snapshot tersimpan ({ringkas})."
+    except Exception as e:
+        return False, f"Error snapshot: {e}"
+
+
+# =========================================================
+# HEADER (LOGO LEFT/RIGHT + HOLDING BACKGROUND)
+# =========================================================
+ASSET_DIR = Path(__file__).parent / "assets"
+LOGO_LEFT = ASSET_DIR / "log EO.png"
+LOGO_RIGHT = ASSET_DIR / "logo traine.png"
+
+# Logo holding tetap dipakai, tapi jadi logo mandiri di atas judul
+LOGO_HOLDING = ASSET_DIR / "Logo-holding.png"
+
+# Background hero diganti jadi sportarium
+HERO_BG = ASSET_DIR / "sportarium.jpg"
+
+
+# [BARU] Ukuran target aset = 2x ukuran tampil di CSS (tetap tajam di layar retina).
+# (path, max_w, max_h, format, quality)
+HEADER_ASSET_SPECS = {
+    "left": (LOGO_LEFT, 440, 320, "WEBP", 85),      # .sx-logo-card img: maks 220x160
+    "right": (LOGO_RIGHT, 440, 320, "WEBP", 85),
+    "holding": (LOGO_HOLDING, 480, 200, "WEBP", 85),  # tinggi tampil 100px
+    "hero": (HERO_BG, 1400, 1050, "JPEG", 70),      # background hero + watermark
+}
+
+
+@st.cache_resource(show_spinner=False)
+def get_header_assets():
+    """
+    [BARU] Resize + kompres aset header SEKALI per proses (bukan tiap rerun).
+    Kalau static serving aktif, aset ditulis ke static/_cache dan HTML cukup memuat URL;
+    kalau tidak, fallback ke data URI dari gambar yang sudah dikecilkan.
+    Return: {"left": info|None, ...} dengan info = {"src", "bytes", "original_bytes"}.
+    """
+    use_static = static_serving_enabled()
+    assets = {}
+    for key, (path, max_w, max_h, fmt, quality) in HEADER_ASSET_SPECS.items():
+        try:
+            assets[key] = ap.publish_asset(path, max_w, max_h, fmt=fmt, quality=quality,
+                                           use_static=use_static)
+        except Exception as e:
+            print(f"Header Asset Error ({key}): {e}")
+            assets[key] = None
+    return assets
+
+
+def _asset_src(key: str) -> str:
+    info = get_header_assets().get(key)
+    return info["src"] if info else ""
+
+
+@st.cache_resource(show_spinner=False)
+def get_header_static_html():
+    """
+    [BARU] Bagian header yang tidak berubah antar rerun (logo, hero, judul).
+    Return (top_logo_html, hero_open_html, hero_close_html); render_header tinggal
+    menyisipkan jam & status koneksi di antaranya.
+    """
+    left_src = _asset_src("left")
+    right_src = _asset_src("right")
+    holding_src = _asset_src("holding")  # Logo UMB
+    bg_src = _asset_src("hero")
+
+    # Style background hero (Sportarium)
+    hero_style = (
+        f"--hero-bg: url('{bg_src}'); "
+        f"--hero-bg-pos: 50% 72%; "
+        f"--hero-bg-size: 140%;"
+    ) if bg_src else "--hero-bg: none;"
+
+    # Logo Kiri & Kanan (Mentari Sejuk)
+    left_html = f"<img src='{left_src}' alt='Logo EO' />" if left_src else ""
+    right_html = f"<img src='{right_src}' alt='Logo Training' />" if right_src else ""
+
+    # Logo Holding di Paling Atas (div terpisah di luar card utama)
+    top_logo_html = ""
+    if holding_src:
+        top_logo_html = f"""
+        <div style="display: flex; justify-content: center; margin-bottom: 25px; padding-top: 10px;">
+            <img src='{holding_src}'
+                 alt='Holding Logo'
+                 style="height: 100px; width: auto; object-fit: contain; filter: drop-shadow(0 5px 15px rgba(0,0,0,0.5));" />
+        </div>
+        """
+
+    hero_open = f"""
+<div class="sx-hero" style="{hero_style}">
+<div class="sx-hero-grid">
+<div class="sx-logo-card">{left_html}</div>
+<div class="sx-hero-center">
+<div class="sx-title">🚀 {APP_TITLE}</div>
+<div class="sx-subrow">"""
+
+    hero_close = f"""
+</div>
+</div>
+<div class="sx-logo-card">{right_html}</div>
+</div>
+</div>
+    """
+    return top_logo_html, hero_open, hero_close
+
+
+@st.cache_resource(show_spinner=False)
+def get_watermark_html():
+    src = _asset_src("hero")
+    if not src:
+        return ""
+    # Render HTML dengan class CSS yang sudah ada di inject_global_css
+    return f"""
+    <div class="sx-section-watermark">
+        <img src="{src}" alt="Sportarium Watermark" loading="lazy" />
+    </div>
+    """
+
+
+# =========================================================
+# [MIGRASI] CORE DATABASE & AUDIT PAYMENTS
+# =========================================================
+def apply_audit_payments_changes(df_before: pd.DataFrame, df_after: pd.DataFrame, actor: str):
+    """
+    Isi ringkasan perubahan terakhir & Updated By untuk baris yang berubah saja.
+    Riwayat lengkap ditulis save_pembayaran_dp ke Payment_Event_Log.
+    """
+    actor = safe_str(actor, "-").strip() or "-"
+    before = df_before.copy() if df_before is not None else pd.DataFrame()
+    after = df_after.copy()
+    for c in [COL_TS_UPDATE, COL_UPDATED_BY]:
+        if c not in after.columns: after[c] = ""
+    
+    if before.empty:
+        ts = now_ts_str()
+        for i in range(len(after)):
+            after.at[i, COL_TS_UPDATE] = payment_change_summary(ts, actor, [])
+            after.at[i, COL_UPDATED_BY] = actor
+        return after
+
+    before_idx = before.set_index(COL_TS_BAYAR, drop=False)
+    after_idx = after.set_index(COL_TS_BAYAR, drop=False)
+    ts = now_ts_str()
+
+    for key, row in after_idx.iterrows():
+        if key not in before_idx.index: continue
+        prev = before_idx.loc[key]
+        if isinstance(prev, pd.DataFrame): prev = prev.iloc[0]
+        changes = payment_field_changes(prev, row)
+        if changes:
+            after_idx.at[key, COL_TS_UPDATE] = payment_change_summary(ts, actor, changes)
+            after_idx.at[key, COL_UPDATED_BY] = actor
+    return after_idx.reset_index(drop=True)
+
+
+def render_header():
+    ts_now = datetime.now(tz=TZ_JKT).strftime("%d %B %Y %H:%M:%S")
+
+    g_on = bool(KONEKSI_GSHEET_BERHASIL)
+    d_on = bool(KONEKSI_DROPBOX_BERHASIL)
+
+    def pill(label: str, on: bool):
+        cls = "sx-pill on" if on else "sx-pill off"
+        return f"<span class='{cls}'><span class='sx-dot'></span>{label}</span>"
+
+    # Logo & hero sudah dirakit sekali (cache); tiap rerun cuma jam + status koneksi
+    top_logo_html, hero_open, hero_close = get_header_static_html()
+
+    # Susunan HTML: Logo Atas -> Baru kemudian Hero Card
+    html = f"""
+{top_logo_html}
+{hero_open}
+<span>Realtime: {ts_now}</span>
+{pill('GSheet: ON' if g_on else 'GSheet: OFF', g_on)}
+{pill('Dropbox: ON' if d_on else 'Dropbox: OFF', d_on)}
+{hero_close}"""
+
+    st.markdown(html, unsafe_allow_html=True)
+
+
+def render_section_watermark():
+    """
+    Menampilkan watermark Sportarium di bagian bawah halaman/tab.
+    Menggunakan aset HERO_BG (sportarium.jpg) yang sudah dikompres di get_header_assets().
+    """
+    html = get_watermark_html()
+    if not html:
+        return
+    st.markdown(html, unsafe_allow_html=True)
+
+
+def render_home_mobile():
+    st.markdown("## 🧭 Menu Utama")
+    st.caption("Pilih fitur seperti shortcut ala aplikasi mobile.")
+
+    features = [
+        {"key": "report",  "icon": "📝", "title": "Laporan Harian",
+            "sub": "Input aktivitas + reminder"},
+        {"key": "kpi",     "icon": "🎯", "title": "Target & KPI",
+            "sub": "Checklist team & individu"},
+        {"key": "closing", "icon": "🤝", "title": "Closing Deal",
+            "sub": "Catat deal + export"},
+        {"key": "payment", "icon": "💳", "title": "Pembayaran",
+            "sub": "DP/Termin/Pelunasan + jatuh tempo"},
+        {"key": "log",     "icon": "📜", "title": "Global Audit Log",
+            "sub": "Riwayat perubahan data (Super Admin)"},
+        {"key": "admin",   "icon": "🔐", "title": "Akses Admin",
+            "sub": "Dashboard + kontrol (butuh login)"},
+    ]
+
+    cols = st.columns(2, gap="medium")
+    for i, f in enumerate(features):
+        with cols[i % 2]:
+            with st.container(border=True):
+                st.markdown(f"### {f['icon']} {f['title']}")
+                st.caption(f["sub"])
+                if st.button("Buka", use_container_width=True, key=f"home_open_{f['key']}"):
+                    set_nav(f["key"])
+
+
+# =========================================================
+# ROUTER NAV (untuk mobile ala "Facebook shortcut")
+# =========================================================
+HOME_NAV = "🏠 Beranda"
+
+# Update: Menambahkan entry 'presensi' ke dalam Mapping
+NAV_MAP = {
+    "home": HOME_NAV,
+    "presensi": "📅 Presensi",
+    "report": "📝 Laporan Harian",
+    "kpi": "🎯 Target & KPI",
+    "closing": "🤝 Closing Deal",
+    "payment": "💳 Pembayaran",
+    "log": "📜 Global Audit Log",
+    "admin": "📊 Dashboard Admin",
+}
+
+
+def get_query_nav():
+    try:
+        # streamlit baru
+        if hasattr(st, "query_params"):
+            v = st.query_params.get("nav", None)
+            if isinstance(v, (list, tuple)):
+                return v[0] if v else None
+            return v
+        # streamlit lama
+        qp = st.experimental_get_query_params()
+        return (qp.get("nav", [None])[0])
+    except Exception:
+        return None
+
+
+def set_nav(nav_key: str):
+    nav_key = nav_key if nav_key in NAV_MAP else "home"
+    try:
+        if hasattr(st, "query_params"):
+            st.query_params["nav"] = [nav_key]
+        else:
+            st.experimental_set_query_params(nav=nav_key)
+    except Exception:
+        pass
+    st.session_state["menu_nav"] = NAV_MAP[nav_key]
+    st.rerun()
+
+
+# =========================================================
+# [BARU] DIAGNOSTIK PERFORMA (KHUSUS ADMIN)
+# =========================================================
+def render_diagnostics_panel():
+    with st.expander("🩺 Diagnostik", expanded=False):
+        st.caption("Waktu import library berat (sekali per proses, saat pertama dipakai).")
+        rep = import_report()
+        if rep:
+            st.dataframe(
+                pd.DataFrame([{"Modul": m, "Import (ms)": round(t * 1000, 1)} for m, t in rep]),
+                hide_index=True, use_container_width=True
+            )
+        else:
+            st.caption("Belum ada library berat yang di-load.")
+
+        st.caption("Latency rerun halaman penuh vs fragment (100 run terakhir per bagian).")
+        df_perf = perf_report()
+        if not df_perf.empty:
+            st.dataframe(df_perf, hide_index=True, use_container_width=True)
+        else:
+            st.caption("Belum ada data latency.")
+
+        ram = report_cache_stats()
+        st.caption(
+            f"RAM laporan sesi ini: {ram['frames']} staf ({ram['pinned']} di-pin halaman ini), "
+            f"{ram['bytes'] / 1024 / 1024:.2f} MB dari budget {ram['budget_bytes'] / 1024 / 1024:.0f} MB "
+            f"(LRU: {', '.join(ram['lru']) or '-'})."
+        )
+
+        st.caption("Footprint frame di RAM sebelum/sesudah kompaksi dtype (load terakhir per tabel).")
+        df_compact = compaction_report()
+        if not df_compact.empty:
+            st.dataframe(df_compact, hide_index=True, use_container_width=True)
+        else:
+            st.caption("Belum ada tabel yang di-load.")
+
+        css = get_global_css_bundle()
+        mode_css = "static (di-cache browser)" if css["href"] else "inline"
+        if _html_js_supported():
+            mode_css += ", dikirim sekali per sesi"
+        st.caption(
+            f"CSS global: {css['original_bytes'] / 1024:.1f} KB → {css['bytes'] / 1024:.1f} KB "
+            f"(minify, {mode_css}, hash {css['hash']})."
+        )
+
+
+@ui_fragment
+def render_quick_stats():
+    try:
+        n_overdue, n_due_soon = payment_alert_counts(days_due_soon=3)
+        st.markdown("<div class='sx-section-title'>Quick Stats</div>",
+                    unsafe_allow_html=True)
+        st.metric("Overdue Payment", n_overdue)
+        st.metric("Due ≤ 3 hari", n_due_soon)
+    except Exception:
+        pass
@@ -0,0 +1,154 @@
+import io
+import re
+import base64
+import hashlib
+from pathlib import Path
+
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+STATIC_DIR = Path(__file__).parent / "static"
+CACHE_SUBDIR = "_cache"
+# URL publik Streamlit untuk folder ./static (butuh server.enableStaticServing = true)
+STATIC_URL_PREFIX = "app/static"
+
+_MIME = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".css": "text/css",
+}
+
+
+def _mime_of(suffix):
+    return _MIME.get(suffix.lower(), "application/octet-stream")
+
+
+def _write_cache_file(fname, data):
+    """Tulis ke static/_cache lalu return URL static-nya."""
+    out_dir = STATIC_DIR / CACHE_SUBDIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / fname
+    # Nama file memuat hash isi, jadi file yang sudah ada pasti identik
+    if not out_path.exists():
+        tmp_path = out_dir / f".{fname}.tmp"
+        tmp_path.write_bytes(data)
+        tmp_path.replace(out_path)
+    return f"{STATIC_URL_PREFIX}/{CACHE_SUBDIR}/{fname}"
+
+
+def optimize_image(path, max_w, max_h, fmt=None, quality=80):
+    """
+    Kecilkan gambar ke kotak max_w x max_h (rasio dijaga) lalu kompres.
+    Return (bytes, ext). Kalau Pillow tidak ada / gagal, kembalikan file asli apa adanya.
+    """
+    path = Path(path)
+    raw = path.read_bytes()
+    if not HAS_PIL:
+        return raw, path.suffix.lower()
+
+    try:
+        with Image.open(io.BytesIO(raw)) as im:
+            im.load()
+            has_alpha = im.mode in ("RGBA", "LA", "P")
+            fmt = (fmt or ("WEBP" if has_alpha else "JPEG")).upper()
+
+            im.thumbnail((max_w, max_h), Image.LANCZOS)
+            buf = io.BytesIO()
+            if fmt == "JPEG":
+                im.convert("RGB").save(buf, "JPEG", quality=quality, optimize=True, progressive=True)
+                ext = ".jpg"
+            elif fmt == "PNG":
+                im.save(buf, "PNG", optimize=True)
+                ext = ".png"
+            else:
+                im.save(buf, "WEBP", quality=quality, method=6)
+                ext = ".webp"
+            data = buf.getvalue()
+    except Exception as e:
+        print(f"Asset Optimize Error ({path.name}): {e}")
+        return raw, path.suffix.lower()
+
+    # Jangan sampai hasil "optimasi" malah lebih besar dari aslinya
+    if len(data) >= len(raw):
+        return raw, path.suffix.lower()
+    return data, ext
+
+
+def to_data_uri(data, ext):
+    return f"data:{_mime_of(ext)};base64,{base64.b64encode(data).decode('utf-8')}"
+
+
+def publish_asset(path, max_w, max_h, fmt=None, quality=80, use_static=False):
+    """
+    Siapkan satu aset gambar untuk dipakai di HTML.
+    - use_static=True : tulis ke static/_cache/<nama>-<hash>.<ext> lalu return URL static.
+      Browser cukup download sekali (di-cache), HTML tiap rerun hanya berisi URL pendek.
+    - use_static=False: return data URI dari gambar yang sudah dikecilkan.
+    Return dict {"src", "bytes", "original_bytes"} atau None kalau file tidak ada.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    data, ext = optimize_image(path, max_w, max_h, fmt=fmt, quality=quality)
+    info = {"src": "", "bytes": len(data), "original_bytes": path.stat().st_size}
+
+    if use_static:
+        try:
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            stem = "".join(ch if ch.isalnum() else "-" for ch in path.stem).strip("-").lower()
+            info["src"] = _write_cache_file(f"{stem}-{digest}{ext}", data)
+            return info
+        except Exception as e:
+            print(f"Asset Publish Error ({path.name}): {e}")
+
+    info["src"] = to_data_uri(data, ext)
+    return info
+
+
+# =========================================================
+# CSS
+# =========================================================
+_CSS_STRING = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+
+
+def _minify_css_chunk(text):
+    text = _CSS_COMMENT.sub("", text)
+    text = re.sub(r"\s+", " ", text)
+    # Spasi di sekitar tanda baca aman dibuang. Spasi SEBELUM ":" sengaja dipertahankan
+    # karena "a :hover" dan "a:hover" artinya beda di selector.
+    text = re.sub(r"\s*([{};,>])\s*", r"\1", text)
+    text = re.sub(r":\s+", ":", text)
+    return text.replace(";}", "}")
+
+
+def minify_css(css):
+    """Minify sederhana: buang komentar & whitespace, isi string ("..." / '...') tidak disentuh."""
+    parts = _CSS_STRING.split(css)
+    # Index ganjil = literal string hasil capture group
+    out = [p if i % 2 else _minify_css_chunk(p) for i, p in enumerate(parts)]
+    return "".join(out).strip()
+
+
+def publish_text_asset(name, text, ext, use_static=False):
+    """
+    Versi teks dari publish_asset (misal stylesheet).
+    Return dict {"src", "hash", "bytes"}; "src" kosong kalau tidak disajikan lewat static.
+    """
+    data = text.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    info = {"src": "", "hash": digest, "bytes": len(data)}
+    if not use_static:
+        return info
+
+    try:
+        info["src"] = _write_cache_file(f"{name}-{digest}{ext}", data)
+    except Exception as e:
+        print(f"Asset Publish Error ({name}{ext}): {e}")
+    return info
@@ -1,8 +1,10 @@
 import pandas as pd
 from datetime import datetime
 from zoneinfo import ZoneInfo
-import gspread
 import json
+from lazy_loader import LazyModule
+
+gspread = LazyModule("gspread")
 
 SHEET_AUDIT_NAME = "Global_Audit_Log"
 TZ_JKT = ZoneInfo("Asia/Jakarta")
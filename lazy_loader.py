@@ -0,0 +1,86 @@
+import sys
+import time
+import threading
+import importlib
+import importlib.util
+
+# Catatan waktu import pertama per modul (detik). Bertahan selama proses hidup.
+IMPORT_TIMES = {}
+_LOCK = threading.Lock()
+
+
+def is_available(name):
+    """Cek apakah modul terpasang TANPA meng-import-nya."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def timed_import(name):
+    mod = sys.modules.get(name)
+    if mod is not None:
+        return mod
+    with _LOCK:
+        mod = sys.modules.get(name)
+        if mod is not None:
+            return mod
+        t0 = time.perf_counter()
+        mod = importlib.import_module(name)
+        IMPORT_TIMES[name] = time.perf_counter() - t0
+        return mod
+
+
+class LazyModule:
+    """
+    Proxy modul: import baru terjadi saat atribut pertama kali diakses,
+    misal `px.bar(...)` di halaman yang memang butuh plotly.
+    """
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_mod"] = None
+
+    def _load(self):
+        mod = self.__dict__["_mod"]
+        if mod is None:
+            mod = timed_import(self.__dict__["_name"])
+            self.__dict__["_mod"] = mod
+        return mod
+
+    @property
+    def is_loaded(self):
+        return self.__dict__["_mod"] is not None or self.__dict__["_name"] in sys.modules
+
+    def __getattr__(self, item):
+        return getattr(self._load(), item)
+
+    def __repr__(self):
+        state = "loaded" if self.is_loaded else "lazy"
+        return f"<LazyModule {self.__dict__['_name']} ({state})>"
+
+
+class LazyAttr:
+    """Pengganti `from modul import Nama` yang tetap lazy (bisa dipanggil / diakses atributnya)."""
+
+    def __init__(self, module_name, attr):
+        self._module_name = module_name
+        self._attr = attr
+
+    def _resolve(self):
+        return getattr(timed_import(self._module_name), self._attr)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, item):
+        if item.startswith("_"):
+            raise AttributeError(item)
+        return getattr(self._resolve(), item)
+
+
+def import_report():
+    """List (modul, detik) terurut dari yang paling lambat."""
+    with _LOCK:
+        items = list(IMPORT_TIMES.items())
+    return sorted(items, key=lambda x: x[1], reverse=True)
@@ -0,0 +1,188 @@
+import time
+import queue
+import smtplib
+import threading
+import itertools
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+STATUS_QUEUED = "queued"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+
+class EmailDispatcher:
+    """
+    Pengirim email di background thread.
+    - Satu koneksi SMTP_SSL yang sudah login dipakai ulang (warm), di-cek NOOP kalau lama
+      menganggur, dan dibuka ulang otomatis kalau terputus.
+    - submit() langsung return job id; UI tidak ikut menunggu handshake SMTP.
+    - Email yang antre bersamaan dikirim dalam satu batch lewat koneksi yang sama.
+    """
+
+    def __init__(self, server, port, sender, password, max_batch=20, max_retries=2,
+                 idle_close_after=240, noop_after=30, connect_timeout=15, max_jobs=256):
+        self.server = server
+        self.port = int(port)
+        self.sender = sender
+        self.password = password
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.idle_close_after = idle_close_after
+        self.noop_after = noop_after
+        self.connect_timeout = connect_timeout
+        self.max_jobs = max_jobs
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._jobs = {}          # job_id -> {"status", "to", "error", "ts"}
+        self._ids = itertools.count(1)
+        self._conn = None
+        self._last_used = 0.0
+        self._last_warm = 0.0
+
+        self._worker = threading.Thread(target=self._loop, name="mail-dispatcher", daemon=True)
+        self._worker.start()
+
+    # --------------------------------------------------
+    # API
+    # --------------------------------------------------
+    def submit(self, to, subject, html_body):
+        msg = MIMEMultipart()
+        msg['From'] = self.sender
+        msg['To'] = to
+        msg['Subject'] = subject
+        msg.attach(MIMEText(html_body, 'html'))
+
+        job_id = next(self._ids)
+        with self._lock:
+            self._jobs[job_id] = {"status": STATUS_QUEUED, "to": to, "error": "", "ts": time.time()}
+            self._trim_jobs()
+        self._queue.put((job_id, to, msg.as_string()))
+        return job_id
+
+    def status(self, job_id):
+        """Return (status, error). Job yang tidak dikenal dianggap gagal."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return STATUS_FAILED, "Job email tidak ditemukan."
+            return job["status"], job["error"]
+
+    def wait(self, job_id, timeout):
+        """Tunggu sebentar sampai job selesai (dipakai kalau pemanggil butuh hasil final)."""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            status, error = self.status(job_id)
+            if status != STATUS_QUEUED:
+                return status, error
+            time.sleep(0.1)
+        return self.status(job_id)
+
+    def warm_up(self):
+        """Minta worker membuka + login koneksi SMTP lebih awal (misal saat form login tampil)."""
+        now = time.time()
+        if self._conn is None and self._queue.empty() and now - self._last_warm > 60:
+            self._last_warm = now
+            self._queue.put((None, None, None))
+
+    def pending_count(self):
+        return self._queue.qsize()
+
+    # --------------------------------------------------
+    # Koneksi
+    # --------------------------------------------------
+    def _close(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.quit()
+            except Exception:
+                pass
+
+    def _connection(self):
+        if self._conn is not None and time.time() - self._last_used > self.noop_after:
+            # Server (Gmail) suka memutus koneksi menganggur; cek dulu sebelum dipakai
+            try:
+                if self._conn.noop()[0] != 250:
+                    self._close()
+            except Exception:
+                self._close()
+
+        if self._conn is None:
+            conn = smtplib.SMTP_SSL(self.server, self.port, timeout=self.connect_timeout)
+            conn.login(self.sender, self.password)
+            self._conn = conn
+            self._last_used = time.time()
+        return self._conn
+
+    # --------------------------------------------------
+    # Worker
+    # --------------------------------------------------
+    def _set_status(self, job_id, status, error=""):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                job["status"] = status
+                job["error"] = error
+
+    def _trim_jobs(self):
+        if len(self._jobs) <= self.max_jobs:
+            return
+        selesai = [k for k, v in self._jobs.items() if v["status"] != STATUS_QUEUED]
+        for k in selesai[: len(self._jobs) - self.max_jobs]:
+            self._jobs.pop(k, None)
+
+    def _send_one(self, job_id, to, raw):
+        last_error = ""
+        for _ in range(self.max_retries + 1):
+            try:
+                self._connection().sendmail(self.sender, to, raw)
+                self._last_used = time.time()
+                self._set_status(job_id, STATUS_SENT)
+                return
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError) as e:
+                # Koneksi basi / putus: buka ulang lalu coba lagi
+                last_error = str(e)
+                self._close()
+            except smtplib.SMTPException as e:
+                # Ditolak server (alamat salah, auth gagal, dll): retry tidak akan membantu
+                last_error = str(e)
+                self._close()
+                break
+            except OSError as e:
+                # Masalah jaringan (timeout, reset): sama seperti koneksi putus
+                last_error = str(e)
+                self._close()
+            except Exception as e:
+                last_error = str(e)
+                self._close()
+                break
+        print(f"Email Error ({to}): {last_error}")
+        self._set_status(job_id, STATUS_FAILED, last_error)
+
+    def _loop(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.idle_close_after)
+            except queue.Empty:
+                # Lama tidak ada email: lepas koneksi, nanti dibuka lagi saat dibutuhkan
+                self._close()
+                continue
+
+            batch = [first]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for job_id, to, raw in batch:
+                if job_id is None:
+                    try:
+                        self._connection()
+                    except Exception as e:
+                        print(f"Email Warm-up Error: {e}")
+                        self._close()
+                    continue
+                self._send_one(job_id, to, raw)
@@ -0,0 +1,250 @@
+import functools
+from collections import namedtuple
+
+import pandas as pd
+import streamlit as st
+
+# Jenis kolom yang dikenali registry
+KIND_TEXT = "text"
+KIND_LONG_TEXT = "long_text"   # teks panjang: di Sheet dibungkus (wrap)
+KIND_LINK = "link"
+KIND_MONEY = "money"           # disimpan int, ditampilkan "Rp 2.000.000"
+KIND_INT = "int"
+KIND_DATE = "date"             # tanggal tanpa jam (date picker)
+KIND_TIMESTAMP = "timestamp"   # waktu input sistem, tidak diedit manual
+KIND_BOOL = "bool"
+KIND_HIDDEN = "hidden"         # kolom sistem (versi/ID baris): tidak tampil di editor & Sheet
+
+_TRUE_STRINGS = {"TRUE", "1", "YA", "YES", "Y"}
+_CURRENCY_FORMAT = {"type": "CURRENCY", "pattern": '"Rp" #,##0'}
+
+# Default per jenis: lebar kolom Sheet (px), perataan, wrap
+_KIND_DEFAULTS = {
+    KIND_TEXT: {"width": 100, "align": None, "wrap": False},
+    KIND_LONG_TEXT: {"width": 300, "align": None, "wrap": True},
+    KIND_LINK: {"width": 300, "align": None, "wrap": True},
+    KIND_MONEY: {"width": 180, "align": "RIGHT", "wrap": False},
+    KIND_INT: {"width": 100, "align": None, "wrap": False},
+    KIND_DATE: {"width": 120, "align": "CENTER", "wrap": False},
+    KIND_TIMESTAMP: {"width": 160, "align": "CENTER", "wrap": False},
+    KIND_BOOL: {"width": 80, "align": "CENTER", "wrap": False},
+    KIND_HIDDEN: {"width": 80, "align": None, "wrap": False},
+}
+
+# width/align None = pakai default jenisnya
+ColumnSpec = namedtuple("ColumnSpec", ["kind", "width", "align", "help"], defaults=(None, None, None))
+
+_DEFAULT_SPEC = ColumnSpec(KIND_TEXT)
+
+# nama sheet/tabel -> {kolom: ColumnSpec}; nama kolom -> ColumnSpec (gabungan semua sheet)
+_SHEETS = {}
+_COLUMNS = {}
+
+# Parser/formatter dari app (parse_rupiah_to_int, dst), diisi lewat configure_codecs()
+_CODECS = {"money_parser": None, "money_formatter": None, "date_parser": None}
+
+
+def configure_codecs(money_parser, money_formatter, date_parser):
+    _CODECS["money_parser"] = money_parser
+    _CODECS["money_formatter"] = money_formatter
+    _CODECS["date_parser"] = date_parser
+
+
+def register_sheet(name, specs):
+    """
+    Daftarkan schema satu sheet. Nama kolom yang sama di sheet lain WAJIB punya spec
+    yang sama, supaya konversi, editor dan format Sheet tidak saling bertentangan.
+    Idempotent: mendaftarkan ulang spec yang sama tidak mengosongkan cache compile/editor.
+    """
+    specs = dict(specs)
+    if _SHEETS.get(name) == specs:
+        return False
+    # Validasi dulu terhadap sheet LAIN, baru ubah registry (tidak ada registrasi setengah jadi)
+    for col, spec in specs.items():
+        for other, other_specs in _SHEETS.items():
+            if other != name and other_specs.get(col, spec) != spec:
+                raise ValueError(f"Schema kolom '{col}' di '{name}' bentrok dengan sheet '{other}'.")
+    _SHEETS[name] = specs
+    _COLUMNS.clear()
+    for sheet_specs in _SHEETS.values():
+        _COLUMNS.update(sheet_specs)
+    _compile.cache_clear()
+    _editor_config_cached.cache_clear()
+    return True
+
+
+def sheet_columns(name):
+    return list(_SHEETS.get(name, {}).keys())
+
+
+def spec_for(col):
+    """Spec kolom; kolom yang tidak terdaftar diperlakukan sebagai teks biasa."""
+    return _COLUMNS.get(col, _DEFAULT_SPEC)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(columns):
+    # columns: tuple nama kolom -> tuple (kolom, spec) yang terdaftar saja.
+    # Kolom di luar registry (kolom turunan, sheet lain) tidak dikonversi sama sekali.
+    return tuple((col, _COLUMNS[col]) for col in columns if col in _COLUMNS)
+
+
+def storage_schema(names, kind_map, extra=None):
+    """
+    Turunkan schema penyimpanan (kompaksi RAM / snapshot) dari sheet terdaftar:
+    {kolom: kind_map[jenis registry]}; jenis yang tidak ada di kind_map tidak disebut.
+    extra = hint di luar tipe kolom (category, kolom turunan) dan menimpa hasil turunan.
+    """
+    if isinstance(names, str):
+        names = (names,)
+    out = {}
+    for name in names:
+        for col, spec in _SHEETS.get(name, {}).items():
+            if spec.kind in kind_map:
+                out[col] = kind_map[spec.kind]
+    out.update(extra or {})
+    return out
+
+
+def is_hidden(col):
+    return spec_for(col).kind == KIND_HIDDEN
+
+
+def columns_of_kind(columns, *kinds):
+    return [col for col, spec in _compile(tuple(columns)) if spec.kind in kinds]
+
+
+# =========================================================
+# KONVERSI NILAI
+# =========================================================
+def parse_money(x):
+    """Nilai uang apa pun ("Rp 2.000.000", "2jt", 2000000.0) -> int; kosong/invalid -> 0."""
+    parser = _CODECS["money_parser"]
+    val = parser(x) if parser else pd.to_numeric(x, errors="coerce")
+    return 0 if val is None or pd.isna(val) else int(val)
+
+
+def _format_money_value(x):
+    parser, formatter = _CODECS["money_parser"], _CODECS["money_formatter"]
+    val = parser(x) if parser else x
+    if val is None:
+        return ""
+    return formatter(val) if formatter else str(val)
+
+
+def _to_date_objects(series):
+    parser = _CODECS["date_parser"]
+    if parser is None:
+        return pd.to_datetime(series, errors="coerce").dt.date
+    return series.map(parser).astype(object)
+
+
+def _to_bool(series):
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    return series.astype(str).str.strip().str.upper().isin(_TRUE_STRINGS)
+
+
+def _to_text(series):
+    if pd.api.types.is_string_dtype(series) and not series.isna().any():
+        return series
+    return series.fillna("").astype(str)
+
+
+def to_typed(df):
+    """
+    Samakan tipe data mentah dari Sheet (get_all_records) sesuai registry:
+    uang -> int, angka -> int, tanggal -> datetime64, status -> bool. Kolom teks dibiarkan.
+    """
+    out = df.copy()
+    for col, spec in _compile(tuple(out.columns)):
+        s = out[col]
+        if spec.kind == KIND_MONEY:
+            out[col] = s.map(parse_money).astype("int64")
+        elif spec.kind == KIND_INT:
+            out[col] = pd.to_numeric(s, errors="coerce").fillna(0).astype("int64")
+        elif spec.kind == KIND_DATE:
+            # datetime64 (bukan object berisi date) agar aman untuk editor & filter
+            out[col] = pd.to_datetime(_to_date_objects(s), errors="coerce")
+        elif spec.kind == KIND_BOOL:
+            out[col] = _to_bool(s)
+    return out
+
+
+def to_display(df):
+    """
+    Siapkan frame untuk st.data_editor, pasangan dari editor_column_config():
+    uang -> teks "Rp 2.000.000", tanggal -> date, status -> bool, teks -> str.
+    Timestamp & angka dibiarkan (kolomnya generic).
+    """
+    out = df.copy()
+    for col, spec in _compile(tuple(out.columns)):
+        s = out[col]
+        if spec.kind == KIND_MONEY:
+            out[col] = s.map(_format_money_value)
+        elif spec.kind == KIND_DATE:
+            out[col] = _to_date_objects(s)
+        elif spec.kind == KIND_BOOL:
+            out[col] = _to_bool(s)
+        elif spec.kind in (KIND_TEXT, KIND_LONG_TEXT, KIND_LINK):
+            out[col] = _to_text(s)
+    return out
+
+
+def from_display(df):
+    """Kebalikan to_display untuk kolom uang: "Rp 2.000.000" -> 2000000 (kosong/invalid -> 0)."""
+    out = df.copy()
+    for col in columns_of_kind(out.columns, KIND_MONEY):
+        out[col] = out[col].map(parse_money)
+    return out
+
+
+# =========================================================
+# EDITOR (st.column_config) & FORMAT GOOGLE SHEETS
+# =========================================================
+def _editor_config(col, spec):
+    if spec.kind == KIND_HIDDEN:
+        # None = kolom disembunyikan oleh st.data_editor (nilainya tetap ikut di frame hasil)
+        return None
+    if spec.kind == KIND_MONEY:
+        return st.column_config.TextColumn(
+            col, help=spec.help or "Format: Rp 2.000.000 (Edit angkanya saja, sistem akan merapikan)",
+            width="medium")
+    if spec.kind == KIND_DATE:
+        return st.column_config.DateColumn(col, format="DD/MM/YYYY", help=spec.help)
+    if spec.kind == KIND_BOOL:
+        return st.column_config.CheckboxColumn(col, help=spec.help)
+    if spec.kind == KIND_LINK:
+        return st.column_config.LinkColumn(col, help=spec.help)
+    if spec.kind in (KIND_TEXT, KIND_LONG_TEXT):
+        return st.column_config.TextColumn(
+            col, help=spec.help, width="large" if spec.kind == KIND_LONG_TEXT else None)
+    # Timestamp & angka: kolom generic (cocok untuk dtype apa pun); timestamp = kunci baris
+    return st.column_config.Column(col, help=spec.help, disabled=spec.kind == KIND_TIMESTAMP)
+
+
+@functools.lru_cache(maxsize=256)
+def _editor_config_cached(columns):
+    return {col: _editor_config(col, spec) for col, spec in _compile(columns)}
+
+
+def editor_column_config(columns):
+    """column_config untuk st.data_editor, di-compile sekali per kombinasi kolom."""
+    # Copy dangkal: pemanggil boleh menambah/menimpa config tanpa merusak cache
+    return dict(_editor_config_cached(tuple(columns)))
+
+
+def sheet_column_format(col):
+    """(lebar px, userEnteredFormat override) untuk auto-format Google Sheet."""
+    spec = spec_for(col)
+    defaults = _KIND_DEFAULTS[spec.kind]
+    width = spec.width or defaults["width"]
+    fmt = {}
+    align = spec.align or defaults["align"]
+    if align:
+        fmt["horizontalAlignment"] = align
+    if defaults["wrap"]:
+        fmt["wrapStrategy"] = "WRAP"
+    if spec.kind == KIND_MONEY:
+        fmt["numberFormat"] = dict(_CURRENCY_FORMAT)
+    return width, fmt
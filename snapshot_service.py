@@ -0,0 +1,234 @@
+import os
+import json
+from pathlib import Path
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (engine Parquet)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+TZ_JKT = ZoneInfo("Asia/Jakarta")
+SNAPSHOT_DIR = Path(__file__).parent / "snapshots"
+MANIFEST_NAME = "_manifest.json"
+
+# Format timestamp yang ditulis aplikasi ke GSheet (now_ts_str)
+TS_FORMAT = "%d-%m-%Y %H:%M:%S"
+DATE_FORMAT = "%Y-%m-%d"
+
+# Jenis kolom yang dikenali schema snapshot
+KIND_DATETIME = "datetime"
+KIND_MONEY = "money"
+KIND_INT = "int"
+KIND_BOOL = "bool"
+KIND_CATEGORY = "category"
+KIND_TEXT = "text"
+KIND_STRING = "string"  # teks bebas di RAM (pyarrow-backed bila tersedia)
+
+_TRUE_STRINGS = {"TRUE", "1", "YA", "YES", "Y"}
+
+
+def _to_datetime(series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    s = series.astype(str).str.strip().str.lstrip("'")
+    s = s.where(~s.str.lower().isin(["", "-", "nan", "nat", "none"]), None)
+
+    # Format eksak dulu (cepat), baru fallback untuk data lama yang formatnya campur
+    parsed = pd.to_datetime(s, format=TS_FORMAT, errors="coerce")
+    sisa = parsed.isna() & s.notna()
+    if sisa.any():
+        parsed[sisa] = pd.to_datetime(s[sisa], format=DATE_FORMAT, errors="coerce")
+    sisa = parsed.isna() & s.notna()
+    if sisa.any():
+        parsed[sisa] = pd.to_datetime(s[sisa], format="mixed", dayfirst=True, errors="coerce")
+    return parsed
+
+
+def _to_money(series, money_parser=None):
+    numeric = pd.to_numeric(series, errors="coerce")
+    if money_parser is not None:
+        sisa = numeric.isna() & series.notna()
+        if sisa.any():
+            numeric[sisa] = pd.to_numeric(series[sisa].map(money_parser), errors="coerce")
+    return numeric.fillna(0).round().astype("int64")
+
+
+def _to_int(series):
+    return pd.to_numeric(series, errors="coerce").fillna(0).astype("int64")
+
+
+def _to_bool(series):
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    return series.astype(str).str.strip().str.upper().isin(_TRUE_STRINGS)
+
+
+def _to_category(series):
+    return series.fillna("").astype(str).str.strip().astype("category")
+
+
+def _to_text(series):
+    return series.fillna("").astype(str).astype("string")
+
+
+def coerce_frame(df, schema, money_parser=None):
+    """Samakan dtype setiap kolom sesuai schema. Kolom di luar schema dianggap teks."""
+    out = pd.DataFrame(index=range(len(df)))
+    src = df.reset_index(drop=True)
+
+    for col in src.columns:
+        kind = schema.get(col, KIND_TEXT)
+        s = src[col]
+        if kind == KIND_DATETIME:
+            out[col] = _to_datetime(s)
+        elif kind == KIND_MONEY:
+            out[col] = _to_money(s, money_parser)
+        elif kind == KIND_INT:
+            out[col] = _to_int(s)
+        elif kind == KIND_BOOL:
+            out[col] = _to_bool(s)
+        elif kind == KIND_CATEGORY:
+            out[col] = _to_category(s)
+        else:
+            out[col] = _to_text(s)
+
+    # Parquet tidak menerima nama kolom non-string
+    out.columns = [str(c) for c in out.columns]
+    return out
+
+
+# =========================================================
+# KOMPAKSI DTYPE UNTUK FRAME DI RAM
+# =========================================================
+def _string_dtype():
+    if not HAS_PYARROW:
+        return "string"
+    try:
+        # Semantik NaN seperti object, jadi filter/mask lama tetap berlaku
+        return pd.StringDtype(storage="pyarrow", na_value=float("nan"))
+    except TypeError:
+        return "string[pyarrow]"
+
+
+def _is_object_text(series):
+    return pd.api.types.is_object_dtype(series) and \
+        pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty")
+
+
+def compact_frame(df, schema, money_parser=None, max_category_ratio=0.5):
+    """
+    Perkecil footprint frame yang disimpan di RAM.
+    - Kolom di schema dikonversi sesuai jenisnya; KIND_CATEGORY hanya dipakai kalau
+      jumlah nilai unik <= max_category_ratio x jumlah baris (selain itu jadi string).
+    - Kolom object lain yang isinya teks murni dijadikan string (pyarrow).
+    - Kolom lain (tanggal python, angka, dll) dibiarkan apa adanya; index tidak diubah.
+    """
+    out = df.copy(deep=False)
+    n = len(out)
+    for col in out.columns:
+        s = out[col]
+        kind = schema.get(col)
+        if kind is None:
+            if not _is_object_text(s):
+                continue
+            kind = KIND_STRING
+
+        if kind == KIND_CATEGORY:
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                continue
+            if n and s.nunique(dropna=True) > max(1, n * max_category_ratio):
+                kind = KIND_STRING
+            else:
+                out[col] = _to_category(s)
+                continue
+
+        if kind == KIND_DATETIME:
+            out[col] = _to_datetime(s)
+        elif kind == KIND_MONEY:
+            out[col] = _to_money(s, money_parser)
+        elif kind == KIND_INT:
+            out[col] = _to_int(s)
+        elif kind == KIND_BOOL:
+            out[col] = _to_bool(s)
+        elif kind == KIND_STRING:
+            if pd.api.types.is_object_dtype(s):
+                out[col] = s.fillna("").astype(str).astype(_string_dtype())
+        else:
+            out[col] = _to_text(s)
+    return out
+
+
+def decompact_frame(df):
+    """Kebalikan kompaksi untuk editor UI: kolom category dikembalikan ke teks biasa."""
+    out = df.copy(deep=False)
+    for col in out.columns:
+        s = out[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            out[col] = s.astype(object).where(s.notna(), "")
+    return out
+
+
+def _read_manifest(snapshot_dir):
+    path = Path(snapshot_dir) / MANIFEST_NAME
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def write_snapshot(tables, snapshot_dir=SNAPSHOT_DIR, money_parser=None):
+    """
+    tables: {"nama_tabel": (DataFrame, schema_dict)}
+    Return: dict ringkasan {"nama_tabel": jumlah_baris} untuk tabel yang berhasil ditulis.
+    """
+    if not HAS_PYARROW:
+        raise RuntimeError("pyarrow belum terpasang, snapshot Parquet tidak bisa dibuat.")
+
+    snapshot_dir = Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = _read_manifest(snapshot_dir)
+    written_at = datetime.now(TZ_JKT).strftime(TS_FORMAT)
+    result = {}
+
+    for name, (df, schema) in tables.items():
+        try:
+            typed = coerce_frame(df if df is not None else pd.DataFrame(), schema, money_parser)
+            final_path = snapshot_dir / f"{name}.parquet"
+            tmp_path = snapshot_dir / f".{name}.parquet.tmp"
+
+            typed.to_parquet(tmp_path, engine="pyarrow", index=False, compression="zstd")
+            # Ganti file secara atomik agar pembaca tidak pernah melihat file setengah jadi
+            os.replace(tmp_path, final_path)
+
+            manifest[name] = {
+                "file": final_path.name,
+                "rows": int(len(typed)),
+                "written_at": written_at,
+                "dtypes": {c: str(t) for c, t in typed.dtypes.items()},
+            }
+            result[name] = int(len(typed))
+        except Exception as e:
+            print(f"Snapshot Error ({name}): {e}")
+
+    (snapshot_dir / MANIFEST_NAME).write_text(
+        json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    return result
+
+
+def read_snapshot_table(name, columns=None, snapshot_dir=SNAPSHOT_DIR):
+    """Baca satu tabel snapshot dengan memory-map (tanpa menyentuh API Sheets)."""
+    path = Path(snapshot_dir) / f"{name}.parquet"
+    if not path.exists():
+        return pd.DataFrame(columns=columns or [])
+    return pd.read_parquet(path, engine="pyarrow", columns=columns, memory_map=True)
+
+
+def load_snapshot_manifest(snapshot_dir=SNAPSHOT_DIR):
+    return _read_manifest(snapshot_dir)
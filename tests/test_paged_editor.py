@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _editor_script():
+    import pandas as pd
+    import streamlit as st
+    import app_core as ac
+
+    df = pd.DataFrame({"Misi": ["a", "b"],
+                       ac.COL_ROW_VERSION: ["vaaaaaaaaa", "vbbbbbbbbb"],
+                       ac.COL_ROW_ID: ["raaaaaaaaaaaa", "rbbbbbbbbbbbb"]})
+    if st.session_state.get("row0_version"):
+        df.loc[0, ac.COL_ROW_VERSION] = st.session_state["row0_version"]
+    if st.session_state.get("ram_write"):
+        ac.update_ram_data("closing", None)
+
+    state = ac._paged_editor_state("t", df)
+    if not st.session_state.get("seeded"):
+        st.session_state["seeded"] = True
+        state["edits"][1] = {"Misi": "edit"}
+    st.session_state["n_edits"] = len(state["edits"])
+
+
+def _run(at, **state):
+    for k, v in state.items():
+        at.session_state[k] = v
+    at.run()
+    assert not at.exception
+    return at.session_state["n_edits"]
+
+
+def _app():
+    at = AppTest.from_function(_editor_script)
+    at.secrets["gemini_api_key"] = ""
+    return at
+
+
+def test_page_edits_survive_rerun_and_unrelated_ram_writes():
+    at = _app()
+    assert _run(at) == 1
+    assert _run(at) == 1
+    assert _run(at, ram_write=True) == 1
+
+
+def test_changed_row_version_clears_page_edits():
+    at = _app()
+    assert _run(at) == 1
+    assert _run(at, row0_version="vccccccccc") == 0
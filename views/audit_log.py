@@ -0,0 +1,155 @@
+# =========================================================
+# HALAMAN: GLOBAL AUDIT LOG
+# Modul halaman: router app.py memanggil render(); helper & konstanta
+# di-import dari app_core (dimuat sekali per proses).
+# =========================================================
+
+import streamlit as st
+
+from app_core import (
+    HAS_OPENPYXL, df_to_excel_bytes, dynamic_column_mapper, get_spreadsheet, is_mobile_device,
+    parse_ts_series, render_section_watermark
+)
+
+
+def render_audit_mobile():
+    st.markdown("### 📜 Global Audit Log (Mobile)")
+    st.caption("Rekaman jejak perubahan data admin.")
+
+    from audit_service import load_audit_log
+
+    if st.button("🔄 Refresh", use_container_width=True, key="mob_refresh_log"):
+        st.cache_data.clear()
+        st.rerun()
+
+    df_raw = load_audit_log(get_spreadsheet())
+
+    if not df_raw.empty:
+        # Gunakan mapper dinamis agar kolom terdeteksi otomatis
+        df_log = dynamic_column_mapper(df_raw)
+
+        # Sortir data terbaru
+        try:
+            df_log["Waktu"] = parse_ts_series(df_log["Waktu"])
+            df_log = df_log.sort_values(by="Waktu", ascending=False)
+        except:
+            pass
+
+        st.markdown("#### 🕒 10 Aktivitas Terakhir")
+
+        for i, row in df_log.head(10).iterrows():
+            with st.container(border=True):
+                # Gunakan .get() agar aman jika kolom tetap tidak terdeteksi
+                st.markdown(f"**{row.get('User', '-')}**")
+                st.caption(
+                    f"📅 {row.get('Waktu', '-')} | Status: {row.get('Status', '-')}")
+                st.text(f"Data: {row.get('Target Data', '-')}")
+
+                chat_val = row.get('Chat & Catatan', '-')
+                if chat_val not in ["-", ""]:
+                    st.info(f"📝 {chat_val}")
+
+                with st.expander("Lihat Detail"):
+                    st.code(row.get('Detail Perubahan', '-'), language="text")
+    else:
+        st.info("Belum ada data log.")
+
+
+def render():
+    if is_mobile_device():
+        render_audit_mobile()
+    else:
+        # --- LOGIC DESKTOP ---
+        st.markdown("## 📜 Global Audit Log")
+        st.caption(
+            "Rekaman jejak perubahan data. Transparansi data Admin & Manager.")
+
+        # Load Data dari Service
+        from audit_service import load_audit_log
+
+        # Tombol Refresh
+        if st.button("🔄 Refresh Log", use_container_width=True):
+            st.cache_data.clear()
+            st.rerun()
+
+        with st.spinner("Memuat data log..."):
+            df_raw = load_audit_log(get_spreadsheet())
+
+        if not df_raw.empty:
+            # 1. Jalankan Mapper Dinamis (Mengubah header GSheet lama/baru ke standar aplikasi)
+            df_log = dynamic_column_mapper(df_raw)
+
+            # 2. Pastikan kolom standar yang dibutuhkan UI tersedia (fallback "-" jika benar-benar tidak ketemu)
+            standard_cols = ["Waktu", "User", "Status",
+                             "Target Data", "Chat & Catatan", "Detail Perubahan"]
+            for c in standard_cols:
+                if c not in df_log.columns:
+                    df_log[c] = "-"
+
+            # 3. Urutkan Waktu (Terbaru di atas)
+            try:
+                df_log["Waktu"] = parse_ts_series(df_log["Waktu"])
+                df_log = df_log.sort_values(by="Waktu", ascending=False)
+            except Exception:
+                pass
+
+            # --- FITUR FILTERING ---
+            with st.expander("🔍 Filter Pencarian"):
+                c1, c2 = st.columns(2)
+                # Ambil list unik untuk filter
+                all_users = df_log["User"].unique().tolist()
+                all_sheets = df_log["Target Data"].unique().tolist()
+
+                with c1:
+                    filter_user = st.multiselect(
+                        "Pilih Pelaku (User)", all_users)
+                with c2:
+                    filter_sheet = st.multiselect(
+                        "Pilih Sheet/Data", all_sheets)
+
+            # Terapkan Filter jika dipilih
+            df_show = df_log.copy()
+            if filter_user:
+                df_show = df_show[df_show["User"].isin(filter_user)]
+            if filter_sheet:
+                df_show = df_show[df_show["Target Data"].isin(filter_sheet)]
+
+            # --- TAMPILKAN DATA UI ---
+            st.markdown(f"**Total Record:** {len(df_show)}")
+
+            # 4. Render Dataframe (Pastikan Key Column Config sesuai hasil Mapping)
+            st.dataframe(
+                df_show[standard_cols],
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Waktu": st.column_config.DatetimeColumn(
+                        "🕒 Waktu",
+                        format="D MMM YYYY, HH:mm",
+                        width="small"
+                    ),
+                    "Target Data": st.column_config.TextColumn("Data"),
+                    "Chat & Catatan": st.column_config.TextColumn("💬 Catatan / Chat", width="medium"),
+                    "Detail Perubahan": st.column_config.TextColumn(
+                        "📄 Detail Perubahan",
+                        width="large",
+                        help="Menampilkan detail perubahan data"
+                    )
+                }
+            )
+
+            # Download Button (Excel)
+            if HAS_OPENPYXL:
+                xb = df_to_excel_bytes(df_show, sheet_name="Audit_Log")
+                if xb:
+                    st.download_button(
+                        "⬇️ Download Log (Excel)",
+                        data=xb,
+                        file_name="global_audit_log.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
+        else:
+            st.info("Belum ada riwayat perubahan data.")
+
+        # Watermark
+        render_section_watermark()
@@ -0,0 +1,120 @@
+# =========================================================
+# HALAMAN: CLOSING DEAL
+# Modul halaman: router app.py memanggil render(); helper & konstanta
+# di-import dari app_core (dimuat sekali per proses).
+# =========================================================
+
+import time
+from datetime import datetime
+import streamlit as st
+
+from app_core import (
+    COL_BIDANG, COL_MARKETING, COL_NILAI_KONTRAK, COL_ROW_ID, COL_ROW_VERSION, HAS_OPENPYXL,
+    HAS_PLOTLY, TZ_JKT,
+    df_to_excel_bytes, format_rupiah_display, get_daftar_staf_terbaru, is_mobile_device,
+    load_closing_deal, px, tambah_closing_deal
+)
+
+# Kolom sistem (versi & ID baris) tidak ditampilkan / tidak ikut di file download
+SYSTEM_COLUMN_CONFIG = {COL_ROW_VERSION: None, COL_ROW_ID: None}
+
+
+def render_closing_mobile():
+    st.markdown("### 🤝 Closing Deal (Full Mobile)")
+
+    # Form Input Tetap Sama
+    with st.expander("➕ Input Deal Baru", expanded=False):
+        with st.form("mob_form_closing"):
+            cd_group = st.text_input("Nama Group (Opsional)")
+            cd_marketing = st.selectbox(
+                "Nama Marketing", get_daftar_staf_terbaru())
+            cd_tgl = st.date_input("Tanggal Event")
+            cd_bidang = st.text_input("Bidang", placeholder="F&B / Wedding")
+            cd_nilai = st.text_input("Nilai (Rp)", placeholder="Contoh: 15jt")
+
+            if st.form_submit_button("Simpan Deal", type="primary", use_container_width=True):
+                res, msg = tambah_closing_deal(
+                    cd_group, cd_marketing, cd_tgl, cd_bidang, cd_nilai)
+                if res:
+                    st.success(msg)
+                    st.cache_data.clear()
+                    time.sleep(1)
+                    st.rerun()
+                else:
+                    st.error(msg)
+
+    st.divider()
+    st.markdown("#### 📋 Riwayat Lengkap & Download")
+
+    df_cd = load_closing_deal()
+
+    if not df_cd.empty:
+        # 1. Tampilkan Statistik Singkat
+        tot = df_cd[COL_NILAI_KONTRAK].sum(
+        ) if COL_NILAI_KONTRAK in df_cd.columns else 0
+        st.metric("Total Closing", format_rupiah_display(tot))
+
+        # 2. Tampilkan Semua Data (Tanpa batasan .head)
+        st.dataframe(df_cd, use_container_width=True, hide_index=True,
+                     column_config=SYSTEM_COLUMN_CONFIG)
+
+        # 3. Fitur Download (Excel & CSV) - Diaktifkan di Mobile
+        df_export = df_cd.drop(columns=list(SYSTEM_COLUMN_CONFIG), errors="ignore")
+        c1, c2 = st.columns(2)
+        with c1:
+            if HAS_OPENPYXL:
+                xb = df_to_excel_bytes(df_export, sheet_name="Closing")
+                if xb:
+                    st.download_button("⬇️ Excel", data=xb, file_name="closing_mob.xlsx",
+                                       mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                                       use_container_width=True)
+        with c2:
+            csv = df_export.to_csv(index=False).encode('utf-8')
+            st.download_button("⬇️ CSV", data=csv, file_name="closing_mob.csv",
+                               mime="text/csv", use_container_width=True)
+
+        # 4. Grafik (Jika ada Plotly)
+        if HAS_PLOTLY:
+            with st.expander("📊 Lihat Grafik Performance"):
+                try:
+                    df_plot = df_cd.copy()
+                    df_plot[COL_NILAI_KONTRAK] = df_plot[COL_NILAI_KONTRAK].fillna(
+                        0).astype(int)
+                    fig = px.bar(df_plot, x=COL_MARKETING, y=COL_NILAI_KONTRAK, color=COL_BIDANG,
+                                 title="Total per Marketing")
+                    st.plotly_chart(fig, use_container_width=True)
+                except:
+                    pass
+    else:
+        st.info("Belum ada data.")
+
+
+def render():
+    if is_mobile_device():
+        render_closing_mobile()
+    else:
+        st.markdown("## 🤝 Closing Deal")
+        with st.container(border=True):
+            with st.form("form_closing_desk_full", clear_on_submit=True):
+                c1, c2, c3 = st.columns(3)
+                inp_group = c1.text_input("Nama Group (Opsional)")
+                inp_marketing = c2.text_input("Nama Marketing")
+                inp_tgl_event = c3.date_input(
+                    "Tanggal Event", value=datetime.now(tz=TZ_JKT).date())
+                inp_bidang = st.text_input("Bidang / Jenis Event")
+                inp_nilai = st.text_input("Nilai Kontrak (Rupiah)")
+                if st.form_submit_button("✅ Simpan Closing Deal", type="primary", use_container_width=True):
+                    res, msg = tambah_closing_deal(
+                        inp_group, inp_marketing, inp_tgl_event, inp_bidang, inp_nilai)
+                    if res:
+                        st.success(msg)
+                        st.cache_data.clear()
+                        time.sleep(1)
+                        st.rerun()
+                    else:
+                        st.error(msg)
+        st.divider()
+        df_cd = load_closing_deal()
+        if not df_cd.empty:
+            st.dataframe(df_cd, use_container_width=True, hide_index=True,
+                         column_config=SYSTEM_COLUMN_CONFIG)
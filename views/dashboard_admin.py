@@ -0,0 +1,759 @@
+# =========================================================
+# HALAMAN: DASHBOARD ADMIN & ANALYTICS
+# Modul halaman: router app.py memanggil render(); helper & konstanta
+# di-import dari app_core (dimuat sekali per proses).
+# =========================================================
+
+import json
+import time
+from datetime import datetime, timedelta
+import pandas as pd
+import streamlit as st
+
+import snapshot_service as sn
+from ai_insight_service import make_insight_key
+from app_core import (
+    CLOSING_COLUMNS, COL_DESKRIPSI, COL_FEEDBACK, COL_INTEREST, COL_KENDALA, COL_KESIMPULAN,
+    COL_KONTAK_KLIEN, COL_LINK_FOTO, COL_NAMA, COL_NAMA_KLIEN, COL_PENDING, COL_TEMPAT,
+    COL_TIMESTAMP, HAS_OPENPYXL, HAS_PLOTLY, INDIV_CHECKLIST_COLUMNS, NAMA_KOLOM_STANDAR,
+    PAYMENT_COLUMNS, REPORT_DERIVED_COLUMNS, REVIEW_COL_POS, REVIEW_COL_STAF, SHEET_CLOSING_DEAL,
+    SHEET_CONFIG_TEAM, SHEET_PEMBAYARAN, SHEET_TARGET_INDIVIDU, SHEET_TARGET_TEAM, TEAM_CHECKLIST_COLUMNS,
+    TEAM_COLUMNS, TZ_JKT, admin_smart_editor_ui, build_review_queue, clean_df_types_dynamically,
+    df_to_excel_bytes, ensure_headers, execute_approval, export_analytics_snapshot,
+    force_audit_log, get_daftar_staf_terbaru, get_or_create_worksheet, get_pending_approvals,
+    get_report_rollup, hapus_staf_by_name, is_mobile_device, kirim_feedback_admin_bulk,
+    load_all_reports, load_closing_deal, load_pembayaran_dp, managed_columns,
+    pending_diff_summary, px, render_ai_insight, render_section_watermark, rollup_counts,
+    tambah_staf_baru, tambah_team_baru, ui_fragment, ui_rerun_fragment,
+    verify_admin_password
+)
+
+
+def render_admin_mobile():
+    st.markdown("### 🔐 Admin Dashboard (Full Mobile)")
+
+    # 1. Cek Login
+    if not st.session_state["is_admin"]:
+        pwd = st.text_input(
+            "Password Admin", type="password", key="mob_adm_pwd")
+        if st.button("Login", use_container_width=True, key="mob_adm_login"):
+            if verify_admin_password(pwd):
+                st.session_state["is_admin"] = True
+                st.rerun()
+            else:
+                st.error("Password salah.")
+        return  # Stop disini kalau belum login
+
+    # 2. Jika Sudah Login -> Tampilkan Dashboard Penuh
+    if st.button("🔓 Logout", use_container_width=True, key="mob_adm_logout"):
+        st.session_state["is_admin"] = False
+        st.rerun()
+
+    # --- LOADING DATA ---
+    staff_list = get_daftar_staf_terbaru()
+    df_all = load_all_reports(staff_list)
+
+
+# TABS NAVIGATION MOBILE
+    tab_prod, tab_leads, tab_data, tab_cfg = st.tabs(["📈 Grafik", "🧲 Leads", "📦 Data", "⚙️ Config"])
+
+    with tab_prod:
+        st.caption("Analisa Kinerja")
+        if not df_all.empty:
+            days = st.selectbox("Hari Terakhir:", [7, 30, 90], key="mob_adm_days")
+            start_d = datetime.now(tz=TZ_JKT).date() - timedelta(days=days)
+            # Baca dari rollup harian (bukan scan seluruh laporan)
+            df_roll = get_report_rollup(staff_list, since=start_d)
+            total_laporan = int(df_roll["Jumlah"].sum()) if not df_roll.empty else 0
+            st.metric("Total Laporan", total_laporan)
+            
+            report_counts = rollup_counts(df_roll, "Nama")
+            st.bar_chart(report_counts)
+
+            st.divider()
+            st.markdown("#### 🤖 AI / Machine Learning Management Insight")
+
+            staf_stats_str = json.dumps(report_counts.to_dict(), indent=2)
+            full_prompt = f"""
+            [CONTEXT_DATA]
+            Nama Pemimpin: Pak Nugroho
+            Total Laporan Masuk: {total_laporan}
+            Statistik Per Staf: {staf_stats_str}
+
+            [SYSTEM_INSTRUCTION]
+            Kamu adalah asisten kepercayaan Pak Nugroho. Gunakan bahasa Indonesia yang santun, cerdas, namun tetap membumi agar mudah dipahami. 
+
+            PANDUAN PENULISAN:
+            1. Gunakan bahasa yang awam tapi berwibawa. Jangan gunakan istilah teknis yang terlalu berat dan jangan gunakan simbol em-dash atau sejenisnya.
+            2. JANGAN pernah menyebutkan target angka spesifik seperti 48 kunjungan.
+            3. Gunakan Analisis Perbandingan Kompetitor: Jelaskan bahwa saat sales di perusahaan lain mungkin hari ini masih sibuk di dalam kantor, terjebak urusan kertas, atau baru sekadar merencanakan jadwal, tim Pak Nugroho sudah mengambil langkah nyata di lapangan.
+            4. Gunakan Teori Keunggulan Awal: Tekankan bahwa satu laporan di awal waktu jauh lebih berharga daripada banyak laporan yang terlambat, karena ini adalah data nyata tentang kondisi pasar saat ini yang bisa langsung Bapak ambil kebijakannya.
+            5. Jika volume laporan sedikit, jelaskan dengan teori Kualitas di Atas Kuantitas: Sampaikan bahwa tim sedang melakukan pendekatan yang sangat mendalam ke klien besar, sehingga interaksinya lebih berkualitas daripada sekadar kunjungan formalitas.
+            6. Berikan apresiasi kepada staf yang sudah mengirim laporan (sebutkan namanya) sebagai bukti bahwa mereka lebih tanggap dan gesit dibanding rata-rata sales di luar sana.
+            7. JANGAN PERNAH mengaku sebagai AI atau Gemini. Tunjukkan empati dan semangat tinggi untuk mendukung visi Pak Nugroho.
+
+            [TASK]
+            Berikan analisis kinerja tim Sales kepada Pak Nugroho secara naratif dan kreatif berdasarkan data yang ada.
+            """
+
+            insight_key = make_insight_key("mobile", report_counts.to_dict(), str(start_d), total_laporan)
+            render_ai_insight(insight_key, full_prompt, df_roll, short=True)
+        else:
+            st.info("Belum ada data laporan.")
+
+    with tab_leads:
+        st.caption("Filter & Download Leads")
+        sel_int = st.selectbox("Interest:", ["Under 50% (A)", "50-75% (B)", "75%-100%"], key="mob_adm_int")
+        if not df_all.empty and COL_INTEREST in df_all.columns:
+            df_leads = df_all[df_all[COL_INTEREST].astype(str).str.strip() == sel_int]
+            st.dataframe(df_leads[[COL_NAMA_KLIEN, COL_KONTAK_KLIEN]], use_container_width=True)
+            if HAS_OPENPYXL:
+                xb = df_to_excel_bytes(df_leads, sheet_name="Leads")
+                if xb:
+                    st.download_button("⬇️ Excel Leads", data=xb, file_name=f"leads_{sel_int}.xlsx", use_container_width=True)
+
+    with tab_data:
+        st.caption("Master Data Laporan")
+        if st.button("Refresh Data", use_container_width=True, key="mob_ref_data"):
+            st.cache_data.clear()
+            st.rerun()
+        st.dataframe(df_all.drop(columns=REPORT_DERIVED_COLUMNS, errors="ignore"), use_container_width=True)
+
+    with tab_cfg:
+        st.markdown("#### 👥 Kelola Personel (Staf)")
+        with st.form("mob_add_staff"):
+            st.markdown("➕ **Tambah Staf Baru**")
+            new_st = st.text_input("Nama Staf", placeholder="Ketik nama baru...")
+            if st.form_submit_button("Simpan Staf", use_container_width=True):
+                if new_st.strip():
+                    ok, msg = tambah_staf_baru(new_st)
+                    if ok:
+                        st.success("Berhasil ditambahkan!")
+                        st.cache_data.clear()
+                        time.sleep(1)
+                        st.rerun()
+                    else:
+                        st.error(msg)
+                else:
+                    st.error("Nama tidak boleh kosong.")
+        st.markdown("---") 
+        st.markdown("#### 🗑️ Hapus Staf")
+        st.caption("Menghapus nama dari daftar pelapor.")
+        staff_now = get_daftar_staf_terbaru()
+        hapus_select = st.selectbox("Pilih staf yang akan dihapus:", ["-- Pilih Staf --"] + staff_now, key="mob_del_st")
+        confirm_del = st.checkbox("Konfirmasi penghapusan permanen", key="mob_del_confirm")
+        if st.button("🔥 Konfirmasi Hapus", type="primary", use_container_width=True, key="mob_btn_del"):
+            if hapus_select == "-- Pilih Staf --":
+                st.error("Pilih nama staf terlebih dahulu!")
+            elif not confirm_del:
+                st.error("Silakan centang kotak konfirmasi penghapusan.")
+            else:
+                with st.spinner("Menghapus..."):
+                    ok, m = hapus_staf_by_name(hapus_select)
+                    if ok:
+                        force_audit_log(actor=st.session_state.get("user_name", "Admin Mobile"), action="❌ DELETE USER", target_sheet="Config_Staf", chat_msg=f"Menghapus staf via HP: {hapus_select}", details_input=f"User {hapus_select} telah dihapus dari sistem mobile.")
+                        st.success(f"Staf {hapus_select} Berhasil dihapus!")
+                        st.cache_data.clear()
+                        time.sleep(1.5)
+                        st.rerun()
+                    else:
+                        st.error(m)
+
+            # --- SUB-BAGIAN: HAPUS STAF ---
+            st.markdown("#### 🗑️ Hapus Staf")
+            st.caption("Menghapus nama dari daftar pelapor.")
+
+            staff_now = get_daftar_staf_terbaru()
+            hapus_select = st.selectbox("Pilih staf yang akan dihapus:", [
+                                        "-- Pilih Staf --"] + staff_now, key="mob_del_st")
+
+            confirm_del = st.checkbox(
+                "Konfirmasi penghapusan permanen", key="mob_del_confirm")
+
+            if st.button("🔥 Konfirmasi Hapus", type="primary", use_container_width=True, key="mob_btn_del"):
+                if hapus_select == "-- Pilih Staf --":
+                    st.error("Pilih nama staf terlebih dahulu!")
+                elif not confirm_del:
+                    st.error("Silakan centang kotak konfirmasi penghapusan.")
+                else:
+                    with st.spinner("Menghapus..."):
+                        ok, m = hapus_staf_by_name(hapus_select)
+                        if ok:
+                            force_audit_log(
+                                actor=st.session_state.get(
+                                    "user_name", "Admin Mobile"),
+                                action="❌ DELETE USER",
+                                target_sheet="Config_Staf",
+                                chat_msg=f"Menghapus staf via HP: {hapus_select}",
+                                details_input=f"User {hapus_select} telah dihapus dari sistem mobile."
+                            )
+                            st.success(f"Staf {hapus_select} Berhasil dihapus!")
+                            st.cache_data.clear()
+                            time.sleep(1.5)
+                            st.rerun()
+                        else:
+                            st.error(m)
+
+
+def render():
+    if is_mobile_device():
+        render_admin_mobile()
+    else:
+        st.markdown("## 📊 Dashboard Admin & Analytics")
+
+        if not st.session_state.get("is_admin"):
+            col_l1, col_l2, col_l3 = st.columns([1, 1, 1])
+            with col_l2:
+                with st.container(border=True):
+                    st.markdown("### 🔐 Login Dashboard")
+                    pwd_input = st.text_input("Masukkan Password Admin:", type="password", key="pwd_admin_desk")
+                    if st.button("Masuk Ke Dashboard", use_container_width=True, type="primary"):
+                        if verify_admin_password(pwd_input):
+                            st.session_state["is_admin"] = True
+                            st.rerun()
+                        else:
+                            st.error("Password salah. Akses ditolak.")
+            st.stop()
+
+        c_head1, c_head2 = st.columns([3, 1])
+        with c_head1:
+            st.info(f"Login sebagai: **{st.session_state.get('user_name')}** | Role: **{st.session_state.get('user_role').upper()}**")
+        with c_head2:
+            if st.button("🔓 Logout Admin", use_container_width=True):
+                st.session_state["is_admin"] = False
+                st.rerun()
+
+        staff_list_global = get_daftar_staf_terbaru()
+        df_all = load_all_reports(staff_list_global)
+
+        st.markdown("### 🛠️ Data Controller (Mode Edit)")
+        col_sel1, col_sel2 = st.columns([2, 1])
+        with col_sel1:
+            selected_staff_target = st.selectbox("👤 Pilih Target Staf (Untuk Mengedit Data):", ["-- Pilih Staf --"] + staff_list_global, key="adm_global_staff_sel")
+        with col_sel2:
+            st.caption("ℹ️ Pilih nama staf untuk mengaktifkan editor pada tab di bawah.")
+
+        df_staff_current = pd.DataFrame()
+        if selected_staff_target != "-- Pilih Staf --":
+            ws_target = get_or_create_worksheet(selected_staff_target)
+            if ws_target:
+                df_staff_current = pd.DataFrame(ws_target.get_all_records())
+                for col in NAMA_KOLOM_STANDAR:
+                    if col not in df_staff_current.columns:
+                        df_staff_current[col] = ""
+
+        # ========================================================
+        # [PERBAIKAN] LOGIKA ROLE (SUPORT ATASAN & MANAGER)
+        # ========================================================
+        # 1. Tentukan Role (Ambil role saat ini dan jadikan huruf kecil)
+        current_role_str = str(st.session_state.get("user_role", "")).lower().strip()
+
+        # Cek apakah role termasuk 'manager' ATAU 'atasan'
+        is_manager = (current_role_str in ["manager", "atasan", "boss", "admin"]) 
+
+        # 2. Susun Label Tab secara Dinamis
+        tabs_labels = []
+        if is_manager:
+            tabs_labels.append("🔔 APPROVAL (ACC)")
+
+        tabs_labels.extend([
+            "📈 Produktivitas & AI",
+            "🧲 Leads & Interest",
+            "💬 Review & Feedback",
+            "🖼️ Galeri Bukti",
+            "📦 Master Data",
+            "⚙️ Config Staff",
+            "🗑️ Hapus Akun",
+            "⚡ SUPER EDITOR"
+        ])
+
+        # 3. Buat Tabs
+        all_tabs = st.tabs(tabs_labels)
+        tab_ptr = 0  # Pointer dimulai dari 0
+
+        # [BARU] Kartu approval & feedback dibungkus fragment: mengetik alasan / membuka
+        # popover hanya me-rerun kartu tersebut, bukan seluruh dashboard.
+        @ui_fragment
+        def render_approval_card(i, req):
+            with st.container(border=True):
+                c1, c2 = st.columns([3, 1])
+                with c1:
+                    st.markdown(f"👤 **{req['Requestor']}** mengajukan perubahan pada `{req['Target Sheet']}`")
+                    st.info(f"📝 Alasan: {req['Reason']}")
+                with c2:
+                    st.caption(f"📅 {req['Timestamp']}")
+                    if req.get("Change Set ID"):
+                        st.caption(f"📦 {req['Change Set ID']}")
+
+                # Tampilkan Diff (sudah dihitung saat pengajuan, tidak di-parse ulang tiap render)
+                st.text(pending_diff_summary(req))
+
+                # Tombol Aksi
+                ca, cb = st.columns(2)
+                # Tombol Approve
+                if ca.button("✅ SETUJUI", key=f"acc_{i}", type="primary", use_container_width=True):
+                    ok, m = execute_approval(i, "APPROVE", st.session_state["user_name"])
+                    if ok:
+                        st.success(m)
+                        time.sleep(1)
+                        st.rerun()
+                    else:
+                        st.error(m)
+
+                # Tombol Reject (Popover)
+                with cb.popover("❌ TOLAK REQUEST", use_container_width=True):
+                    reason_rej = st.text_input("Alasan Penolakan:", key=f"rej_txt_{i}")
+                    if st.button("Konfirmasi Tolak", key=f"rej_btn_{i}", type="primary", use_container_width=True):
+                        execute_approval(i, "REJECT", st.session_state["user_name"], reason_rej)
+                        st.warning("Request ditolak.")
+                        st.rerun()
+
+        # --- TAB KHUSUS MANAGER: APPROVAL ---
+        if is_manager:
+            with all_tabs[tab_ptr]:
+                st.markdown("### 🔔 Pusat Persetujuan Manager/Atasan")
+                pending_data = get_pending_approvals()
+
+                if not pending_data:
+                    st.success("✅ Tidak ada data yang menunggu persetujuan.")
+                else:
+                    st.markdown(f"Menunggu persetujuan: **{len(pending_data)} data**")
+                    for i, req in enumerate(pending_data):
+                        render_approval_card(i, req)
+
+            # PENTING: Geser pointer ke tab berikutnya setelah selesai mengisi tab Approval
+            tab_ptr += 1
+
+        with all_tabs[tab_ptr]:
+            st.markdown("### 🚀 Analisa Kinerja & AI Insight")
+            if not df_all.empty:
+                d_opt = st.selectbox("Rentang Waktu Data:", [7, 14, 30, 90], index=2, key="d_opt_prod")
+                cutoff = datetime.now(tz=TZ_JKT).date() - timedelta(days=d_opt)
+                # Semua metrik dibaca dari rollup harian (Staf x Hari x Kategori)
+                df_roll = get_report_rollup(staff_list_global, since=cutoff)
+                total_laporan = int(df_roll["Jumlah"].sum()) if not df_roll.empty else 0
+
+                col_m1, col_m2 = st.columns(2)
+                with col_m1:
+                    st.markdown("#### Total Laporan per Staf")
+                    report_counts = rollup_counts(df_roll, "Nama")
+                    st.bar_chart(report_counts)
+                with col_m2:
+                    if HAS_PLOTLY and not df_roll.empty:
+                        kategori_counts = rollup_counts(df_roll, "Kategori").reset_index()
+                        fig = px.pie(kategori_counts, names="Kategori", values="Jumlah", title="Proporsi Jenis Aktivitas", hole=0.3)
+                        st.plotly_chart(fig, use_container_width=True)
+
+                st.markdown("#### 🤖 AI / Machine Learning Management Insight")
+                staf_stats_str = json.dumps(report_counts.to_dict(), indent=2)
+                full_prompt = f"""
+            [CONTEXT_DATA]
+            Nama Pemimpin: Pak Nugroho
+            Total Laporan Masuk: {total_laporan}
+            Data Statistik Staf: {staf_stats_str}
+
+            [SYSTEM_INSTRUCTION]
+            Kamu adalah asisten kepercayaan Pak Nugroho. Gunakan bahasa Indonesia yang santun, cerdas, namun tetap membumi.
+            
+            PANDUAN PENULISAN:
+            1. Gunakan bahasa yang enak dibaca dan berwibawa.
+            2. JANGAN pernah menyebutkan target angka kunjungan mingguan.
+            3. Gunakan Logika Perbandingan Kompetitor.
+            4. Gunakan Teori Keunggulan Awal.
+            5. Jika laporan sedikit, gunakan sudut pandang Kualitas.
+            6. Berikan apresiasi kepada staf yang rajin.
+            7. JANGAN mengaku sebagai AI.
+
+            [TASK]
+            Berikan analisis kinerja tim Sales kepada Pak Nugroho secara naratif dan kreatif berdasarkan data laporan yang terkumpul hari ini.
+            """
+
+                # Cache per input prompt: interaksi widget lain tidak memicu panggilan AI ulang
+                insight_key = make_insight_key("desktop", report_counts.to_dict(), str(cutoff), total_laporan)
+                render_ai_insight(insight_key, full_prompt, df_roll)
+            else:
+                st.info("Belum ada data laporan masuk.")
+
+            st.divider()
+
+            st.markdown("### 🛠️ Editor Laporan Harian")
+            if selected_staff_target == "-- Pilih Staf --":
+                st.warning("👈 Silakan pilih nama staf di dropdown atas 'Data Controller' untuk mengedit data.")
+            elif df_staff_current.empty:
+                st.info(f"Data laporan untuk {selected_staff_target} masih kosong.")
+            else:
+                cols_prod = [COL_TIMESTAMP, COL_TEMPAT, COL_DESKRIPSI, COL_KESIMPULAN, COL_KENDALA]
+                df_view = df_staff_current[cols_prod].copy()
+                admin_smart_editor_ui(df_view, "prod_edit", selected_staff_target)
+        tab_ptr += 1
+
+        with all_tabs[tab_ptr]: # Tab Leads
+            st.markdown("### 🧲 Leads Management")
+
+            if not df_all.empty and COL_INTEREST in df_all.columns:
+                st.markdown("#### 📥 Filter & Download Leads (Global)")
+
+                # [FIX 1] Mapping Filter agar sinkron dengan data database
+                # Pilihan UI -> Keyword Pencarian
+                sel_in = st.selectbox("Pilih Tingkat Interest:", ["Under 50%", "50-75%", "75%-100%"], key="adm_leads_filter")
+
+                # Ringkasan jumlah leads per tingkat interest (dari rollup, tanpa scan laporan)
+                interest_counts = rollup_counts(get_report_rollup(staff_list_global), "Interest")
+                st.caption(" | ".join(
+                    f"{b}: **{int(interest_counts.get(b, 0))}**" for b in ["Under 50%", "50-75%", "75%-100%"]
+                ))
+
+                # Ambil keyword utama saja (misal "50-75" dari "50-75% (B)")
+                keyword_search = sel_in.split("%")[0].strip() 
+
+                # [FIX 2] Gunakan .str.contains() agar pencarian lebih fleksibel
+                # Ini akan mencocokkan "50-75" dengan "50-75% (B)" atau "50-75%"
+                mask_leads = df_all[COL_INTEREST].astype(str).str.contains(keyword_search, case=False, na=False)
+                df_leads_global = df_all[mask_leads].copy()
+
+                # Tampilkan Data
+                st.info(f"Ditemukan **{len(df_leads_global)}** leads potensial.")
+
+                cols_view = [COL_TIMESTAMP, COL_NAMA, COL_NAMA_KLIEN, COL_KONTAK_KLIEN, COL_KESIMPULAN, COL_INTEREST]
+                cols_final = [c for c in cols_view if c in df_leads_global.columns]
+
+                st.dataframe(df_leads_global[cols_final], use_container_width=True, hide_index=True)
+
+                # [FIX 3] Tambahkan Fitur Download Excel
+                if HAS_OPENPYXL and not df_leads_global.empty:
+                    xb = df_to_excel_bytes(df_leads_global[cols_final], sheet_name="Leads_Data")
+                    if xb:
+                        st.download_button(
+                            label=f"⬇️ Download Excel ({sel_in})",
+                            data=xb, 
+                            file_name=f"Leads_{sel_in.replace(' ','_')}.xlsx",
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                            use_container_width=True
+                        )
+            else:
+                st.info("Belum ada data leads yang masuk.")
+
+            st.divider()
+
+            # Bagian Editor Leads Per Staff (Tetap)
+            st.markdown("#### 🛠️ Editor Leads (Per Staff)")
+            if selected_staff_target == "-- Pilih Staf --":
+                st.warning("👈 Silakan pilih nama staf di dropdown atas 'Data Controller' untuk mengedit.")
+            elif not df_staff_current.empty:
+                cols_leads = [COL_TIMESTAMP, COL_NAMA_KLIEN, COL_KONTAK_KLIEN, COL_INTEREST, COL_PENDING]
+                cols_exist = [c for c in cols_leads if c in df_staff_current.columns]
+                df_view = df_staff_current[cols_exist].copy()
+                admin_smart_editor_ui(df_view, "leads_edit", selected_staff_target)
+            else:
+                st.info("Data leads untuk staf ini kosong.")
+        tab_ptr += 1
+
+        with all_tabs[tab_ptr]:
+            st.markdown("### 💬 Review & Feedback")
+
+            st.markdown("#### 📨 Antrean Review (Belum Ada Feedback)")
+
+            @ui_fragment
+            def render_review_queue():
+                msg = st.session_state.pop("review_queue_msg", None)
+                if msg:
+                    (st.success if msg[0] else st.warning)(msg[1])
+
+                df_queue = build_review_queue(staff_list_global)
+                if df_queue.empty:
+                    st.info("Semua laporan sudah diberi feedback. 🎉")
+                    return
+
+                c_f1, c_f2, c_f3 = st.columns([2, 1, 1])
+                with c_f1:
+                    rq_staf = st.selectbox("Filter Staf:", ["Semua"] + staff_list_global, key="rq_staf")
+                if rq_staf != "Semua":
+                    df_queue = df_queue[df_queue[COL_NAMA].astype(str) == rq_staf]
+                with c_f2:
+                    rq_size = st.selectbox("Per Halaman:", [10, 25, 50], key="rq_size")
+                total_pages = max(1, -(-len(df_queue) // rq_size))
+                # Antrean bisa menyusut setelah kirim; jaga nomor halaman tetap valid
+                if st.session_state.get("rq_page", 1) > total_pages:
+                    st.session_state["rq_page"] = total_pages
+                with c_f3:
+                    rq_page = st.number_input("Halaman:", min_value=1, max_value=total_pages, value=1, step=1, key="rq_page")
+
+                start = (int(rq_page) - 1) * rq_size
+                df_page = df_queue.iloc[start:start + rq_size]
+                st.caption(f"{len(df_queue)} laporan menunggu review • halaman {int(rq_page)}/{total_pages}. "
+                           "Isi feedback pada baris yang ingin dikirim, lalu kirim sekaligus.")
+
+                with st.form("review_queue_form", clear_on_submit=True):
+                    row_keys = []
+                    for _, r in df_page.iterrows():
+                        # Identitas baris = sheet staf + posisi di frame RAM (timestamp bisa kembar / kosong)
+                        staf, pos = str(r[REVIEW_COL_STAF]), int(r[REVIEW_COL_POS])
+                        widget_key = f"rq_in_{staf}_{pos}"
+                        with st.container(border=True):
+                            st.markdown(f"**{r[COL_NAMA]}** | {r[COL_TIMESTAMP]} | 📍 {r[COL_TEMPAT]}")
+                            st.write(f"📝 {r[COL_DESKRIPSI]}")
+                            st.text_input("Feedback:", key=widget_key, placeholder="Berikan masukan...")
+                        row_keys.append((staf, pos, r[COL_TIMESTAMP], widget_key))
+
+                    if st.form_submit_button("📨 Kirim Semua Feedback", type="primary", use_container_width=True):
+                        items = [(staf, pos, ts, st.session_state.get(k, "").strip()) for staf, pos, ts, k in row_keys]
+                        items = [it for it in items if it[3]]
+                        if not items:
+                            st.warning("Belum ada feedback yang diisi.")
+                            return
+
+                        # Ditulis per worksheet staf (1 batch_update per staf)
+                        results = kirim_feedback_admin_bulk(items)
+                        sukses = [it for it, (ok, _) in zip(items, results) if ok]
+                        gagal = [(it, m) for it, (ok, m) in zip(items, results) if not ok]
+
+                        if sukses:
+                            # Satu entri audit untuk seluruh kiriman
+                            force_audit_log(
+                                actor=st.session_state.get("user_name", "Admin"),
+                                action="💬 FEEDBACK (BULK)",
+                                target_sheet=", ".join(sorted({it[0] for it in sukses})),
+                                chat_msg=f"Mengirim {len(sukses)} feedback sekaligus.",
+                                details_input={f"{staf} #{pos + 1} | {ts}": isi for staf, pos, ts, isi in sukses},
+                            )
+
+                        pesan = f"{len(sukses)} feedback terkirim."
+                        if gagal:
+                            pesan += " Gagal: " + "; ".join(f"{it[0]} {it[2]} ({m})" for it, m in gagal)
+                        st.session_state["review_queue_msg"] = (not gagal, pesan)
+                        ui_rerun_fragment()
+
+            render_review_queue()
+
+            st.divider()
+
+            st.markdown("#### 🛠️ Koreksi Data Feedback")
+            if selected_staff_target == "-- Pilih Staf --":
+                st.warning("👈 Silakan pilih nama staf di dropdown atas untuk mengedit tabel feedback.")
+            elif not df_staff_current.empty:
+                cols_feed = [COL_TIMESTAMP, COL_DESKRIPSI, COL_FEEDBACK]
+                if COL_FEEDBACK not in df_staff_current.columns:
+                    df_staff_current[COL_FEEDBACK] = ""
+
+                df_view = df_staff_current[cols_feed].copy()
+                admin_smart_editor_ui(df_view, "feed_edit", selected_staff_target)
+        tab_ptr += 1
+
+        with all_tabs[tab_ptr]:
+            st.markdown("### 🖼️ Galeri Foto Aktivitas")
+
+            st.markdown("#### 📸 Tampilan Galeri")
+            if not df_all.empty:
+                df_img = df_all[df_all[COL_LINK_FOTO].str.contains("http", na=False)].head(12)
+                c_gal = st.columns(3)
+                for idx, row in enumerate(df_img.to_dict("records")):
+                    with c_gal[idx % 3]:
+                        img_clean = row[COL_LINK_FOTO].replace("www.dropbox.com", "dl.dropboxusercontent.com").replace("?dl=0", "")
+                        st.image(img_clean, use_container_width=True, caption=f"{row[COL_NAMA]} @ {row[COL_TEMPAT]}")
+
+            st.divider()
+
+            with st.expander("🛠️ Klik di sini untuk mengedit Link Foto (Advanced)"):
+                if selected_staff_target == "-- Pilih Staf --":
+                    st.warning("Pilih staf di dropdown atas dahulu.")
+                elif not df_staff_current.empty:
+                    cols_img = [COL_TIMESTAMP, COL_TEMPAT, COL_LINK_FOTO]
+                    df_view = df_staff_current[cols_img].copy()
+                    admin_smart_editor_ui(df_view, "img_edit", selected_staff_target)
+        tab_ptr += 1
+
+        with all_tabs[tab_ptr]: # Tab Master Data
+            st.markdown("### 📦 Master Data Editor")
+            st.caption("Mengedit data global. Data diambil langsung dari database utama.")
+
+            md_opt = st.radio("Pilih Data Master:", ["Closing Deal", "Pembayaran (DP/Termin)"], horizontal=True, key="adm_md_radio")
+
+            # [PERBAIKAN] Gunakan Loader Standar agar format Rupiah/Tanggal terbaca otomatis
+            df_md = pd.DataFrame()
+            target_sheet_md = ""
+
+            if md_opt == "Closing Deal":
+                df_md = load_closing_deal() # Fungsi ini sudah otomatis parsing angka & tanggal
+                target_sheet_md = SHEET_CLOSING_DEAL
+            else:
+                df_md = load_pembayaran_dp() # Fungsi ini sudah otomatis handle parsing Rupiah
+                target_sheet_md = SHEET_PEMBAYARAN
+
+            if not df_md.empty:
+                # Tampilkan Editor dengan data yang sudah bersih
+                # Note: admin_smart_editor_ui akan otomatis menangani diff checking
+                admin_smart_editor_ui(df_md, f"md_editor_{md_opt}", target_sheet_md)
+            else:
+                st.info(f"Data Master '{md_opt}' masih kosong atau belum ada entri.")
+
+            # [BARU] Snapshot Parquet untuk analitik/laporan berat (tanpa membebani API Sheets)
+            with st.expander("🗄️ Snapshot Analitik (Parquet)", expanded=False):
+                st.caption("Menyimpan salinan bertipe (tanggal, angka, status) dari laporan, pembayaran, closing, presensi & audit log.")
+                if st.button("📸 Buat Snapshot Sekarang", key="btn_snapshot_parquet", use_container_width=True):
+                    with st.spinner("Menulis snapshot..."):
+                        ok_snap, msg_snap = export_analytics_snapshot()
+                    if ok_snap:
+                        st.success(msg_snap)
+                    else:
+                        st.error(msg_snap)
+
+                manifest = sn.load_snapshot_manifest()
+                if manifest:
+                    st.dataframe(
+                        pd.DataFrame([
+                            {"Tabel": k, "Baris": v.get("rows", 0), "Terakhir Ditulis": v.get("written_at", "-")}
+                            for k, v in manifest.items()
+                        ]),
+                        use_container_width=True, hide_index=True
+                    )
+                else:
+                    st.info("Belum ada snapshot.")
+        tab_ptr += 1
+
+        with all_tabs[tab_ptr]: # Tab Config
+            st.markdown("### ⚙️ Config Staff & Team")
+
+            # Membagi Layout menjadi 2 Bagian: Individu & Team
+            col_cfg_staf, col_cfg_team = st.columns(2)
+
+            # --- BAGIAN KIRI: STAFF INDIVIDU ---
+            with col_cfg_staf:
+                st.markdown("#### 👤 Kelola Personel")
+                with st.form("add_staf_form"):
+                    st.caption("➕ Tambah Staf Baru")
+                    new_nm = st.text_input("Nama Lengkap")
+                    if st.form_submit_button("Simpan Staf"):
+                        if new_nm.strip():
+                            ok, m = tambah_staf_baru(new_nm)
+                            if ok: 
+                                st.success(m)
+                                st.cache_data.clear()
+                                time.sleep(1)
+                                st.rerun()
+                            else: st.error(m)
+                        else: st.error("Nama tidak boleh kosong.")
+
+                st.markdown("---")
+                st.caption("🗑️ Hapus Akses Staf")
+                del_nm = st.selectbox("Pilih Nama:", ["-"] + staff_list_global, key="del_st_cfg")
+                if st.button("Hapus Akses", use_container_width=True):
+                    if del_nm != "-":
+                        ok, m = hapus_staf_by_name(del_nm)
+                        if ok: st.success(m); st.cache_data.clear(); st.rerun()
+
+            # --- BAGIAN KANAN: TEAM (FITUR BARU) ---
+            with col_cfg_team:
+                st.markdown("#### 🏆 Kelola Tim Sales")
+
+                # [FIX] Form Tambah Team
+                with st.expander("➕ Buat Team Baru", expanded=True):
+                    with st.form("add_team_form"):
+                        t_nama = st.text_input("Nama Team (Contoh: Tim Alpha)")
+                        t_posisi = st.text_input("Posisi (Contoh: Sales Canvas)")
+                        # Multiselect mengambil data dari daftar staf yang ada
+                        t_anggota = st.multiselect("Pilih Anggota:", staff_list_global)
+
+                        if st.form_submit_button("Simpan Team"):
+                            if t_nama and t_posisi and t_anggota:
+                                ok, m = tambah_team_baru(t_nama, t_posisi, t_anggota)
+                                if ok:
+                                    st.success(m)
+                                    st.cache_data.clear()
+                                    time.sleep(1)
+                                    st.rerun()
+                                else: st.error(m)
+                            else:
+                                st.warning("Semua kolom wajib diisi.")
+
+                st.divider()
+                st.caption("📋 Data Team Saat Ini:")
+                ws_tm = get_or_create_worksheet(SHEET_CONFIG_TEAM)
+                df_tm = pd.DataFrame(ws_tm.get_all_records())
+                if not df_tm.empty:
+                    # Filter kolom agar rapi
+                    valid_cols = [c for c in TEAM_COLUMNS if c in df_tm.columns]
+                    admin_smart_editor_ui(df_tm[valid_cols], "team_cfg_view", SHEET_CONFIG_TEAM)
+        tab_ptr += 1
+
+        with all_tabs[tab_ptr]:
+            st.markdown("### 🗑️ Hapus Akun Permanen")
+            st.warning("Peringatan: Menghapus akun akan menghilangkan nama staf dari daftar pelapor.")
+            target_del = st.selectbox("Pilih Akun:", ["-"] + staff_list_global, key="del_perm_sel")
+            confirm_del = st.checkbox("Saya mengonfirmasi penghapusan ini.")
+
+            if st.button("🔥 KONFIRMASI HAPUS", type="primary"):
+                if target_del != "-" and confirm_del:
+                    ok, m = hapus_staf_by_name(target_del)
+                    if ok:
+                        force_audit_log(st.session_state["user_name"], "DELETE USER", "Config_Users", f"Deleted {target_del}", "-")
+                        st.success(f"Akun {target_del} berhasil dihapus.")
+                        st.cache_data.clear()
+                        time.sleep(1)
+                        st.rerun()
+                else:
+                    st.error("Pilih nama staf dan centang konfirmasi terlebih dahulu.")
+        tab_ptr += 1
+
+        with all_tabs[tab_ptr]: # Tab Super Editor
+            st.markdown("### ⚡ Super Editor (Advanced)")
+            st.info("Mode Administrator: Mengedit langsung ke dalam Sheet.")
+
+            se_type = st.selectbox("📂 Kategori Sheet:", ["Laporan Harian Staff", "Master Data Lainnya"], key="se_cat_fix")
+
+            target_sheet_se = None
+            # Variabel untuk menyimpan standar kolom
+            forced_cols = None 
+
+            if se_type == "Laporan Harian Staff":
+                target_sheet_se = st.selectbox("👤 Pilih Nama Staff:", staff_list_global, key="se_st_sel")
+                forced_cols = NAMA_KOLOM_STANDAR
+            else:
+                # Peta Nama Sheet -> Kolom Standar
+                map_master = {
+                    "Closing Deal": (SHEET_CLOSING_DEAL, managed_columns(CLOSING_COLUMNS)),
+                    "Pembayaran": (SHEET_PEMBAYARAN, managed_columns(PAYMENT_COLUMNS)),
+                    "Target Team": (SHEET_TARGET_TEAM, managed_columns(TEAM_CHECKLIST_COLUMNS)),
+                    "Target Individu": (SHEET_TARGET_INDIVIDU, managed_columns(INDIV_CHECKLIST_COLUMNS)),
+                    "Config Team": (SHEET_CONFIG_TEAM, TEAM_COLUMNS)
+                }
+                sel_master = st.selectbox("📄 Pilih Sheet Master:", list(map_master.keys()), key="se_ms_sel")
+                target_sheet_se, forced_cols = map_master[sel_master]
+
+            if target_sheet_se:
+                st.divider()
+                st.markdown(f"**Editing: `{target_sheet_se}`**")
+                try:
+                    ws_se = get_or_create_worksheet(target_sheet_se)
+
+                    # [PERBAIKAN KRUSIAL] Pastikan header sinkron sebelum load data
+                    # Ini memperbaiki masalah data kosong pada Target Individu/Team
+                    if forced_cols:
+                        ensure_headers(ws_se, forced_cols)
+
+                    # Load ulang setelah memastikan header
+                    raw_data = ws_se.get_all_records()
+                    df_se = pd.DataFrame(raw_data)
+
+                    # Jika dataframe kosong tapi kita punya header, buat dataframe kosong dengan kolom tersebut
+                    if df_se.empty and forced_cols:
+                        df_se = pd.DataFrame(columns=forced_cols)
+
+                    # Jika ada data atau minimal kolom
+                    if not df_se.empty or forced_cols:
+                        # Terapkan pemaksaan urutan kolom (Reordering) & Normalisasi
+                        if forced_cols:
+                            for c in forced_cols:
+                                if c not in df_se.columns: 
+                                    df_se[c] = "" # Isi default string agar tidak error
+                            df_se = df_se[forced_cols].copy()
+
+                        # Bersihkan tipe data (Integer, Date) agar editor tidak error
+                        df_se = clean_df_types_dynamically(df_se)
+
+                        admin_smart_editor_ui(df_se, f"super_edit_{target_sheet_se}", target_sheet_se)
+                    else:
+                        st.info(f"Sheet '{target_sheet_se}' benar-benar kosong.")
+                except Exception as e:
+                    st.error(f"Gagal memuat sheet: {e}")
+
+        render_section_watermark()
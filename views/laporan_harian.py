@@ -0,0 +1,287 @@
+# =========================================================
+# HALAMAN: LAPORAN HARIAN
+# Modul halaman: router app.py memanggil render(); helper & konstanta
+# di-import dari app_core (dimuat sekali per proses).
+# =========================================================
+
+import time
+import streamlit as st
+
+from app_core import (
+    dropbox_ready, get_daftar_staf_terbaru, get_reminder_pending, is_mobile_device, now_ts_str,
+    set_nav, simpan_laporan_harian_batch, ui_toast, upload_ke_dropbox
+)
+
+
+def render_laporan_harian_mobile():
+    st.markdown("## 📝 Laporan Harian")
+
+    # tombol balik
+    if st.button("⬅️ Kembali ke Beranda", use_container_width=True):
+        set_nav("home")
+
+    staff_list = get_daftar_staf_terbaru()
+
+    # tetap pakai key pelapor_main agar actor log tetap konsisten
+    nama_pelapor = st.selectbox("Nama Pelapor", staff_list, key="pelapor_main")
+
+    pending_msg = get_reminder_pending(nama_pelapor)
+    if pending_msg:
+        st.warning(f"🔔 Pending terakhir: **{pending_msg}**")
+
+    tab1, tab2, tab3, tab4 = st.tabs(
+        ["📌 Aktivitas", "🏁 Kesimpulan", "📇 Kontak", "✅ Submit"])
+
+    # ===== TAB 1: Aktivitas =====
+    with tab1:
+        kategori_aktivitas = st.radio(
+            "Jenis Aktivitas",
+            ["🚗 Sales (Kunjungan Lapangan)", "💻 Digital Marketing / Konten / Ads",
+             "📞 Telesales / Follow Up", "🏢 Lainnya"],
+            horizontal=False,
+            key="m_kategori"
+        )
+        is_kunjungan = kategori_aktivitas.startswith("🚗")
+
+        if "Digital Marketing" in kategori_aktivitas:
+            st.text_input("Link Konten / Ads / Drive (Opsional)",
+                          key="m_sosmed")
+
+        if is_kunjungan:
+            st.text_input(
+                "📍 Nama Klien / Lokasi Kunjungan (Wajib)", key="m_lokasi")
+        else:
+            st.text_input("Jenis Tugas", value=kategori_aktivitas,
+                          disabled=True, key="m_tugas")
+
+        fotos = st.file_uploader(
+            "Upload Bukti (opsional)",
+            accept_multiple_files=True,
+            disabled=not dropbox_ready(),
+            key="m_fotos"
+        )
+
+        # 1 deskripsi saja agar ringkas (bisa detail per file via expander)
+        st.text_area("Deskripsi Aktivitas (Wajib)",
+                     height=120, key="m_deskripsi")
+
+        with st.expander("Detail deskripsi per file (opsional)", expanded=False):
+            if fotos:
+                for i, f in enumerate(fotos):
+                    st.text_input(f"Ket. {f.name}", key=f"m_desc_{i}")
+
+    # ===== TAB 2: Kesimpulan =====
+    with tab2:
+        st.text_area("💡 Kesimpulan hari ini", height=100, key="m_kesimpulan")
+        st.text_area("🚧 Kendala internal", height=90, key="m_kendala")
+        st.text_area("🧑‍💼 Kendala klien", height=90, key="m_kendala_klien")
+
+    # ===== TAB 3: Kontak =====
+    with tab3:
+        st.radio(
+            "📈 Tingkat Interest",
+            ["Under 50% (A)", "50-75% (B)", "75%-100%"],
+            horizontal=False,
+            key="interest_persen"
+        )
+        st.text_input("👤 Nama Klien", key="nama_klien_input")
+        st.text_input("📞 No HP/WA Klien", key="kontak_klien_input")
+        st.text_input("📌 Next Plan / Pending (Reminder Besok)",
+                      key="m_pending")
+
+# ===== TAB 4: Submit =====
+    with tab4:
+        st.caption("Pastikan data sudah benar, lalu submit.")
+
+        if st.button("✅ Submit Laporan", type="primary", use_container_width=True):
+
+            # --- 1. SIAPKAN VARIABEL DATA ---
+            kategori_aktivitas = st.session_state.get("m_kategori", "")
+            is_kunjungan = str(kategori_aktivitas).startswith("🚗")
+            lokasi_input = st.session_state.get(
+                "m_lokasi", "") if is_kunjungan else kategori_aktivitas
+            main_deskripsi = st.session_state.get("m_deskripsi", "")
+            sosmed_link = st.session_state.get(
+                "m_sosmed", "") if "Digital Marketing" in str(kategori_aktivitas) else ""
+            fotos = st.session_state.get("m_fotos", None)
+
+            # --- 2. VALIDASI INPUT ---
+            if is_kunjungan and not str(lokasi_input).strip():
+                st.error("Lokasi kunjungan wajib diisi.")
+                st.stop()
+
+            if (not fotos) and (not str(main_deskripsi).strip()):
+                st.error("Deskripsi wajib diisi.")
+                st.stop()
+
+            # --- 3. PERSIAPAN PROGRESS BAR ---
+            # Container kosong untuk menaruh loading bar
+            progress_placeholder = st.empty()
+
+            # Hitung total langkah (Jumlah Foto + 1 langkah simpan ke Excel/GSheet)
+            jml_foto = len(fotos) if fotos else 0
+            total_steps = jml_foto + 1
+            current_step = 0
+
+            # Tampilkan Bar Awal (0%)
+            my_bar = progress_placeholder.progress(
+                0, text="🚀 Memulai proses...")
+
+            try:
+                # Siapkan data timestamp & string lain
+                ts = now_ts_str()
+                val_kesimpulan = (st.session_state.get(
+                    "m_kesimpulan") or "-").strip() or "-"
+                val_kendala = (st.session_state.get(
+                    "m_kendala") or "-").strip() or "-"
+                val_kendala_klien = (st.session_state.get(
+                    "m_kendala_klien") or "-").strip() or "-"
+                val_pending = (st.session_state.get(
+                    "m_pending") or "-").strip() or "-"
+                val_feedback = ""
+                val_interest = st.session_state.get("interest_persen") or "-"
+                val_nama_klien = (st.session_state.get(
+                    "nama_klien_input") or "-").strip() or "-"
+                val_kontak_klien = (st.session_state.get(
+                    "kontak_klien_input") or "-").strip() or "-"
+
+                rows = []
+                final_lokasi = lokasi_input if is_kunjungan else kategori_aktivitas
+
+                # --- 4. PROSES UPLOAD FOTO (LOOPING) ---
+                if fotos and dropbox_ready():
+                    for i, f in enumerate(fotos):
+                        # Update Persentase Progress Bar
+                        # (Contoh: Foto 1 dari 3 => 33%)
+                        pct = float(current_step / total_steps)
+                        # Pastikan pct tidak lebih dari 1.0
+                        if pct > 1.0:
+                            pct = 1.0
+
+                        my_bar.progress(
+                            pct, text=f"📤 Mengupload foto ke-{i+1} dari {jml_foto}...")
+
+                        # Eksekusi Upload (Berat)
+                        url = upload_ke_dropbox(
+                            f, nama_pelapor, "Laporan_Harian")
+
+                        # Ambil deskripsi per foto jika ada
+                        desc = st.session_state.get(
+                            f"m_desc_{i}", "") or main_deskripsi or "-"
+
+                        # Masukkan ke list rows
+                        rows.append([
+                            ts, nama_pelapor, final_lokasi, desc,
+                            url, sosmed_link if sosmed_link else "-",
+                            val_kesimpulan, val_kendala, val_kendala_klien,
+                            val_pending, val_feedback, val_interest,
+                            val_nama_klien, val_kontak_klien
+                        ])
+
+                        # Tambah counter langkah
+                        current_step += 1
+                else:
+                    # Jika tidak ada foto, langsung siapkan 1 baris
+                    rows.append([
+                        ts, nama_pelapor, final_lokasi, main_deskripsi,
+                        "-", sosmed_link if sosmed_link else "-",
+                        val_kesimpulan, val_kendala, val_kendala_klien,
+                        val_pending, val_feedback, val_interest,
+                        val_nama_klien, val_kontak_klien
+                    ])
+
+                # --- 5. PROSES SIMPAN KE DATABASE (GSHEET) ---
+                # Update bar ke langkah terakhir sebelum selesai
+                pct_save = float(current_step / total_steps)
+                if pct_save > 0.95:
+                    pct_save = 0.95  # Biarkan sisa sedikit untuk efek selesai
+
+                my_bar.progress(
+                    pct_save, text="💾 Menyimpan data ke Database...")
+
+                # Eksekusi Simpan (Berat)
+                ok = simpan_laporan_harian_batch(rows, nama_pelapor)
+
+                # --- 6. FINISHING ---
+                # Set bar ke 100%
+                my_bar.progress(1.0, text="✅ Selesai!")
+                time.sleep(0.8)  # Jeda sebentar agar user lihat status 100%
+                progress_placeholder.empty()  # Hapus bar agar bersih
+
+                if ok:
+                    st.success(
+                        f"✅ Laporan tersimpan! Reminder: **{val_pending}**")
+                    ui_toast("Laporan tersimpan!", icon="✅")
+
+                    # Clear cache & Navigasi
+                    st.cache_data.clear()
+                    time.sleep(1)
+                    set_nav("home")
+                else:
+                    st.error("Gagal menyimpan ke Database (GSheet).")
+
+            except Exception as e:
+                # Jika error, hapus bar dan tampilkan error
+                progress_placeholder.empty()
+                st.error(f"Terjadi kesalahan: {e}")
+
+
+def render():
+    if is_mobile_device():
+        render_laporan_harian_mobile()
+    else:
+        st.markdown("## 📝 Laporan Kegiatan Harian")
+        c1, c2 = st.columns([1, 2])
+        with c1:
+            pelapor = st.selectbox(
+                "Nama Pelapor", get_daftar_staf_terbaru(), key="pelapor_desk")
+        with c2:
+            pending = get_reminder_pending(pelapor)
+            if pending:
+                st.warning(f"🔔 Reminder Pending: {pending}")
+
+        with st.container(border=True):
+            with st.form("daily_report_desk", clear_on_submit=False):
+                st.markdown("### 📌 Detail Aktivitas")
+                col_kiri, col_kanan = st.columns(2)
+                with col_kiri:
+                    kategori = st.radio(
+                        "Kategori", ["🚗 Sales Lapangan", "💻 Digital/Kantor", "📞 Telesales", "🏢 Lainnya"])
+                    lokasi = st.text_input(
+                        "Lokasi / Nama Klien / Jenis Tugas", placeholder="Wajib diisi...")
+                    deskripsi = st.text_area("Deskripsi Detail", height=150)
+                    foto = st.file_uploader(
+                        "Upload Bukti", accept_multiple_files=True, disabled=not dropbox_ready())
+                with col_kanan:
+                    st.markdown("### 📊 Hasil & Follow Up")
+                    kesimpulan = st.text_area("Kesimpulan / Hasil", height=80)
+                    kendala = st.text_area(
+                        "Kendala Internal/Lapangan", height=60)
+                    kendala_klien = st.text_area("Kendala dari Sisi Klien", height=60, placeholder="Misal: Budget belum turun, owner sedang keluar kota...")
+                    next_plan = st.text_input("Next Plan / Pending (Reminder)")
+                    st.markdown("### 👤 Data Klien")
+                    cl_nama = st.text_input("Nama Klien")
+                    cl_kontak = st.text_input("No HP/WA")
+                    cl_interest = st.selectbox(
+                        "Interest Level", ["-", "Under 50%", "50-75%", "75-100%"])
+                st.divider()
+                if st.form_submit_button("✅ KIRIM LAPORAN", type="primary", use_container_width=True):
+                    if not lokasi or not deskripsi:
+                        st.error("Lokasi dan Deskripsi wajib diisi!")
+                    else:
+                        with st.spinner("Mengirim laporan..."):
+                            ts = now_ts_str()
+                            final_link = "-"
+                            if foto and dropbox_ready():
+                                links = [upload_ke_dropbox(
+                                    f, pelapor, "Laporan_Harian") for f in foto]
+                                final_link = ", ".join(links)
+                            row_data = [ts, pelapor, lokasi, deskripsi, final_link, "-", kesimpulan,
+                                        kendala,kendala_klien, "-", next_plan, "-", cl_interest, cl_nama, cl_kontak]
+                            if simpan_laporan_harian_batch([row_data], pelapor):
+                                st.success("Laporan Terkirim!")
+                                st.cache_data.clear()
+                                time.sleep(1)
+                                st.rerun()
+                            else:
+                                st.error("Gagal simpan ke GSheet.")
@@ -0,0 +1,474 @@
+# =========================================================
+# HALAMAN: PEMBAYARAN (DP/TERMIN/PELUNASAN)
+# Modul halaman: router app.py memanggil render(); helper & konstanta
+# di-import dari app_core (dimuat sekali per proses).
+# =========================================================
+
+import time
+from datetime import datetime, timedelta
+import streamlit as st
+
+from app_core import (
+    COL_BUKTI_BAYAR, COL_CATATAN_BAYAR, COL_GROUP, COL_JATUH_TEMPO, COL_MARKETING,
+    COL_NILAI_KESEPAKATAN, COL_NOMINAL_BAYAR, COL_ROW_ID, COL_ROW_VERSION, COL_SISA_BAYAR,
+    COL_STATUS_BAYAR, COL_TGL_EVENT, COL_TS_BAYAR, COL_TS_UPDATE, COL_UPDATED_BY, TZ_JKT,
+    apply_audit_payments_changes, build_alert_pembayaran, dropbox_ready, format_rupiah_display,
+    get_daftar_staf_terbaru, get_payment_history, is_mobile_device, load_pembayaran_dp,
+    parse_rupiah_to_int, payment_df_for_display, payment_schedule_status,
+    render_section_watermark, save_pembayaran_dp, tambah_pembayaran_dp,
+    update_bukti_pembayaran_by_id
+)
+
+
+def render_payment_mobile():
+    st.markdown("### 💳 Pembayaran (Full Mobile)")
+    
+    # =========================================================
+    # 1. FORM INPUT BARU
+    # =========================================================
+    with st.expander("➕ Input Pembayaran Baru", expanded=False):
+        with st.form("mob_form_pay"):
+            p_group = st.text_input("Group (Opsional)")
+            # Menggunakan daftar staf terbaru agar konsisten dengan Config_Staf
+            p_marketing = st.selectbox("Marketing", get_daftar_staf_terbaru())
+            p_nominal = st.text_input("Nominal (Rp)", placeholder="Contoh: 15.000.000 atau 15jt")
+            p_jenis = st.selectbox("Jenis", ["Down Payment (DP)", "Termin", "Pelunasan"])
+            p_jatuh_tempo = st.date_input("Batas Waktu Bayar", value=datetime.now(tz=TZ_JKT).date() + timedelta(days=7))
+            p_status = st.checkbox("Sudah Dibayar?")
+            p_bukti = st.file_uploader("Upload Bukti Transfer", disabled=not dropbox_ready())
+            
+            if st.form_submit_button("Simpan Pembayaran", type="primary", use_container_width=True):
+                with st.spinner("Menyimpan data..."):
+                    res, msg = tambah_pembayaran_dp(
+                        p_group, p_marketing, datetime.now(tz=TZ_JKT), 
+                        p_jenis, p_nominal, p_jatuh_tempo, p_status, p_bukti, "-"
+                    )
+                    if res:
+                        st.success(msg)
+                        st.cache_data.clear()
+                        time.sleep(1)
+                        st.rerun()
+                    else:
+                        st.error(msg)
+
+    st.divider()
+
+    # =========================================================
+    # 2. LOAD DATA & SISTEM ALERT
+    # =========================================================
+    df_pay = load_pembayaran_dp()
+
+    if not df_pay.empty:
+        # Sistem Peringatan (Overdue & Due Soon)
+        overdue, due_soon = build_alert_pembayaran(df_pay)
+
+        # [UPDATE] TABEL RINCIAN UNTUK FOLLOW UP (MOBILE)
+        
+        # 1. ALERT OVERDUE (MERAH)
+        if not overdue.empty:
+            st.error(f"⛔ **{len(overdue)} TAGIHAN OVERDUE!**")
+            # Expander otomatis terbuka (expanded=True) agar langsung terlihat
+            with st.expander("📄 LIHAT DATA & KONTAK (Klik)", expanded=True):
+                # Ambil kolom penting: Marketing, Klien, Sisa, Catatan
+                df_ov_mob = overdue[[COL_MARKETING, COL_GROUP, COL_SISA_BAYAR, COL_CATATAN_BAYAR]].copy()
+                # Format Rupiah
+                df_ov_mob[COL_SISA_BAYAR] = df_ov_mob[COL_SISA_BAYAR].apply(format_rupiah_display)
+                
+                st.dataframe(
+                    df_ov_mob,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        COL_MARKETING: st.column_config.TextColumn("Sales", width="small"),
+                        COL_GROUP: st.column_config.TextColumn("Klien"),
+                        COL_SISA_BAYAR: st.column_config.TextColumn("Sisa"),
+                        COL_CATATAN_BAYAR: st.column_config.TextColumn("Kontak/WA")
+                    }
+                )
+
+        # 2. ALERT JATUH TEMPO DEKAT (KUNING)
+        if not due_soon.empty:
+            st.warning(f"⚠️ **{len(due_soon)} Jatuh Tempo Dekat (≤3 Hari)**")
+            with st.expander("📄 Lihat Detail", expanded=False):
+                df_ds_mob = due_soon[[COL_GROUP, COL_SISA_BAYAR, COL_JATUH_TEMPO]].copy()
+                df_ds_mob[COL_SISA_BAYAR] = df_ds_mob[COL_SISA_BAYAR].apply(format_rupiah_display)
+                
+                st.dataframe(
+                    df_ds_mob,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        COL_GROUP: "Klien",
+                        COL_SISA_BAYAR: "Sisa",
+                        COL_JATUH_TEMPO: st.column_config.DateColumn("Tgl", format="DD/MM")
+                    }
+                )
+
+        # =========================================================
+        # 3. EDITOR DATA (Audit Log Otomatis)
+        # =========================================================
+
+        st.markdown("#### 📋 Edit Data & Cek Status")
+        st.caption("Ubah status 'Lunas' atau 'Jatuh Tempo' langsung di tabel bawah ini.")
+
+        # [UPDATE] 1. Format Data untuk Tampilan (Ada Titik & Rp)
+        # Menggunakan helper payment_df_for_display yang sudah diperbarui
+        df_view = payment_df_for_display(df_pay)
+        
+        # [UPDATE] 2. Konfigurasi Kolom
+        # Kita set kolom uang sebagai TextColumn agar format "Rp 200.000" tidak diubah balik oleh Streamlit
+        # Kolom lain (Status, Tanggal, dll) tetap menggunakan konfigurasi lama
+        column_configs = {
+            COL_STATUS_BAYAR: st.column_config.CheckboxColumn("Lunas?", width="small"),
+            COL_JATUH_TEMPO: st.column_config.DateColumn("Jatuh Tempo", format="DD/MM/YYYY"),
+            COL_BUKTI_BAYAR: st.column_config.LinkColumn("Bukti"),
+            COL_TS_UPDATE: st.column_config.TextColumn("Perubahan Terakhir", disabled=True),
+            # Kolom Uang (Disabled karena ini view mobile, edit status/tanggal saja)
+            COL_NOMINAL_BAYAR: st.column_config.TextColumn("Nominal", disabled=True),
+            COL_NILAI_KESEPAKATAN: st.column_config.TextColumn("Total Deal", disabled=True),
+            COL_SISA_BAYAR: st.column_config.TextColumn("Sisa", disabled=True),
+            COL_ROW_VERSION: None,
+            COL_ROW_ID: None,
+        }
+
+        # Sesuai Code Lama: Batasi kolom yang boleh diubah staf via HP
+        editable_cols = [COL_STATUS_BAYAR, COL_JATUH_TEMPO, COL_CATATAN_BAYAR]
+        disabled_cols = [c for c in df_view.columns if c not in editable_cols]
+
+        edited_pay_mob = st.data_editor(
+            df_view,
+            column_config=column_configs,
+            disabled=disabled_cols,
+            hide_index=True,
+            use_container_width=True,
+            key="editor_pay_mobile_final"
+        )
+
+        # Tombol Simpan Perubahan dengan Logic Deteksi Perubahan (Diff)
+        if st.button("💾 Simpan Perubahan Data", type="primary", use_container_width=True):
+            with st.spinner("Memproses perubahan & mencatat audit log..."):
+                # Actor diambil dari sesi login (Staff/Admin)
+                actor_name = st.session_state.get("user_name", "Mobile User")
+                
+                # [UPDATE] 3. Cleaning Data Sebelum Disimpan
+                # Karena tampilan menggunakan Text (Rp ...), kita harus kembalikan ke Integer
+                # agar saat dibandingkan dengan database asli (df_pay) tidak dianggap berbeda semua.
+                
+                df_clean_edit = edited_pay_mob.copy()
+                
+                # Daftar kolom uang yang perlu dibersihkan kembali menjadi angka
+                cols_to_clean = [COL_NOMINAL_BAYAR, COL_NILAI_KESEPAKATAN, COL_SISA_BAYAR]
+                for c in cols_to_clean:
+                    if c in df_clean_edit.columns:
+                        df_clean_edit[c] = df_clean_edit[c].apply(parse_rupiah_to_int)
+
+                # Membandingkan data lama (df_pay) vs data baru yang sudah dibersihkan (df_clean_edit)
+                # Menggunakan helper apply_audit_payments_changes dari kode lama
+                final_df = apply_audit_payments_changes(df_pay, df_clean_edit, actor=actor_name)
+                
+                if save_pembayaran_dp(final_df):
+                    st.success("✅ Perubahan database berhasil disimpan!")
+                    st.cache_data.clear()
+                    time.sleep(1)
+                    st.rerun()
+                else:
+                    st.error("❌ Gagal menyimpan ke Database GSheet.")
+
+        st.divider()
+
+        # =========================================================
+        # 4. FITUR UPLOAD BUKTI SUSULAN
+        # =========================================================
+        with st.expander("📎 Upload Bukti (Susulan)", expanded=False):
+            st.caption("Gunakan ini untuk menambah/mengganti foto bukti transfer.")
+            df_pay_reset = df_pay.reset_index(drop=True)
+            
+            # Membuat list pilihan data agar user tidak salah pilih baris
+            options = [
+                f"{i+1}. {r[COL_MARKETING]} | {r[COL_GROUP]} ({format_rupiah_display(r[COL_NOMINAL_BAYAR])})" 
+                for i, r in df_pay_reset.iterrows()
+            ]
+            
+            sel_idx = st.selectbox("Pilih Data Pembayaran:", range(len(options)), 
+                                  format_func=lambda x: options[x], key="mob_sel_susulan")
+
+            file_susulan = st.file_uploader("Pilih File Bukti Baru", key="mob_file_susulan")
+
+            if st.button("⬆️ Update Foto Bukti", use_container_width=True):
+                if file_susulan:
+                    marketing_name = df_pay_reset.iloc[sel_idx][COL_MARKETING]
+                    actor_now = st.session_state.get("user_name", "Mobile User")
+                    
+                    sel_row = df_pay_reset.iloc[sel_idx]
+                    ok, msg = update_bukti_pembayaran_by_id(
+                        sel_row[COL_ROW_ID], file_susulan, marketing_name, actor=actor_now,
+                        expected_version=sel_row[COL_ROW_VERSION])
+                    if ok:
+                        st.success("✅ Bukti berhasil di-update!")
+                        st.cache_data.clear()
+                        time.sleep(1)
+                        st.rerun()
+                    else:
+                        st.error(msg)
+                else:
+                    st.warning("Silakan pilih file terlebih dahulu.")
+
+        # Jadwal (Payment_Schedule) & riwayat lengkap (Payment_Event_Log), dibaca hanya kalau diminta
+        with st.expander("📜 Jadwal & Riwayat Perubahan", expanded=False):
+            sel_hist = st.selectbox("Pilih Data Pembayaran:", range(len(options)),
+                                    format_func=lambda x: options[x], key="mob_sel_hist")
+            if st.button("Tampilkan Riwayat", use_container_width=True, key="mob_btn_hist"):
+                sel_row = df_pay_reset.iloc[sel_hist]
+                df_jadwal = payment_schedule_status(sel_row)
+                if not df_jadwal.empty:
+                    st.markdown("**Jadwal Cicilan**")
+                    st.dataframe(
+                        df_jadwal, hide_index=True, use_container_width=True,
+                        column_config={"Jatuh Tempo": st.column_config.DateColumn("Jatuh Tempo", format="DD/MM/YYYY")})
+                df_hist = get_payment_history(sel_row[COL_ROW_ID])
+                if df_hist.empty:
+                    st.info("Belum ada riwayat yang tercatat untuk data ini.")
+                else:
+                    st.dataframe(df_hist, hide_index=True, use_container_width=True)
+    else:
+        st.info("Belum ada data pembayaran yang tercatat.")
+
+
+def render():
+    if is_mobile_device():
+        render_payment_mobile()
+    else:
+        st.markdown("## 💳 Smart Payment Action Center")
+        st.caption("Manajemen pembayaran terpadu dengan kalkulator sisa tagihan dan pelacakan cicilan.")
+
+        # =========================================================
+        # 1. SEKSI INPUT: KALKULATOR PEMBAYARAN PINTAR
+        # =========================================================
+        with st.container(border=True):
+            st.markdown("### ➕ Input Pembayaran & Kalkulator Sisa")
+            with st.form("form_smart_pay", clear_on_submit=True):
+                c1, c2, c3 = st.columns(3)
+                with c1:
+                    p_marketing = st.selectbox("Nama Marketing", get_daftar_staf_terbaru())
+                    p_group = st.text_input("Nama Group / Klien", placeholder="Masukkan nama entitas...")
+                    p_total_sepakat = st.text_input("Total Nilai Kesepakatan (Rp)", placeholder="Contoh: 100.000.000")
+
+                with c2:
+                    p_jenis = st.selectbox("Mekanisme Pembayaran", ["Down Payment (DP)", "Cicilan", "Cash"])
+                    p_nom_bayar = st.text_input("Nominal yang Dibayar Sekarang (Rp)")
+                    p_tenor = st.number_input("Tenor Cicilan (Bulan)", min_value=0, step=1, help="Isi 0 jika pembayaran Cash/DP sekali bayar")
+
+                with c3:
+                    p_tgl_event = st.date_input("Tanggal Event", value=datetime.now(tz=TZ_JKT).date())
+                    p_due = st.date_input("Batas Waktu Bayar (Jatuh Tempo)", value=datetime.now(tz=TZ_JKT).date() + timedelta(days=7))
+                    p_bukti = st.file_uploader("Upload Bukti Transfer (Foto/PDF)")
+
+                p_note = st.text_area("Catatan Tambahan (Opsional)", placeholder="Keterangan bank, nomor referensi, dll.")
+
+                if st.form_submit_button("✅ Simpan & Hitung Sisa", type="primary", use_container_width=True):
+                    if not p_total_sepakat or not p_nom_bayar:
+                        st.error("Gagal: Nilai Kesepakatan dan Nominal Bayar wajib diisi!")
+                    else:
+                        with st.spinner("Memproses transaksi..."):
+                            ok, msg = tambah_pembayaran_dp(
+                                p_group, p_marketing, p_tgl_event, p_jenis, 
+                                p_nom_bayar, p_total_sepakat, p_tenor, p_due, p_bukti, p_note
+                            )
+                            if ok:
+                                st.success(msg)
+                                st.cache_data.clear()
+                                time.sleep(2)
+                                st.rerun()
+                            else:
+                                st.error(msg)
+
+        st.divider()
+
+        # =========================================================
+        # 2. SEKSI MONITORING: ALERT & DATA EDITOR DINAMIS
+        # =========================================================
+        st.markdown("### 📋 Monitoring & Riwayat Pembayaran")
+        df_pay = load_pembayaran_dp()
+
+        if df_pay.empty:
+            st.info("Belum ada data pembayaran yang tersimpan.")
+        else:
+            # --- Sistem Alert Pintar (Berdasarkan Sisa Bayar) ---
+            overdue, due_soon = build_alert_pembayaran(df_pay)
+            col_stat1, col_stat2 = st.columns(2)
+
+            # Tampilkan Angka Summary
+            with col_stat1:
+                st.metric("⛔ Overdue (Belum Lunas)", len(overdue))
+            with col_stat2:
+                st.metric("⚠️ Jatuh Tempo Dekat (≤ 3 Hari)", len(due_soon))
+
+            # [UPDATE] TABEL DETAIL UNTUK ADMIN (DESKTOP)
+            # Ditampilkan lebar penuh di bawah angka statistik
+
+            if not overdue.empty:
+                st.error(f"🚨 **PERHATIAN: Ada {len(overdue)} Tagihan Lewat Jatuh Tempo!**")
+                with st.expander("🔴 KLIK UNTUK LIHAT DAFTAR PENAGIHAN & KONTAK WA", expanded=True):
+                    # Menampilkan kolom lengkap: Sales, Klien, Tanggal, Sisa Uang, dan Catatan Kontak
+                    df_ov_desk = overdue[[COL_MARKETING, COL_GROUP, COL_JATUH_TEMPO, COL_SISA_BAYAR, COL_CATATAN_BAYAR]].copy()
+                    # Format angka jadi Rupiah
+                    df_ov_desk[COL_SISA_BAYAR] = df_ov_desk[COL_SISA_BAYAR].apply(format_rupiah_display)
+
+                    st.dataframe(
+                        df_ov_desk,
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            COL_MARKETING: st.column_config.TextColumn("👤 Sales PIC", width="medium"),
+                            COL_GROUP: st.column_config.TextColumn("🏢 Nama Klien", width="medium"),
+                            COL_JATUH_TEMPO: st.column_config.DateColumn("📅 Jatuh Tempo", format="DD MMM YYYY"),
+                            COL_SISA_BAYAR: st.column_config.TextColumn("💰 Sisa Tagihan", width="medium"),
+                            COL_CATATAN_BAYAR: st.column_config.TextColumn("📞 Catatan / Kontak WA", width="large")
+                        }
+                    )
+
+            if not due_soon.empty:
+                st.warning(f"🔔 **REMINDER: {len(due_soon)} Tagihan akan jatuh tempo dalam 3 hari.**")
+                with st.expander("🟡 LIHAT DAFTAR DUE SOON", expanded=True):
+                    df_soon_desk = due_soon[[COL_MARKETING, COL_GROUP, COL_JATUH_TEMPO, COL_SISA_BAYAR, COL_CATATAN_BAYAR]].copy()
+                    df_soon_desk[COL_SISA_BAYAR] = df_soon_desk[COL_SISA_BAYAR].apply(format_rupiah_display)
+
+                    st.dataframe(
+                        df_soon_desk,
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            COL_MARKETING: st.column_config.TextColumn("👤 Sales PIC", width="medium"),
+                            COL_GROUP: st.column_config.TextColumn("🏢 Nama Klien", width="medium"),
+                            COL_JATUH_TEMPO: st.column_config.DateColumn("📅 Jatuh Tempo", format="DD MMM YYYY"),
+                            COL_SISA_BAYAR: st.column_config.TextColumn("💰 Sisa Tagihan", width="medium"),
+                            COL_CATATAN_BAYAR: st.column_config.TextColumn("📞 Catatan / Kontak WA", width="large")
+                        }
+                    )
+
+            st.divider()
+            st.caption("Klik dua kali pada sel tabel utama di bawah ini untuk mengedit data pembayaran.")
+
+            # --- 1. PROSES DATA UNTUK TAMPILAN (Format Rupiah) ---
+            # Menggunakan helper payment_df_for_display agar tampilan "Rp 2.000.000" muncul
+            df_view_desktop = payment_df_for_display(df_pay)
+
+            # --- 2. KONFIGURASI KOLOM ---
+            # Menggunakan TextColumn untuk kolom uang agar format titik ribuan muncul
+            desk_col_config = {
+                COL_STATUS_BAYAR: st.column_config.CheckboxColumn("Lunas?", width="small"),
+                COL_JATUH_TEMPO: st.column_config.DateColumn("Jatuh Tempo", format="DD/MM/YYYY"),
+                COL_TGL_EVENT: st.column_config.DateColumn("Tgl Event", format="DD/MM/YYYY"),
+                COL_BUKTI_BAYAR: st.column_config.LinkColumn("Bukti"),
+                COL_NOMINAL_BAYAR: st.column_config.TextColumn("Nominal (Rp)", width="medium", help="Format otomatis saat disimpan"),
+                COL_NILAI_KESEPAKATAN: st.column_config.TextColumn("Total Deal (Rp)", width="medium"),
+                COL_SISA_BAYAR: st.column_config.TextColumn("Sisa Tagihan (Rp)", disabled=True, width="medium"),
+                COL_GROUP: st.column_config.TextColumn("Nama Group/Klien"),
+                COL_MARKETING: st.column_config.TextColumn("Sales"),
+                COL_TS_UPDATE: st.column_config.TextColumn("Perubahan Terakhir", disabled=True),
+                COL_TS_BAYAR: st.column_config.TextColumn("Waktu Input", disabled=True),
+                COL_UPDATED_BY: st.column_config.TextColumn("Editor Terakhir", disabled=True),
+                COL_ROW_VERSION: None,
+                COL_ROW_ID: None,
+            }
+
+            # --- 3. RENDER DATA EDITOR ---
+            edited_pay = st.data_editor(
+                df_view_desktop,
+                column_config=desk_col_config,
+                hide_index=True,
+                use_container_width=True,
+                num_rows="dynamic",
+                key="smart_payment_editor_desktop_v4"
+            )
+
+            # --- 4. LOGIKA SIMPAN PERUBAHAN ---
+            if st.button("💾 Simpan Perubahan Riwayat", use_container_width=True):
+                with st.spinner("Memproses audit log dan menyimpan data..."):
+                    current_user = st.session_state.get("user_name", "Admin Desktop")
+
+                    # --- CLEANING STEP: KEMBALIKAN FORMAT RUPIAH KE ANGKA MURNI ---
+                    # Salin hasil edit dari tabel
+                    df_clean_edit = edited_pay.copy()
+
+                    # Daftar kolom uang yang harus dibersihkan dari "Rp" dan titik
+                    cols_to_clean = [COL_NOMINAL_BAYAR, COL_NILAI_KESEPAKATAN, COL_SISA_BAYAR]
+
+                    for c in cols_to_clean:
+                        if c in df_clean_edit.columns:
+                            # Bersihkan format string kembali menjadi integer agar database tetap rapi
+                            df_clean_edit[c] = df_clean_edit[c].apply(parse_rupiah_to_int)
+
+                    # Hitung ulang Sisa Bayar agar konsisten (Total - Nominal)
+                    if COL_NILAI_KESEPAKATAN in df_clean_edit.columns and COL_NOMINAL_BAYAR in df_clean_edit.columns:
+                         val_total = df_clean_edit[COL_NILAI_KESEPAKATAN].fillna(0)
+                         val_bayar = df_clean_edit[COL_NOMINAL_BAYAR].fillna(0)
+                         df_clean_edit[COL_SISA_BAYAR] = val_total - val_bayar
+
+                    # Bandingkan data lama (df_pay) vs data bersih (df_clean_edit) untuk log audit
+                    final_df = apply_audit_payments_changes(df_pay, df_clean_edit, actor=current_user)
+
+                    # Simpan ke Google Sheets
+                    if save_pembayaran_dp(final_df):
+                        st.success("✅ Perubahan database berhasil disimpan!")
+                        st.cache_data.clear()
+                        time.sleep(1.5)
+                        st.rerun()
+                    else:
+                        st.error("Gagal menyimpan ke Google Sheets.")
+
+            st.divider()
+
+            # =========================================================
+            # 3. FITUR TAMBAHAN: UPDATE FOTO BUKTI SUSULAN
+            # =========================================================
+            with st.expander("📎 Update Bukti Pembayaran (Susulan)", expanded=False):
+                st.info("Gunakan fitur ini jika ingin menambahkan atau mengganti foto bukti transfer tanpa mengubah data lainnya.")
+                df_pay_reset = df_pay.reset_index(drop=True)
+
+                pay_options = [
+                    f"{i+1}. {r[COL_MARKETING]} | {r[COL_GROUP]} | Sisa: {format_rupiah_display(r[COL_SISA_BAYAR])}" 
+                    for i, r in df_pay_reset.iterrows()
+                ]
+
+                sel_idx_upd = st.selectbox("Pilih Record Pembayaran:", range(len(pay_options)), 
+                                         format_func=lambda x: pay_options[x], key="desk_sel_susulan")
+
+                file_susulan = st.file_uploader("Upload File Bukti Baru", key="desk_file_susulan")
+
+                if st.button("⬆️ Upload Foto Sekarang", use_container_width=True):
+                    if file_susulan:
+                        mkt_name = df_pay_reset.iloc[sel_idx_upd][COL_MARKETING]
+                        sel_row = df_pay_reset.iloc[sel_idx_upd]
+                        ok, msg = update_bukti_pembayaran_by_id(
+                            sel_row[COL_ROW_ID], file_susulan, mkt_name, actor="Admin",
+                            expected_version=sel_row[COL_ROW_VERSION])
+                        if ok:
+                            st.success("Foto bukti berhasil ditambahkan!")
+                            st.cache_data.clear()
+                            time.sleep(1)
+                            st.rerun()
+                        else:
+                            st.error(msg)
+                    else:
+                        st.warning("Silakan pilih file terlebih dahulu.")
+
+            # Jadwal (Payment_Schedule) & riwayat lengkap (Payment_Event_Log), dibaca hanya kalau diminta
+            with st.expander("📜 Jadwal Cicilan & Riwayat Perubahan", expanded=False):
+                sel_hist = st.selectbox("Pilih Record Pembayaran:", range(len(pay_options)),
+                                        format_func=lambda x: pay_options[x], key="desk_sel_hist")
+                if st.button("Tampilkan Riwayat", use_container_width=True, key="desk_btn_hist"):
+                    sel_row = df_pay_reset.iloc[sel_hist]
+                    df_jadwal = payment_schedule_status(sel_row)
+                    if not df_jadwal.empty:
+                        st.markdown("**Jadwal Cicilan**")
+                        st.dataframe(
+                            df_jadwal, hide_index=True, use_container_width=True,
+                            column_config={"Jatuh Tempo": st.column_config.DateColumn("Jatuh Tempo", format="DD/MM/YYYY")})
+                    df_hist = get_payment_history(sel_row[COL_ROW_ID])
+                    if df_hist.empty:
+                        st.info("Belum ada riwayat yang tercatat untuk data ini.")
+                    else:
+                        st.dataframe(df_hist, hide_index=True, use_container_width=True)
+
+        render_section_watermark()
@@ -0,0 +1,120 @@
+# =========================================================
+# HALAMAN: PRESENSI KEHADIRAN
+# Modul halaman: router app.py memanggil render(); helper & konstanta
+# di-import dari app_core (dimuat sekali per proses).
+# =========================================================
+
+import time
+from datetime import datetime
+import pandas as pd
+import streamlit as st
+
+from app_core import (
+    TZ_JKT, catat_presensi, force_audit_log, get_daftar_staf_terbaru, init_presensi_db,
+    ui_fragment
+)
+
+
+# [BARU] Form presensi dibungkus fragment: memilih nama / tipe / foto hanya me-rerun form ini
+@ui_fragment
+def render_presensi_form():
+    with st.container(border=True):
+        staff_list = get_daftar_staf_terbaru()
+        pilih_nama = st.selectbox(
+            "Pilih Nama Anda:", ["-- Pilih Nama --"] + staff_list, key="presensi_name_sel")
+
+        # --- PILIHAN TIPE ABSEN ---
+        # Membuat pilihan Masuk atau Pulang dengan Radio Button horizontal
+        col_absen1, col_absen2 = st.columns(2)
+        with col_absen1:
+            tipe_absen = st.radio("Tipe Presensi:", ["Masuk", "Pulang"], horizontal=True, key="tipe_absen_radio")
+
+        # Penentuan Icon dinamis berdasarkan pilihan
+        icon_absen = "🚀" if tipe_absen == "Masuk" else "🏠"
+
+        # --- FITUR UPLOAD FOTO ---
+        input_foto = st.file_uploader(f"Ambil Foto Selfie {tipe_absen} (Kamera/Galeri)", 
+                                     type=['png', 'jpg', 'jpeg'],
+                                     help=f"Gunakan kamera HP untuk selfie saat jam {tipe_absen.lower()}.")
+
+        if input_foto:
+            # Menampilkan preview foto kecil
+            st.image(input_foto, caption=f"Preview Selfie {tipe_absen}", width=150)
+
+        # --- INFO WAKTU & TOMBOL KIRIM ---
+        waktu_skrg = datetime.now(TZ_JKT)
+        st.info(
+            f"🕒 Waktu Sistem Saat Ini: **{waktu_skrg.strftime('%A, %d %B %Y - %H:%M:%S')} WIB**")
+
+        # Tombol Kirim dengan label dinamis (Kirim Presensi Masuk / Kirim Presensi Pulang)
+        if st.button(f"{icon_absen} Kirim Presensi {tipe_absen}", type="primary", use_container_width=True):
+            if pilih_nama == "-- Pilih Nama --":
+                st.error("Silakan pilih nama terlebih dahulu!")
+            elif input_foto is None:
+                st.error(f"Wajib melampirkan foto untuk presensi {tipe_absen.lower()}!")
+            else:
+                with st.spinner(f"Mencatat {tipe_absen.lower()} & mengupload foto..."):
+                    # Memanggil fungsi catat_presensi yang sudah mendukung parameter 'tipe'
+                    ok, msg = catat_presensi(pilih_nama, tipe=tipe_absen, file_foto=input_foto)
+
+                    if ok:
+                        st.success(msg)
+                        # Mencatat aktivitas ke Global Audit Log
+                        force_audit_log(
+                            actor=pilih_nama,
+                            action=f"✅ {tipe_absen.upper()}",
+                            target_sheet="Presensi_Kehadiran",
+                            chat_msg=f"Presensi {tipe_absen} sukses.",
+                            details_input=f"Jam: {waktu_skrg.strftime('%H:%M:%S')} | Bukti foto terlampir"
+                        )
+                        time.sleep(2)
+                        st.rerun()
+                    else:
+                        # Pesan error jika gagal validasi (misal: belum masuk sudah mau pulang)
+                        st.error(msg)
+
+
+def render():
+    st.markdown("## 📅 Presensi Kehadiran Real-Time")
+    st.caption(
+        "Pilih Nama, Tipe Absen (Masuk/Pulang), dan lampirkan foto selfie. Waktu akan tercatat otomatis oleh sistem (WIB).")
+
+    render_presensi_form()
+
+    st.divider()
+    st.markdown("### 📋 Kehadiran Hari Ini")
+
+    # Menampilkan riwayat kehadiran hari ini di bawah form agar staf tahu statusnya
+    waktu_skrg = datetime.now(TZ_JKT)
+    ws_p = init_presensi_db()
+    if ws_p:
+        data_p = ws_p.get_all_records()
+        if data_p:
+            df_p = pd.DataFrame(data_p)
+
+            # Filter data khusus hari ini agar tampilan ringkas
+            tgl_hari_ini = waktu_skrg.strftime("%d")
+            bln_hari_ini = waktu_skrg.strftime("%B")
+            thn_hari_ini = waktu_skrg.strftime("%Y")
+
+            # Pastikan kolom Tanggal, Bulan, Tahun tersedia sesuai PRESENSI_COLUMNS
+            df_today = df_p[
+                (df_p['Tanggal'].astype(str) == tgl_hari_ini) & 
+                (df_p['Bulan'] == bln_hari_ini) &
+                (df_p['Tahun'].astype(str) == thn_hari_ini)
+            ]
+
+            if not df_today.empty:
+                # Konfigurasi tabel agar Link Foto bisa langsung diklik
+                st.dataframe(
+                    df_today, 
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "Link Foto": st.column_config.LinkColumn("📸 Lihat Foto"),
+                        "Tipe Absen": st.column_config.TextColumn("Status", width="small"),
+                        "Waktu": st.column_config.TextColumn("Jam", width="small")
+                    }
+                )
+            else:
+                st.info("Belum ada data kehadiran hari ini.")
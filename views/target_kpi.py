@@ -0,0 +1,243 @@
+# =========================================================
+# HALAMAN: TARGET & KPI
+# Modul halaman: router app.py memanggil render(); helper & konstanta
+# di-import dari app_core (dimuat sekali per proses).
+# =========================================================
+
+import time
+from datetime import datetime, timedelta
+import streamlit as st
+
+from app_core import (
+    COL_ROW_ID, COL_ROW_VERSION, INDIV_CHECKLIST_COLUMNS, SHEET_TARGET_INDIVIDU,
+    SHEET_TARGET_TEAM, TEAM_CHECKLIST_COLUMNS, add_bulk_targets, apply_audit_checklist_changes,
+    clean_bulk_input, get_actor_fallback, get_daftar_staf_terbaru, is_mobile_device,
+    load_checklist, render_hybrid_table, save_checklist, update_evidence_rows
+)
+
+
+def render_kpi_mobile():
+    st.markdown("### 🎯 Target & KPI (Full Mobile)")
+
+    # Gunakan Tabs seperti Desktop agar fitur lengkap
+    tab1, tab2, tab3 = st.tabs(["🏆 Team", "⚡ Individu", "⚙️ Admin"])
+
+    # --- TAB 1: TEAM ---
+    with tab1:
+        st.caption("Checklist & Upload Bukti Team")
+        df_team = load_checklist(SHEET_TARGET_TEAM, TEAM_CHECKLIST_COLUMNS)
+
+        if not df_team.empty:
+            # 1. Editor (Bisa Edit Status/Text)
+            edited_team = render_hybrid_table(df_team, "mob_team_tbl", "Misi")
+
+            # Tombol Simpan
+            if st.button("💾 Simpan Perubahan (Team)", use_container_width=True, key="mob_btn_save_team"):
+                actor = get_actor_fallback(default="Admin")
+                final_df = apply_audit_checklist_changes(
+                    df_team, edited_team, ["Misi"], actor)
+                if save_checklist(SHEET_TARGET_TEAM, final_df, TEAM_CHECKLIST_COLUMNS):
+                    st.success("Tersimpan!")
+                    st.rerun()
+
+            st.divider()
+
+            # 2. Upload Bukti (Fitur Desktop dibawa ke HP)
+            with st.expander("📂 Upload Bukti / Catatan"):
+                # Satu bukti bisa dipakai untuk beberapa misi sekaligus
+                sel_misi = st.multiselect(
+                    "Pilih Misi", df_team["Misi"].unique(), key="mob_sel_misi")
+                note_misi = st.text_area("Catatan", key="mob_note_misi")
+                file_misi = st.file_uploader("File", key="mob_file_misi")
+
+                if st.button("Update Bukti", use_container_width=True, key="mob_upd_team"):
+                    actor = get_actor_fallback()
+                    sel_rows = df_team.loc[df_team["Misi"].isin(sel_misi)]
+                    res, msg = update_evidence_rows(
+                        SHEET_TARGET_TEAM, sel_rows[COL_ROW_ID].tolist(),
+                        note_misi, file_misi, actor, "Team",
+                        expected_versions=dict(zip(sel_rows[COL_ROW_ID], sel_rows[COL_ROW_VERSION])))
+                    if res:
+                        st.success("Updated!")
+                        st.rerun()
+                    else:
+                        st.error(msg)
+        else:
+            st.info("Belum ada target team.")
+
+    # --- TAB 2: INDIVIDU ---
+    with tab2:
+        st.caption("Target Individu")
+        staff = get_daftar_staf_terbaru()
+        filter_nama = st.selectbox("Filter Nama:", staff, key="mob_indiv_filter")
+
+        df_indiv_all = load_checklist(SHEET_TARGET_INDIVIDU, INDIV_CHECKLIST_COLUMNS)
+        df_user = df_indiv_all[df_indiv_all["Nama"] == filter_nama]
+
+        if not df_user.empty:
+            # --- TAMBAHKAN LOGIKA PROGRES DI SINI ---
+            total_target = len(df_user)
+            # Menghitung jumlah 'TRUE' pada kolom Status
+            jumlah_selesai = df_user["Status"].sum() 
+            
+            # Hitung persentase
+            persentase = (jumlah_selesai / total_target) if total_target > 0 else 0
+            
+            # Tampilkan Progress Bar yang Estetik
+            st.markdown(f"### 📈 Progres Kerja: {int(persentase * 100)}%")
+            st.progress(persentase)
+            st.write(f"Selesai: **{jumlah_selesai}** dari **{total_target}** tugas.")
+            st.divider()
+            # --- END LOGIKA PROGRES ---
+
+            edited_indiv = render_hybrid_table(df_user, f"mob_indiv_{filter_nama}", "Target")
+
+            if st.button(f"💾 Simpan ({filter_nama})", use_container_width=True, key="mob_save_indiv"):
+                df_merged = df_indiv_all.copy()
+                df_merged.update(edited_indiv)
+                final_df = apply_audit_checklist_changes(
+                    df_indiv_all, df_merged, ["Nama", "Target"], filter_nama)
+                save_checklist(SHEET_TARGET_INDIVIDU, final_df,
+                               INDIV_CHECKLIST_COLUMNS)
+                st.success("Tersimpan!")
+                st.rerun()
+
+            # Upload Bukti Individu
+            with st.expander(f"📂 Update Bukti ({filter_nama})"):
+                pilih_target = st.multiselect(
+                    "Target:", df_user["Target"].tolist(), key="mob_sel_indiv")
+                note_target = st.text_area("Catatan", key="mob_note_indiv")
+                file_target = st.file_uploader("File", key="mob_file_indiv")
+                if st.button("Update Pribadi", use_container_width=True, key="mob_upd_indiv"):
+                    sel_rows = df_user.loc[df_user["Target"].isin(pilih_target)]
+                    res, msg = update_evidence_rows(
+                        SHEET_TARGET_INDIVIDU, sel_rows[COL_ROW_ID].tolist(),
+                        note_target, file_target, filter_nama, "Individu",
+                        expected_versions=dict(zip(sel_rows[COL_ROW_ID], sel_rows[COL_ROW_VERSION])))
+                    if res:
+                        st.success("Updated!")
+                        st.rerun()
+                    else:
+                        st.error(msg)
+        else:
+            st.info("Kosong.")
+
+    # --- TAB 3: ADMIN (Fitur Tambah Target) ---
+    with tab3:
+        st.markdown("#### ➕ Tambah Target Baru")
+        jenis_t = st.radio(
+            "Jenis", ["Team", "Individu"], horizontal=True, key="mob_jenis_target")
+
+        with st.form("mob_add_kpi"):
+            target_text = st.text_area("Isi Target (1 per baris)", height=100)
+            c1, c2 = st.columns(2)
+            t_mulai = c1.date_input("Mulai", value=datetime.now())
+            t_selesai = c2.date_input(
+                "Selesai", value=datetime.now()+timedelta(days=30))
+
+            nama_target = ""
+            if jenis_t == "Individu":
+                nama_target = st.selectbox(
+                    "Staf:", get_daftar_staf_terbaru(), key="mob_add_staf_target")
+
+            if st.form_submit_button("Tambah Target", use_container_width=True):
+                targets = clean_bulk_input(target_text)
+                sheet = SHEET_TARGET_TEAM if jenis_t == "Team" else SHEET_TARGET_INDIVIDU
+                base = ["", str(t_mulai), str(t_selesai), "FALSE", "-"]
+                if jenis_t == "Individu":
+                    base = [nama_target] + base
+
+                if add_bulk_targets(sheet, base, targets):
+                    st.success("Berhasil!")
+                    st.rerun()
+                else:
+                    st.error("Gagal.")
+
+
+def render():
+    if is_mobile_device():
+        render_kpi_mobile()
+    else:
+        st.markdown("## 🎯 Manajemen Target & KPI")
+        tab1, tab2, tab3 = st.tabs(
+            ["🏆 Target Team", "⚡ Target Individu", "⚙️ Admin Setup"])
+        with tab1:
+            df_team = load_checklist(SHEET_TARGET_TEAM, TEAM_CHECKLIST_COLUMNS)
+            if not df_team.empty:
+                edited_team = render_hybrid_table(df_team, "team_desk", "Misi")
+                if st.button("💾 Simpan Perubahan Team"):
+                    final_df = apply_audit_checklist_changes(
+                        df_team, edited_team, ["Misi"], get_actor_fallback())
+                    save_checklist(SHEET_TARGET_TEAM, final_df,
+                                   TEAM_CHECKLIST_COLUMNS)
+                    st.success("Tersimpan!")
+                    st.cache_data.clear()
+                    st.rerun()
+        with tab2:
+            st.caption("Monitoring target perorangan.")
+            pilih_staf = st.selectbox(
+                "Pilih Nama Staf:", get_daftar_staf_terbaru())
+
+            df_indiv_all = load_checklist(
+                SHEET_TARGET_INDIVIDU, INDIV_CHECKLIST_COLUMNS)
+            df_user = df_indiv_all[df_indiv_all["Nama"] == pilih_staf]
+
+            if not df_user.empty:
+                # ==========================================
+                # ANCHOR: LOGIKA PROGRESS BAR (PENTING)
+                # ==========================================
+                total_target = len(df_user)
+                # Menghitung jumlah baris yang statusnya dicentang (True)
+                jumlah_selesai = df_user["Status"].sum() 
+                persentase = jumlah_selesai / total_target if total_target > 0 else 0
+
+                # Tampilan Visual Progres
+                st.markdown(f"### 📈 Progres {pilih_staf}: {int(persentase * 100)}%")
+                st.progress(persentase)
+                st.write(f"✅ **{jumlah_selesai}** selesai dari **{total_target}** target.")
+                st.divider()
+                # ==========================================
+
+                # Tabel editor untuk mencentang target
+                edited_indiv = render_hybrid_table(
+                    df_user, f"indiv_{pilih_staf}", "Target")
+
+                if st.button(f"💾 Simpan Target {pilih_staf}", use_container_width=True):
+                    df_merged = df_indiv_all.copy()
+
+                    # Update data lama dengan data hasil editan tabel
+                    df_merged.update(edited_indiv)
+
+                    final_df = apply_audit_checklist_changes(
+                        df_indiv_all, df_merged, ["Nama", "Target"], pilih_staf)
+
+                    if save_checklist(SHEET_TARGET_INDIVIDU, final_df, INDIV_CHECKLIST_COLUMNS):
+                        st.success(f"Berhasil menyimpan progres {pilih_staf}!")
+                        st.cache_data.clear()
+                        time.sleep(1)
+                        st.rerun()
+                    else:
+                        st.error("Gagal menyimpan ke database.")
+            else:
+                st.info(f"Belum ada target yang ditugaskan untuk {pilih_staf}.")
+        with tab3:
+            st.markdown("### ➕ Tambah Target Baru")
+            jenis_t = st.radio(
+                "Jenis Target", ["Team", "Individu"], horizontal=True)
+            with st.form("add_kpi_desk"):
+                target_text = st.text_area("Isi Target (1 per baris)")
+                tgl_m = st.date_input("Mulai", value=datetime.now())
+                tgl_s = st.date_input(
+                    "Selesai", value=datetime.now()+timedelta(days=30))
+                nama_t = st.selectbox(
+                    "Untuk Staf:", get_daftar_staf_terbaru()) if jenis_t == "Individu" else ""
+                if st.form_submit_button("Tambah Target"):
+                    targets = clean_bulk_input(target_text)
+                    sheet = SHEET_TARGET_TEAM if jenis_t == "Team" else SHEET_TARGET_INDIVIDU
+                    base = ["", str(tgl_m), str(tgl_s), "FALSE", "-"]
+                    if jenis_t == "Individu":
+                        base = [nama_t] + base
+                    if add_bulk_targets(sheet, base, targets):
+                        st.success("Berhasil!")
+                        st.cache_data.clear()
+                        st.rerun()